@@ -0,0 +1,91 @@
+import re
+
+STRATEGIES = ("round-robin", "weighted", "least-in-flight")
+CREDENTIAL_KEYS = ("public_key", "private_key")
+# "private_key_2" -> ("private_key", "2"); unsuffixed keys belong to the first set.
+SUFFIXED_KEY = re.compile(r"^(public_key|private_key|account_id_cards_[a-z]{3}|account_name|weight)(?:_(\d+))?$")
+
+
+class Account:
+    # One merchant credential set: its API keys and per-currency card account ids, in the
+    # same key/value shape load_env returns, so a flow can take `env` as it always has.
+
+    def __init__(self, name, env, weight=1.0):
+        self.name = name
+        self.env = env
+        self.weight = weight
+        self.in_flight = 0
+        self.assigned = 0
+
+    def account_id(self, currency):
+        return self.env.get(f"account_id_cards_{currency.lower()}")
+
+
+def parse_accounts(env):
+    # Splits a Postman env into credential sets. The first set uses the plain keys
+    # (public_key, private_key, account_id_cards_usd, ...); further sets add a numeric
+    # suffix (public_key_2, account_id_cards_usd_2, ...). Each set may carry a display
+    # name (account_name_N) and a weight (weight_N, default 1).
+    sets = {}
+    for key, value in env.items():
+        match = SUFFIXED_KEY.match(key)
+        if match:
+            sets.setdefault(int(match.group(2) or 1), {})[match.group(1)] = value
+    accounts = []
+    for number, fields in sorted(sets.items()):
+        missing = [key for key in CREDENTIAL_KEYS if not fields.get(key)]
+        if missing:
+            suffix = "" if number == 1 else f"_{number}"
+            raise ValueError(f"Credential set {number} has no {' or '.join(key + suffix for key in missing)}")
+        try:
+            weight = float(fields.pop("weight", 1))
+        except ValueError:
+            raise ValueError(f"Credential set {number} has a non-numeric weight") from None
+        if weight <= 0:
+            raise ValueError(f"Credential set {number} needs a positive weight")
+        accounts.append(Account(fields.pop("account_name", None) or f"account {number}", fields, weight))
+    if not accounts:
+        raise ValueError("No public_key/private_key found in the env file")
+    return accounts
+
+
+class AccountPicker:
+    # Assigns each new flow to an account. round-robin takes them in turn; weighted
+    # interleaves them in proportion to their weights (smooth weighted round-robin, so a
+    # 3:1 split goes a a b a, not a a a b); least-in-flight picks the account with the
+    # fewest flows running per unit of weight, which steers new flows away from an
+    # account whose flows have slowed down.
+
+    def __init__(self, accounts, strategy="round-robin"):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown account strategy {strategy!r}; expected one of {', '.join(STRATEGIES)}")
+        self.accounts = list(accounts)
+        self.strategy = strategy
+        self._next = 0
+        self._credit = [0.0] * len(self.accounts)
+
+    def acquire(self):
+        if self.strategy == "weighted":
+            account = self.accounts[self._weighted_index()]
+        elif self.strategy == "least-in-flight":
+            account = min(self.accounts, key=lambda candidate: (candidate.in_flight / candidate.weight, candidate.assigned))
+        else:
+            account = self.accounts[self._next % len(self.accounts)]
+            self._next += 1
+        account.in_flight += 1
+        account.assigned += 1
+        return account
+
+    def release(self, account):
+        account.in_flight -= 1
+
+    def _weighted_index(self):
+        total = 0.0
+        best = 0
+        for index, account in enumerate(self.accounts):
+            self._credit[index] += account.weight
+            total += account.weight
+            if self._credit[index] > self._credit[best]:
+                best = index
+        self._credit[best] -= total
+        return best
@@ -0,0 +1,121 @@
+import time
+from collections import Counter, deque
+
+import requests
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+FAILURE_ERRORS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout, ConnectionError, TimeoutError)
+
+
+class CircuitOpenError(Exception):
+
+    def __init__(self, name, retry_in):
+        super().__init__(f"Circuit for {name} is open; next trial in {retry_in:.1f}s")
+        self.name = name
+        self.retry_in = retry_in
+
+
+def is_failure(response=None, error=None):
+    # Server-side trouble only: declines and other 4xx answers mean the endpoint works.
+    if error is not None:
+        return isinstance(error, FAILURE_ERRORS)
+    return response.status_code >= 500 or response.status_code == 429
+
+
+class CircuitBreaker:
+    # Closed: calls pass, and the outcomes of the last `window` calls are kept. Once at
+    # least `min_calls` have been seen and the failure share reaches `failure_threshold`,
+    # the breaker opens and fails calls fast for `open_for` seconds. Then it goes half-open
+    # and lets `half_open_probes` trial calls through: if all succeed it closes, and any
+    # failure reopens it.
+
+    def __init__(self, name, failure_threshold=0.5, window=20, min_calls=10, open_for=5.0, half_open_probes=1,
+                 clock=time.monotonic, on_transition=None):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.min_calls = min_calls
+        self.open_for = open_for
+        self.half_open_probes = half_open_probes
+        self.clock = clock
+        self.on_transition = on_transition
+        self.state = CLOSED
+        self.outcomes = deque(maxlen=window)
+        self.opened_at = 0.0
+        self.probes = 0
+        self.probe_successes = 0
+        self.counts = Counter()
+
+    def before_call(self):
+        # Raises CircuitOpenError to fail fast; otherwise the call may proceed, and the
+        # return value (whether it is a half-open trial) goes back to after_call.
+        if self.state == OPEN:
+            remaining = self.opened_at + self.open_for - self.clock()
+            if remaining > 0:
+                self.counts["rejected"] += 1
+                raise CircuitOpenError(self.name, remaining)
+            self._move(HALF_OPEN, "open period elapsed")
+        if self.state == HALF_OPEN:
+            if self.probes >= self.half_open_probes:
+                self.counts["rejected"] += 1
+                raise CircuitOpenError(self.name, 0.0)
+            self.probes += 1
+            self.counts["calls"] += 1
+            return True
+        self.counts["calls"] += 1
+        return False
+
+    def after_call(self, failed, trial=False):
+        self.counts["failures" if failed else "successes"] += 1
+        if self.state != CLOSED and not trial:
+            # Admitted before the breaker opened; its outcome is already out of date.
+            return
+        if self.state == HALF_OPEN:
+            if failed:
+                self._move(OPEN, "trial call failed")
+            else:
+                self.probe_successes += 1
+                if self.probe_successes >= self.half_open_probes:
+                    self._move(CLOSED, "trial calls succeeded")
+            return
+        self.outcomes.append(failed)
+        failures = sum(self.outcomes)
+        if len(self.outcomes) >= self.min_calls and failures >= self.failure_threshold * len(self.outcomes):
+            self._move(OPEN, f"{failures} of the last {len(self.outcomes)} calls failed")
+
+    def abandon_call(self, trial=False):
+        # The call was cancelled before it produced an outcome; free its trial slot.
+        if trial and self.state == HALF_OPEN and self.probes > 0:
+            self.probes -= 1
+
+    def _move(self, state, reason):
+        previous, self.state = self.state, state
+        if state == OPEN:
+            self.opened_at = self.clock()
+        if state == HALF_OPEN:
+            self.probes = self.probe_successes = 0
+        if state == CLOSED:
+            self.outcomes.clear()
+        self.counts[f"to {state}"] += 1
+        if self.on_transition is not None:
+            self.on_transition(self.name, previous, state, reason)
+
+
+class CircuitBreakers:
+    # One breaker per endpoint (operation id), created on first use. Every state change
+    # is kept in `transitions` as (seconds since start, endpoint, from, to, reason).
+
+    def __init__(self, clock=time.monotonic, **settings):
+        self.clock = clock
+        self.settings = settings
+        self.started = clock()
+        self.breakers = {}
+        self.transitions = []
+
+    def get(self, name):
+        breaker = self.breakers.get(name)
+        if breaker is None:
+            breaker = self.breakers[name] = CircuitBreaker(name, clock=self.clock, on_transition=self._record, **self.settings)
+        return breaker
+
+    def _record(self, name, previous, state, reason):
+        self.transitions.append((self.clock() - self.started, name, previous, state, reason))
@@ -0,0 +1,49 @@
+import json
+import os
+from collections import Counter
+from urllib.parse import urlsplit
+
+
+def store_key(base_url, account_id, currency):
+    # Customers and their handles exist only on the API host that created them, so the
+    # simulator and the test environment never share entries.
+    return f"{urlsplit(base_url).netloc}/{account_id}/{currency}"
+
+
+class CustomerStore:
+    # Customers provisioned with a stored card through the Customers API, kept per API host,
+    # card account and currency as {"api.test.paysafe.com/1009688230/USD": [{"customerId",
+    # "paymentHandleId", "paymentHandleToken"}, ...]} in a JSON file so later runs reuse
+    # them. Their payment handles are MULTI_USE, so flows pay with them directly and take
+    # turns.
+
+    def __init__(self, path):
+        self.path = path
+        self.customers = {}
+        self.used = Counter()
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                self.customers = json.load(f).get("customers", {})
+
+    def save(self):
+        # Written to a temporary file first so an interrupted run never leaves half a cache.
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w") as f:
+            json.dump({"customers": self.customers}, f, indent=2)
+        os.replace(temporary, self.path)
+
+    def add(self, key, customer_id, handle_id, token):
+        self.customers.setdefault(key, []).append({"customerId": customer_id, "paymentHandleId": handle_id,
+                                                   "paymentHandleToken": token})
+
+    def missing(self, key, count):
+        return max(0, count - len(self.customers.get(key, ())))
+
+    def next_token(self, key):
+        # Round-robin over the key's customers, or None if there are none.
+        stored = self.customers.get(key)
+        if not stored:
+            return None
+        customer = stored[self.used[key] % len(stored)]
+        self.used[key] += 1
+        return customer["paymentHandleToken"]
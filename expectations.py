@@ -0,0 +1,92 @@
+import json
+import os
+import re
+import threading
+import time
+
+DELAY_PATTERN = re.compile(r"(\d+)-second delay")
+
+
+class Expectation:
+
+    __slots__ = ("amount", "http_status", "error_code", "message", "delay")
+
+    def __init__(self, amount, http_status, error_code, message):
+        self.amount = amount
+        self.http_status = http_status
+        self.error_code = None if error_code is None else str(error_code)
+        self.message = message
+        match = DELAY_PATTERN.search(message)
+        self.delay = float(match.group(1)) if match else 0.0
+
+    @property
+    def outcome(self):
+        # Same labels as the load summary uses for actual flows.
+        if self.http_status < 400:
+            return "approved"
+        return f"declined {self.error_code}" if self.error_code else f"http {self.http_status}"
+
+
+class Expectations:
+    # expect_response.json indexed by amount, error code and HTTP status. The file is
+    # parsed once and re-parsed only when its mtime changes, checked at most once per
+    # `check_interval` seconds, so lookups on the error path do no I/O.
+
+    def __init__(self, path="expect_response.json", check_interval=1.0):
+        self.path = path
+        self.check_interval = check_interval
+        self.by_amount = {}
+        self.by_error_code = {}
+        self.by_http_status = {}
+        self._mtime = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+        self.refresh(force=True)
+
+    def refresh(self, force=False):
+        now = time.monotonic()
+        if not force and now - self._checked < self.check_interval:
+            return
+        with self._lock:
+            self._checked = now
+            try:
+                mtime = os.stat(self.path).st_mtime
+            except FileNotFoundError:
+                mtime = None
+            if mtime == self._mtime and not force:
+                return
+            by_amount, by_error_code, by_http_status = {}, {}, {}
+            if mtime is not None:
+                with open(self.path, "r") as f:
+                    for item in json.load(f):
+                        # Entries may be keyed by error code alone (no simulator amount).
+                        amount = int(item["amount"]) if item.get("amount") is not None else None
+                        status = int(item.get("http_status") or (402 if item.get("error_code") else 200))
+                        entry = Expectation(amount, status, item.get("error_code"), item.get("response", ""))
+                        if amount is not None:
+                            by_amount[amount] = entry
+                        if entry.error_code is not None:
+                            by_error_code.setdefault(entry.error_code, entry)
+                        by_http_status.setdefault(entry.http_status, []).append(entry)
+            self.by_amount, self.by_error_code, self.by_http_status = by_amount, by_error_code, by_http_status
+            self._mtime = mtime
+
+    @property
+    def loaded(self):
+        return self._mtime is not None
+
+    def for_amount(self, amount):
+        self.refresh()
+        return self.by_amount.get(int(amount)) if amount is not None else None
+
+    def for_error_code(self, code):
+        self.refresh()
+        return self.by_error_code.get(str(code))
+
+    def for_http_status(self, status):
+        self.refresh()
+        return self.by_http_status.get(int(status), [])
+
+    def expected_outcome(self, amount):
+        entry = self.for_amount(amount)
+        return entry.outcome if entry is not None else None
@@ -0,0 +1,144 @@
+import hashlib
+import keyword
+import os
+import re
+import sys
+
+from spec_index import SPEC_PATH, load_index
+
+OUTPUT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "paysafe_client.py")
+BODY_METHODS = ("POST", "PUT", "PATCH")
+PYTHON_TYPES = {"integer": "int", "number": "float", "boolean": "bool"}
+
+HEADER = '''# Generated by generate_client.py from paysafe_payments_api_spec.yaml; do not edit.
+# Re-run `python generate_client.py` after updating the spec.
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import quote, urlencode
+
+SPEC_SHA256 = "{digest}"
+DEFAULT_BASE_URL = "{base_url}"
+
+
+class Operation:
+
+    __slots__ = ("operation_id", "method", "template", "path_params", "query_params", "headers")
+
+    def __init__(self, operation_id: str, method: str, template: str, path_params: Tuple[str, ...],
+                 query_params: Tuple[str, ...], headers: Dict[str, str]):
+        self.operation_id = operation_id
+        self.method = method
+        self.template = template
+        self.path_params = path_params
+        self.query_params = query_params
+        self.headers = headers
+
+    def path(self, values: Dict[str, Any]) -> str:
+        if not values:
+            return self.template
+        return self.template.format(**{{name: quote(str(value), safe="") for name, value in values.items()}})
+
+
+Send = Callable[..., Awaitable[Any]]
+
+'''
+
+CLIENT = '''
+
+class PaysafeClient:
+    # One method per spec operation. Each builds the URL from the precomputed template,
+    # merges the operation's default headers with the caller's, and hands the request to
+    # `send(operation, url, headers, body, **options)`, which owns transport and logging.
+
+    def __init__(self, base_url: str = DEFAULT_BASE_URL, send: Optional[Send] = None):
+        base_url = base_url.rstrip("/")
+        self.base_url = base_url[:-3] if base_url.endswith("/v1") else base_url
+        self.send = send
+
+    def _call(self, operation: Operation, path_values: Dict[str, Any], query: Dict[str, Any], body: Any,
+              headers: Optional[Dict[str, str]], extra_headers: Dict[str, Optional[str]], options: Dict[str, Any]) -> Awaitable[Any]:
+        url = self.base_url + operation.path(path_values)
+        query = {{name: value for name, value in query.items() if value is not None}}
+        if query:
+            url += "?" + urlencode(query)
+        merged = dict(operation.headers)
+        merged.update({{name: value for name, value in extra_headers.items() if value is not None}})
+        if headers:
+            merged.update(headers)
+        return self.send(operation, url, merged, body, **options)
+'''
+
+
+def snake_case(name):
+    name = re.sub(r"[^0-9a-zA-Z]+", "_", name)
+    name = re.sub(r"([a-z0-9])([A-Z])", r"\1_\2", name).lower().strip("_")
+    if keyword.iskeyword(name) or name[0].isdigit():
+        name += "_"
+    return name
+
+
+def annotation(schema):
+    return PYTHON_TYPES.get((schema or {}).get("type"), "str")
+
+
+def render_operation(op):
+    method_name = snake_case(op["operation_id"])
+    const = method_name.upper()
+    params = op["parameters"]
+    header_params = [p for p in params["header"] if p["name"] != "Content-Type"]
+    has_body = op["method"] in BODY_METHODS
+    headers = {"Accept": "application/json"}
+    if has_body:
+        headers["Content-Type"] = "application/json"
+
+    constant = (f'{const} = Operation({op["operation_id"]!r}, {op["method"]!r}, {op["path"]!r}, '
+                f'{tuple(op["path_params"])!r}, {tuple(p["name"] for p in params["query"])!r}, {headers!r})')
+
+    args = ["self"]
+    args += [f"{snake_case(name)}: str" for name in op["path_params"]]
+    if has_body:
+        args.append("body: Dict[str, Any]")
+    keyword_args = []
+    for param in params["query"]:
+        kind = annotation(param["schema"])
+        keyword_args.append(f"{snake_case(param['name'])}: {kind}" if param["required"] else f"{snake_case(param['name'])}: Optional[{kind}] = None")
+    keyword_args += [f"{snake_case(p['name'])}: Optional[str] = None" for p in header_params]
+    keyword_args += ["headers: Optional[Dict[str, str]] = None", "**options: Any"]
+    # Required keyword-only arguments must not follow ones with defaults in the
+    # rendered source, so required query parameters go first.
+    keyword_args.sort(key=lambda arg: "=" in arg or arg.startswith("**"))
+    signature = ", ".join(args + ["*"] + keyword_args)
+
+    path_values = "{" + ", ".join(f"{name!r}: {snake_case(name)}" for name in op["path_params"]) + "}"
+    query = "{" + ", ".join(f"{p['name']!r}: {snake_case(p['name'])}" for p in params["query"]) + "}"
+    extra = "{" + ", ".join(f"{p['name']!r}: {snake_case(p['name'])}" for p in header_params) + "}"
+    summary = (op["summary"] or op["operation_id"]).replace('"', "'")
+    method = (f"    def {method_name}({signature}) -> Awaitable[Any]:\n"
+              f"        \"\"\"{op['method']} {op['path']}: {summary}\"\"\"\n"
+              f"        return self._call({const}, {path_values}, {query}, {'body' if has_body else 'None'}, headers, {extra}, options)\n")
+    return constant, method
+
+
+def render(index, digest):
+    base_url = index.servers[0] if index.servers else "https://api.test.paysafe.com/paymenthub"
+    constants, methods = [], []
+    for operation_id in sorted(index.operations):
+        constant, method = render_operation(index.operations[operation_id])
+        constants.append(constant)
+        methods.append(method)
+    by_id = "\n".join(f"    {index.operations[oid]['operation_id']!r}: {snake_case(oid).upper()}," for oid in sorted(index.operations))
+    return (HEADER.format(digest=digest, base_url=base_url) + "\n".join(constants)
+            + f"\n\nOPERATIONS = {{\n{by_id}\n}}\n" + CLIENT.format() + "\n" + "\n".join(methods))
+
+
+def generate(spec_path=SPEC_PATH, output_path=OUTPUT_PATH):
+    with open(spec_path, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    source = render(load_index(spec_path), digest)
+    with open(output_path, "w") as f:
+        f.write(source)
+    return source
+
+
+if __name__ == "__main__":
+    generate(*sys.argv[1:3])
+    print(f"Wrote {OUTPUT_PATH}")
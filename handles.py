@@ -0,0 +1,102 @@
+import asyncio
+import time
+from collections import Counter, defaultdict, deque
+
+# Card payment handles live for 899 s; the API reports the exact figure in timeToLiveSeconds.
+DEFAULT_TTL = 899.0
+
+
+class HandlePool:
+    # Pre-minted single-use payment handles, up to `size` ready per key. A handle must match
+    # the payment's account, currency and amount, so keys are (account, currency, amount)
+    # tuples, each registered with a `mint()` coroutine function that creates one handle and
+    # returns the response document. `run()` is the background producer: it tops every key
+    # up as handles are taken and drops handles within `ttl_margin` seconds of expiry, so a
+    # payment never gets a token that lapses before the payment reaches the API.
+
+    def __init__(self, size=20, ttl_margin=60.0, sweep_interval=5.0, failure_backoff=1.0, clock=time.monotonic):
+        self.size = size
+        self.ttl_margin = ttl_margin
+        self.sweep_interval = sweep_interval
+        self.failure_backoff = failure_backoff
+        self.clock = clock
+        self.minters = {}
+        self.ready = defaultdict(deque)
+        self.pending = Counter()
+        self.counts = Counter()
+        self._retry_at = {}
+        self._wakeup = None
+
+    def register(self, key, mint):
+        self.minters[key] = mint
+
+    def take(self, key):
+        # A ready token for `key`, or None when the pool has run dry and the caller must mint its own.
+        if key not in self.minters:
+            return None
+        self.evict()
+        ready = self.ready[key]
+        token = ready.popleft()[0] if ready else None
+        self.counts["taken" if token else "missed"] += 1
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return token
+
+    def evict(self):
+        cutoff = self.clock() + self.ttl_margin
+        for ready in self.ready.values():
+            # Handles are queued as they are minted, so the first to expire is at the front.
+            while ready and ready[0][1] <= cutoff:
+                ready.popleft()
+                self.counts["expired"] += 1
+
+    def deficit(self, key):
+        return self.size - len(self.ready[key]) - self.pending[key]
+
+    async def fill(self):
+        # Mint until every key is full; run before measuring so the first flows find handles.
+        await asyncio.gather(*(self._mint(key) for key in self.minters for _ in range(self.deficit(key))))
+
+    async def run(self):
+        self._wakeup = asyncio.Event()
+        minting = set()
+        try:
+            while True:
+                self.evict()
+                now = self.clock()
+                for key in self.minters:
+                    if self._retry_at.get(key, 0.0) > now:
+                        continue
+                    for _ in range(self.deficit(key)):
+                        task = asyncio.ensure_future(self._mint(key))
+                        minting.add(task)
+                        task.add_done_callback(minting.discard)
+                # Not wait_for: it can swallow a cancel that lands in the same tick as a wakeup,
+                # leaving the producer running after the load run has ended.
+                waiter = asyncio.ensure_future(self._wakeup.wait())
+                try:
+                    await asyncio.wait([waiter], timeout=self.sweep_interval)
+                finally:
+                    waiter.cancel()
+                self._wakeup.clear()
+        finally:
+            for task in minting:
+                task.cancel()
+            self._wakeup = None
+
+    async def _mint(self, key):
+        self.pending[key] += 1
+        try:
+            document = await self.minters[key]()
+        except Exception:
+            # Whatever went wrong is the flows' problem too; back off rather than hammer the API.
+            self.counts["failed"] += 1
+            self._retry_at[key] = self.clock() + self.failure_backoff
+            return
+        finally:
+            self.pending[key] -= 1
+            if self._wakeup is not None:
+                self._wakeup.set()
+        ttl = float(document.get("timeToLiveSeconds") or DEFAULT_TTL)
+        self.ready[key].append((document["paymentHandleToken"], self.clock() + ttl))
+        self.counts["minted"] += 1
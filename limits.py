@@ -0,0 +1,176 @@
+import asyncio
+import base64
+import binascii
+import hashlib
+import time
+from collections import Counter, deque
+
+
+class AIMDLimiter:
+    # Adaptive cap on requests in flight, after TCP congestion control. Each request that
+    # comes back healthy adds 1/limit (about +1 per round of `limit` requests). The limit is
+    # cut by `backoff` on a 429, 5xx or network error, or when the step's smoothed latency
+    # rises above `tolerance` times its baseline. It is cut at most once per round, so one
+    # burst of slow responses counts once. The baseline is a much slower average of the
+    # same latencies (`baseline_smoothing`), so noise moves both alike, while a sudden rise
+    # shows in the fast average well before the baseline follows a service that stays slow.
+
+    def __init__(self, initial=10, min_limit=1, max_limit=1000, backoff=0.5, tolerance=2.0, baseline_smoothing=0.01,
+                 smoothing=0.1, sample_interval=1.0, clock=time.perf_counter):
+        self.limit = float(max(min_limit, min(initial, max_limit)))
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.tolerance = tolerance
+        self.baseline_smoothing = baseline_smoothing
+        self.smoothing = smoothing
+        self.sample_interval = sample_interval
+        self.clock = clock
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.baselines = {}
+        self.smoothed = {}
+        self.changes = Counter()
+        self.started = clock()
+        self.history = [(0.0, self.limit, 0)]
+        self._since_decrease = 0
+        self._waiters = deque()
+
+    async def acquire(self):
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self._take()
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as the caller was cancelled; pass it on.
+                self.in_flight -= 1
+                self._wake()
+            else:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self, step, latency=None, overloaded=False):
+        # `latency` None means the request produced no measurement (it was cancelled).
+        self.in_flight -= 1
+        if latency is not None:
+            self._adjust(step, latency, overloaded)
+        self._wake()
+
+    def _take(self):
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def _wake(self):
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._take()
+                waiter.set_result(None)
+
+    def _adjust(self, step, latency, overloaded):
+        smoothed = self.smoothed.get(step, latency)
+        smoothed += self.smoothing * (latency - smoothed)
+        self.smoothed[step] = smoothed
+        baseline = self.baselines.get(step, latency)
+        baseline += self.baseline_smoothing * (latency - baseline)
+        self.baselines[step] = baseline
+        self._since_decrease += 1
+        reason = "overload" if overloaded else ("latency" if smoothed > self.tolerance * baseline else None)
+        if reason is None:
+            self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+            self.changes["increase"] += 1
+        elif self._since_decrease >= self.limit:
+            self.limit = max(self.min_limit, self.limit * self.backoff)
+            self._since_decrease = 0
+            self.changes[f"decrease ({reason})"] += 1
+        now = self.clock()
+        if now - self.started - self.history[-1][0] >= self.sample_interval:
+            self.history.append((now - self.started, self.limit, self.in_flight))
+
+    def timeline(self, rows=20):
+        # Up to `rows` evenly spaced samples of (seconds, limit, in flight), ending with the current state.
+        samples = self.history + [(self.clock() - self.started, self.limit, self.in_flight)]
+        if len(samples) <= rows:
+            return samples
+        step = (len(samples) - 1) / (rows - 1)
+        return [samples[round(i * step)] for i in range(rows)]
+
+
+class TokenBucket:
+    # Tokens accrue at `rate` per second up to `burst`, and each request takes one. A
+    # request that finds the bucket empty reserves the next token to accrue and sleeps until
+    # then, so queued requests leave in arrival order at exactly `rate` per second.
+
+    def __init__(self, rate, burst=None, clock=time.monotonic):
+        self.rate = float(rate)
+        self.burst = max(1.0, float(rate if burst is None else burst))
+        self.clock = clock
+        self.tokens = self.burst
+        self.updated = clock()
+        self.granted = 0
+        self.delayed = 0
+        self.waited = 0.0
+        self.max_wait = 0.0
+
+    def reserve(self):
+        # Takes a token, possibly one that has not accrued yet; returns the seconds until it has.
+        now = self.clock()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1.0
+        self.granted += 1
+        wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait > 0:
+            self.delayed += 1
+            self.waited += wait
+            self.max_wait = max(self.max_wait, wait)
+        return wait
+
+    def cancel(self):
+        # Hand back a reserved token whose request was cancelled while waiting for it.
+        self.tokens = min(self.burst, self.tokens + 1.0)
+        self.granted -= 1
+
+    async def acquire(self):
+        # Returns the seconds spent waiting for the token.
+        wait = self.reserve()
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                self.cancel()
+                raise
+        return wait
+
+
+def key_label(authorization):
+    # A printable name for a Basic credential: its user name, never the password.
+    token = authorization.split(" ", 1)[-1]
+    try:
+        user, sep, _ = base64.b64decode(token, validate=True).decode("utf-8").partition(":")
+    except (binascii.Error, UnicodeDecodeError):
+        sep = ""
+    if sep and user:
+        return user
+    return "key " + hashlib.sha256(token.encode("utf-8")).hexdigest()[:8]
+
+
+class RateLimiters:
+    # One TokenBucket per API key (the Authorization header value), shared by every flow in
+    # the process, since the API enforces its limits per credential.
+
+    def __init__(self, rate, burst=None, clock=time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.buckets = {}
+
+    def get(self, authorization):
+        bucket = self.buckets.get(authorization)
+        if bucket is None:
+            bucket = self.buckets[authorization] = TokenBucket(self.rate, self.burst, self.clock)
+        return bucket
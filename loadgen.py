@@ -0,0 +1,110 @@
+import asyncio
+import random
+import time
+
+from metrics import Histogram
+
+
+async def run_closed_loop(start_flow, count=None, duration=None, concurrency=1):
+    # Keep `concurrency` flows in flight until `count` flows have started or
+    # `duration` seconds have elapsed, whichever comes first.
+    deadline = time.perf_counter() + duration if duration else None
+    started = 0
+
+    async def worker():
+        nonlocal started
+        while True:
+            if count is not None and started >= count:
+                return
+            if deadline is not None and time.perf_counter() >= deadline:
+                return
+            started += 1
+            await start_flow()
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return started
+
+
+def parse_schedule(text):
+    # "30:10,60:50" -> [(30.0, 10.0), (60.0, 50.0)]: 30 s at 10 flows/s, then 60 s at 50/s.
+    schedule = []
+    for step in text.split(","):
+        seconds, _, rate = step.strip().partition(":")
+        try:
+            schedule.append((float(seconds), float(rate)))
+        except ValueError:
+            raise ValueError(f"Bad rate schedule step {step!r}; expected SECONDS:RATE") from None
+        if schedule[-1][0] <= 0 or schedule[-1][1] < 0:
+            raise ValueError(f"Bad rate schedule step {step!r}; seconds must be positive and rate non-negative")
+    return schedule
+
+
+def arrival_offsets(rate=None, schedule=None, poisson=False, rng=None):
+    # Yields arrival times in seconds from the start of the run: evenly spaced at `rate`
+    # per second, or with exponential gaps when `poisson` is set. A schedule is a list
+    # of (seconds, rate) steps and ends the sequence when its last step does. Poisson
+    # gaps restart at each step boundary, which memorylessness makes exact.
+    rng = rng or random.Random()
+    steps = schedule if schedule is not None else [(float("inf"), rate)]
+    step_start = 0.0
+    for seconds, step_rate in steps:
+        step_end = step_start + seconds
+        if step_rate > 0:
+            gap = 1.0 / step_rate
+            at = step_start + (rng.expovariate(step_rate) if poisson else 0.0)
+            while at < step_end:
+                yield at
+                at += rng.expovariate(step_rate) if poisson else gap
+        step_start = step_end
+
+
+class OpenLoopStats:
+    # Arrivals that were due, flows actually started, and arrivals dropped because
+    # `max_outstanding` flows were already in flight. `backlog` samples the number of
+    # flows in flight at each arrival; `lag` is how late each start was against its
+    # scheduled time (the generator's own stall). `window` is the arrival phase, before
+    # the run waits for outstanding flows to finish.
+
+    def __init__(self):
+        self.scheduled = 0
+        self.started = 0
+        self.window = 0.0
+        self.dropped = 0
+        self.backlog = Histogram(lowest=1.0)
+        self.lag = Histogram()
+
+    @property
+    def peak_backlog(self):
+        return int(self.backlog.max)
+
+
+async def run_open_loop(start_flow, arrivals, count=None, duration=None, max_outstanding=None):
+    # Start `start_flow(intended_start)` at each arrival offset, whether or not earlier
+    # flows have finished, so a slow service builds a backlog instead of slowing the
+    # arrival rate. `intended_start` is the perf_counter() time the flow was due.
+    stats = OpenLoopStats()
+    outstanding = set()
+    origin = time.perf_counter()
+    for offset in arrivals:
+        if count is not None and stats.scheduled >= count:
+            break
+        if duration is not None and offset >= duration:
+            break
+        due = origin + offset
+        delay = due - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        stats.scheduled += 1
+        stats.backlog.record(len(outstanding))
+        if max_outstanding is not None and len(outstanding) >= max_outstanding:
+            stats.dropped += 1
+            continue
+        stats.lag.record(max(0.0, time.perf_counter() - due))
+        stats.started += 1
+        task = asyncio.ensure_future(start_flow(due))
+        outstanding.add(task)
+        task.add_done_callback(outstanding.discard)
+    stats.window = time.perf_counter() - origin
+    if outstanding:
+        await asyncio.gather(*outstanding)
+    return stats
@@ -1,34 +1,181 @@
 import argparse
+import asyncio
+import functools
 import json
-import time
 import uuid
 import requests
-import threading
 import tempfile
+import threading
+import time
 import traceback
+from contextlib import nullcontext
 from rich.console import Console
 from rich.table import Table
-from rich.progress import track
 from rich.panel import Panel
 from rich.prompt import Prompt
+from accounts import STRATEGIES, AccountPicker, parse_accounts
+from breaker import CircuitBreakers, CircuitOpenError, is_failure
+from customers import CustomerStore, store_key
+from expectations import Expectations
+from handles import HandlePool
+from limits import AIMDLimiter, RateLimiters, key_label
+from matrix import MATRIX_OPTIONS, ScenarioResult, build_scenarios, write_json, write_junit
+from loadgen import arrival_offsets, parse_schedule, run_closed_loop, run_open_loop
+from metrics import RunStats, corrected_latency
+from paysafe_client import DEFAULT_BASE_URL, LOOK_UP_PAYMENT_METHODS, OPERATIONS, VERIFY_THAT_THE_SERVICE_IS_ACCESSIBLE, PaysafeClient
+from recording import TrafficRecorder
+from replay import DEFAULT_MAX_IN_FLIGHT, Replayer, iter_records
+from retry import RetryBudget, RetryPolicy, RetryRule, parse_rule
+from polling import PAYMENT_TERMINAL_STATES, REFUND_TERMINAL_STATES, SETTLEMENT_TERMINAL_STATES, Poller, PollResult
+from transport import DEFAULT_TIMEOUT, AsyncTransport, PooledTransport, ThreadedTransport
+from validation import PayloadValidationError, RequestValidator, ResponseValidator, RouteTable
+from webhooks import WebhookReceiver
 
 console = Console()
 
-PAYSAFE_API_BASE = "https://api.test.paysafe.com/paymenthub/v1"
+PAYSAFE_API_BASE = DEFAULT_BASE_URL
+# Card every non-interactive flow tokenizes; replays put it back into recordings, which mask it.
+TEST_CARD = {
+    "cardNum": "4000000000002503",
+    "cardExpiry": {"month": "02", "year": "2026"},
+    "cvv": 111,
+    "holderName": "John Doe"
+}
+# Requests sent outside any flow, e.g. by the handle pool's producer; they are kept out of
+# the measured request count and req/s.
+HANDLE_POOL_STEP = "paymenthandle_pool"
+BACKGROUND_STEPS = frozenset({HANDLE_POOL_STEP})
+
+transport = ThreadedTransport(PooledTransport())
+run_stats = RunStats()
+payment_poller = Poller(PAYMENT_TERMINAL_STATES)
+refund_poller = Poller(REFUND_TERMINAL_STATES)
+webhook_receiver = None
+webhook_timeout = 10.0
+expectations = Expectations()
+request_validator = None
+response_validator = None
+recorder = None
+retry_policy = None
+circuit_breakers = None
+concurrency_limiter = None
+rate_limiters = None
+account_picker = None
+handle_pool = None
+customer_store = None
+
+def configure_transport(engine, pool_size, max_per_host, idle_timeout, max_workers=None, request_timeout=DEFAULT_TIMEOUT):
+    # `request_timeout` bounds every request (connect, send and read); 0 waits forever.
+    global transport
+    transport.close()
+    if engine == "asyncio":
+        transport = AsyncTransport(pool_size, max_per_host, idle_timeout, timeout=request_timeout)
+    else:
+        transport = ThreadedTransport(PooledTransport(pool_size, max_per_host, idle_timeout, timeout=request_timeout or None),
+                                      max_workers)
+    return transport
+
+def configure_pollers(initial_interval, max_interval, deadline):
+    global payment_poller, refund_poller
+    payment_poller = Poller(PAYMENT_TERMINAL_STATES, initial_interval, max_interval=max_interval, deadline=deadline)
+    refund_poller = Poller(REFUND_TERMINAL_STATES, initial_interval, max_interval=max_interval, deadline=deadline)
+
+def configure_api(base_url):
+    global api, PAYSAFE_API_BASE
+    api = PaysafeClient(base_url, send_operation)
+    PAYSAFE_API_BASE = api.base_url
+    return api
+
+def configure_recording(path, max_bytes, backups):
+    global recorder
+    recorder = TrafficRecorder(path, max_bytes, backups) if path else None
+    return recorder
+
+def configure_retries(max_attempts, rules=(), budget_ratio=0.1, base_delay=0.1, max_delay=5.0):
+    # max_attempts 1 turns retries off; `rules` are OPERATION=ATTEMPTS overrides.
+    global retry_policy
+    default_rule = RetryRule(max_attempts)
+    overrides = dict(parse_rule(rule, default_rule) for rule in rules)
+    if max_attempts <= 1 and all(rule.max_attempts <= 1 for rule in overrides.values()):
+        retry_policy = None
+    else:
+        retry_policy = RetryPolicy(overrides, default_rule, base_delay, max_delay, budget=RetryBudget(budget_ratio))
+    return retry_policy
+
+def configure_breakers(enabled, failure_threshold=0.5, window=20, min_calls=10, open_for=5.0):
+    global circuit_breakers
+    circuit_breakers = CircuitBreakers(failure_threshold=failure_threshold, window=window, min_calls=min_calls,
+                                       open_for=open_for) if enabled else None
+    return circuit_breakers
+
+def configure_concurrency_limit(enabled, initial=10, max_limit=1000, tolerance=2.0):
+    global concurrency_limiter
+    concurrency_limiter = AIMDLimiter(initial, max_limit=max_limit, tolerance=tolerance) if enabled else None
+    return concurrency_limiter
+
+def configure_rate_limit(rate, burst=None):
+    # `rate` requests per second for each API key; 0 or None turns rate limiting off.
+    global rate_limiters
+    rate_limiters = RateLimiters(rate, burst) if rate else None
+    return rate_limiters
+
+def configure_accounts(env, strategy="round-robin"):
+    global account_picker
+    account_picker = AccountPicker(parse_accounts(env), strategy)
+    return account_picker
+
+def configure_handle_pool(size, ttl_margin=60.0):
+    # `size` ready handles per (account, currency, amount); 0 turns pre-minting off.
+    global handle_pool
+    handle_pool = HandlePool(size, ttl_margin) if size > 0 else None
+    return handle_pool
+
+def configure_customers(cache_path):
+    global customer_store
+    customer_store = CustomerStore(cache_path) if cache_path else None
+    return customer_store
+
+def configure_webhooks(host, port, timeout, secret=None):
+    global webhook_receiver, webhook_timeout
+    webhook_receiver = WebhookReceiver(host, port, secret=secret)
+    webhook_timeout = timeout
+    return webhook_receiver
+
+def configure_validation(requests_enabled, response_sample_rate=0.0):
+    global request_validator, response_validator
+    request_validator = response_validator = None
+    if requests_enabled or response_sample_rate > 0:
+        from spec_index import default_index
+        index = default_index()
+        routes = RouteTable(index)
+        if requests_enabled:
+            request_validator = RequestValidator(index, routes)
+        if response_sample_rate > 0:
+            response_validator = ResponseValidator(index, response_sample_rate, routes)
+
+def status_display(message):
+    # Concurrent flows cannot share a live display, so load runs (quiet console) skip it.
+    return nullcontext() if console.quiet else console.status(message)
+
+def run_sync(coro):
+    async def runner():
+        try:
+            return await coro
+        finally:
+            await transport.release()
+    return asyncio.run(runner())
 
 def load_env(env_path):
     with open(env_path, 'r') as f:
         env_data = json.load(f)
         return {item['key']: item['value'] for item in env_data['values'] if item['enabled']}
 
-def load_expected_responses():
-    try:
-        with open("expect_response.json", 'r') as f:
-            data = json.load(f)
-            return {str(item["error_code"]): item["response"] for item in data if "error_code" in item and "response" in item}
-    except FileNotFoundError:
-        console.print("[red]expect_response.json not found. Skipping expected code check.[/red]")
-        return {}
+def load_expected_responses(path="expect_response.json"):
+    global expectations
+    expectations = Expectations(path)
+    if not expectations.loaded:
+        console.print(f"[red]{path} not found. Skipping expected code check.[/red]")
+    return expectations
 
 def generate_merchant_ref():
     return str(uuid.uuid4())
@@ -39,17 +186,77 @@ def auth_header(key):
         "Accept": "application/json"
     }
 
-payment_status_shared = {"payment_id": None}
-
-def cancel_payment_if_needed_threadsafe(private_key):
-    while payment_status_shared["payment_id"] is None:
-        time.sleep(0.2)
-    payment_id = payment_status_shared["payment_id"]
-    cancel_url = f"https://api.test.paysafe.com/paymenthub/v1/payments/{payment_id}"
-    headers = auth_header(private_key)
-    headers.update({"Content-Type": "application/json", "Simulator": "INTERNAL"})
-    payload = {"status": "CANCELLED"}
-    response = requests.put(cancel_url, headers=headers, json=payload)
+class FlowContext:
+    # State for a single payment flow; concurrent flows in one process each get their own.
+    # `ready_at` is when the flow's next request is due: its scheduled start, then the end
+    # of the previous request or of a deliberate wait. Time between that and the actual
+    # send is client stall, added to the request's coordinated-omission-corrected latency.
+    # `account` names the merchant account the flow runs under when load is spread over several.
+
+    def __init__(self, merchant_ref=None, handle_token=None, intended_start=None, account=None):
+        self.flow_id = uuid.uuid4().hex
+        self.account = account
+        self.merchant_ref = merchant_ref or generate_merchant_ref()
+        self.handle_token = handle_token
+        self.payment_id = None
+        self.status = None
+        self.started = time.perf_counter()
+        self.ready_at = self.started if intended_start is None else min(intended_start, self.started)
+        self.timings = {}
+        self.polls = {}
+        self._payment_lock = threading.Lock()
+        self._payment_waiters = []
+
+    def set_payment_id(self, payment_id):
+        # Waiters may sit on another thread's loop (the threadsafe cancel helper runs its
+        # own), so each is woken through the loop that created it.
+        with self._payment_lock:
+            self.payment_id = payment_id
+            waiters, self._payment_waiters = self._payment_waiters, []
+        for loop, waiter in waiters:
+            try:
+                loop.call_soon_threadsafe(_resolve_waiter, waiter, payment_id)
+            except RuntimeError:
+                pass  # the waiting loop has already closed
+
+    async def wait_for_payment_id(self):
+        loop = asyncio.get_running_loop()
+        with self._payment_lock:
+            if self.payment_id is not None:
+                return self.payment_id
+            waiter = loop.create_future()
+            self._payment_waiters.append((loop, waiter))
+        return await waiter
+
+    def record(self, step, seconds):
+        self.timings.setdefault(step, []).append(seconds)
+
+    def mark_ready(self):
+        self.ready_at = time.perf_counter()
+
+    async def pause(self, seconds):
+        # A deliberate wait: the next request is due when it ends, not when the loop gets round to it.
+        self.ready_at = time.perf_counter() + seconds
+        await asyncio.sleep(seconds)
+
+    def record_polls(self, step, result):
+        self.polls[step] = result.polls
+        run_stats.record_polls(step, result.polls, result.source)
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+def _resolve_waiter(waiter, value):
+    if not waiter.done():
+        waiter.set_result(value)
+
+def cancel_payment_if_needed_threadsafe(ctx, private_key):
+    return run_sync(cancel_payment_if_needed_async(ctx, private_key))
+
+async def cancel_payment_if_needed_async(ctx, private_key):
+    payment_id = await ctx.wait_for_payment_id()
+    response = await api.cancel_payments(payment_id, {"status": "CANCELLED"}, simulator="INTERNAL",
+                                         headers=auth_header(private_key), step="cancel", ctx=ctx, raw=True)
     if response.ok:
         data = response.json()
         console.print(f"[blue]Cancellation response:[/blue] {data['status']}")
@@ -57,17 +264,17 @@ def cancel_payment_if_needed_threadsafe(private_key):
         console.print("[red]Failed to cancel payment.[/red]")
         console.print(response.text)
 
-def perform_settlement(payment_id, amount, private_key, merchant_ref):
-    url = f"https://api.test.paysafe.com/paymenthub/v1/payments/{payment_id}/settlements"
+def perform_settlement(ctx, amount, private_key):
+    return run_sync(perform_settlement_async(ctx, amount, private_key))
+
+async def perform_settlement_async(ctx, amount, private_key):
     payload = {
-        "merchantRefNum": merchant_ref,
+        "merchantRefNum": ctx.merchant_ref,
         "dupCheck": True,
         "amount": amount
     }
-    headers = auth_header(private_key)
-    headers.update({"Content-Type": "application/json", "Simulator": "INTERNAL"})
-
-    response = post_with_logging(url, headers, payload)
+    response = await api.process_settlement(ctx.payment_id, payload, simulator="INTERNAL", headers=auth_header(private_key),
+                                            step="settlement", ctx=ctx)
     data = response
 
     console.print(Panel.fit(f"[bold cyan]Settlement Response:[/bold cyan]\n"
@@ -77,60 +284,93 @@ def perform_settlement(payment_id, amount, private_key, merchant_ref):
                             f"Amount: {data.get('amount')}\n"
                             f"Available to Refund: {data.get('availableToRefund')}", title="Settlement"))
 
-    if data.get("status") == "PENDING" or data.get("availableToRefund", 0) < amount:
+    needs_cancel = data.get("status") == "PENDING" or data.get("availableToRefund", 0) < amount
+    if needs_cancel and webhook_receiver is not None and data.get("status") not in SETTLEMENT_TERMINAL_STATES:
+        # Give the settlement notification a chance to settle the question before cancelling.
+        with status_display("Waiting for settlement notification..."):
+            result = await webhook_receiver.wait_for(data.get("id"), SETTLEMENT_TERMINAL_STATES, webhook_timeout)
+            ctx.mark_ready()
+        if result is not None:
+            ctx.record_polls("settlement_status", result)
+            data = dict(data, **result.document)
+            console.print(f"[blue]Settlement notification:[/blue] {data.get('status')}")
+            needs_cancel = data.get("status") != "COMPLETED" or data.get("availableToRefund", amount) < amount
+    if needs_cancel:
         console.print("[yellow]Settlement is PENDING or amount mismatch — attempting to cancel payment.[/yellow]")
-        cancel_payment_if_needed_threadsafe(private_key)
+        await cancel_payment_if_needed_async(ctx, private_key)
 
     return data.get("id")
 
 
 
-def attempt_refund(settlement_id, amount, merchant_ref, currency, private_key):
+def attempt_refund(ctx, settlement_id, amount, currency, private_key):
+    return run_sync(attempt_refund_async(ctx, settlement_id, amount, currency, private_key))
+
+async def attempt_refund_async(ctx, settlement_id, amount, currency, private_key):
     console.print("[bold]7. Initiating Refund...[/bold]")
-    url = f"https://api.test.paysafe.com/paymenthub/v1/settlements/{settlement_id}/refunds"
-    headers = auth_header(private_key)
-    headers.update({"Content-Type": "application/json", "Simulator": "INTERNAL"})
     payload = {
-        "merchantRefNum": merchant_ref,
+        "merchantRefNum": ctx.merchant_ref,
         "amount": amount,
         "dupCheck": True
     }
-    refund = post_with_logging(url, headers, payload)
+    refund = await api.process_refund(settlement_id, payload, simulator="INTERNAL", headers=auth_header(private_key),
+                                      step="refund", ctx=ctx)
     refund_id = refund['id']
     console.print(f"[green]Refund Submitted. ID:[/green] {refund_id}")
-    for _ in range(10):
-        status = get_with_logging(f"https://api.test.paysafe.com/paymenthub/v1/refunds/{refund_id}", auth_header(private_key))
-        if status['status'] == 'COMPLETED':
-            console.print(f"[bold green]Refund Completed[/bold green] ✅")
-            return
-        time.sleep(2)
-    console.print("[yellow]Refund still processing or failed after retries.[/yellow]")
-
-def submit_payment_and_poll(handle_token, merchant_ref, amount, currency, private_key, refund_flag):
+    fetch = functools.partial(api.get_refund, refund_id, headers=auth_header(private_key), step="refund_status", ctx=ctx)
+    result = await await_terminal_status(ctx, "refund_status", refund, refund_poller, fetch, "Checking refund status...")
+    if result.status == 'COMPLETED':
+        console.print(f"[bold green]Refund Completed[/bold green] ✅ [dim]({result.source}, {result.polls} polls, {result.elapsed:.2f}s)[/dim]")
+        return
+    console.print(f"[yellow]Refund still processing or failed after {result.polls} polls (status {result.status}).[/yellow]")
+
+async def await_terminal_status(ctx, step, created, poller, fetch, message):
+    # Prefer the create response, then a webhook notification, then polling.
+    if poller.is_terminal(created):
+        result = PollResult(created, 0, 0.0, False, source="response")
+    else:
+        result = None
+        with status_display(message):
+            if webhook_receiver is not None:
+                result = await webhook_receiver.wait_for(created['id'], poller.terminal_states, webhook_timeout)
+                ctx.mark_ready()
+            if result is None:
+                result = await poller.poll(fetch, ctx.pause)
+    ctx.record_polls(step, result)
+    return result
+
+def submit_payment_and_poll(ctx, amount, currency, private_key, refund_flag):
+    return run_sync(submit_payment_and_poll_async(ctx, amount, currency, private_key, refund_flag))
+
+async def submit_payment_and_poll_async(ctx, amount, currency, private_key, refund_flag):
     payment_payload = {
-        "merchantRefNum": merchant_ref,
+        "merchantRefNum": ctx.merchant_ref,
         "amount": amount,
         "currencyCode": currency,
-        "paymentHandleToken": handle_token
+        "paymentHandleToken": ctx.handle_token
     }
-    payment = post_with_logging("https://api.test.paysafe.com/paymenthub/v1/payments", auth_header(private_key), payment_payload)
+    payment = await api.process_payment(payment_payload, headers=auth_header(private_key), step="payments", ctx=ctx)
     payment_id = payment['id']
-    payment_status_shared["payment_id"] = payment_id
+    ctx.set_payment_id(payment_id)
     console.print(f"[green]Payment Submitted. ID:[/green] {payment_id}")
 
     console.print("[bold]5. Polling for Payment Completion...[/bold]")
-    for _ in track(range(10), description="Checking payment status..."):
-        status = get_with_logging(f"https://api.test.paysafe.com/paymenthub/v1/payments/{payment_id}", auth_header(private_key))
-        if status['status'] == 'COMPLETED':
-            console.print(f"[bold green]Payment Completed[/bold green] ✅")
-            # Always perform settlement
-            settlement_id = perform_settlement(payment_id, amount, private_key, merchant_ref)
-            if refund_flag and settlement_id:
-                attempt_refund(settlement_id, amount, merchant_ref, currency, private_key)
-            break
-        time.sleep(2)
-    else:
+    fetch = functools.partial(api.get_payments, payment_id, headers=auth_header(private_key), step="payment_status", ctx=ctx)
+    result = await await_terminal_status(ctx, "payment_status", payment, payment_poller, fetch, "Checking payment status...")
+    if result.status == 'COMPLETED':
+        console.print(f"[bold green]Payment Completed[/bold green] ✅ [dim]({result.source}, {result.polls} polls, {result.elapsed:.2f}s)[/dim]")
+        # Always perform settlement
+        settlement_id = await perform_settlement_async(ctx, amount, private_key)
+        if refund_flag and settlement_id:
+            await attempt_refund_async(ctx, settlement_id, amount, currency, private_key)
+        ctx.status = "COMPLETED"
+    elif result.timed_out:
         console.print(f"[bold red]Payment not completed in time.[/bold red]")
+        ctx.status = "TIMEOUT"
+    else:
+        console.print(f"[bold red]Payment ended in status {result.status}.[/bold red]")
+        ctx.status = result.status
+    return ctx.status
 
 
 def display_payment_methods(payment_methods):
@@ -213,11 +453,110 @@ def enrich_payload(payload):
     return payload
 
 
-def post_with_logging(url, headers, payload):
+async def send_request(method, url, headers, payload, step, ctx=None, operation_id=None):
+    if request_validator is not None and payload is not None:
+        # Fail before the round-trip; the compiled checker costs microseconds per payload.
+        request_validator.validate(method, url, payload, operation_id)
+    if retry_policy is None:
+        response = await guarded_attempt(method, url, headers, payload, step, ctx, operation_id)
+    else:
+        response = await send_with_retries(method, url, headers, payload, step, ctx, operation_id)
+    if response_validator is not None:
+        # Outside the timed section: its cost is reported on its own.
+        response_validator.observe(method, url, response, operation_id)
+    return response
+
+async def send_with_retries(method, url, headers, payload, step, ctx=None, operation_id=None):
+    rule = retry_policy.rule_for(operation_id, method)
+    retry_policy.budget.deposit()
+    attempt = 1
+    while True:
+        response = error = None
+        try:
+            response = await guarded_attempt(method, url, headers, payload, step, ctx, operation_id)
+        except Exception as exc:
+            error = exc
+        reason = retry_policy.reason(rule, method, attempt, payload, response, error)
+        if reason is not None and not retry_policy.budget.withdraw():
+            run_stats.record_retry(step, reason, allowed=False)
+            reason = None
+        if reason is None:
+            if error is not None:
+                raise error
+            return response
+        run_stats.record_retry(step, reason)
+        delay = retry_policy.delay(attempt, response)
+        if ctx is not None:
+            await ctx.pause(delay)
+        else:
+            await asyncio.sleep(delay)
+        payload = retry_policy.retry_payload(rule, payload)
+        attempt += 1
+
+async def guarded_attempt(method, url, headers, payload, step, ctx=None, operation_id=None):
+    # One attempt through the endpoint's circuit breaker, which raises CircuitOpenError
+    # instead of sending while the endpoint is failing.
+    if circuit_breakers is None:
+        return await send_attempt(method, url, headers, payload, step, ctx, operation_id)
+    breaker = circuit_breakers.get(operation_id or f"{method} {step}")
+    trial = breaker.before_call()
     try:
-        response = requests.post(url, headers=headers, json=payload)
+        response = await send_attempt(method, url, headers, payload, step, ctx, operation_id)
+    except Exception as exc:
+        breaker.after_call(is_failure(error=exc), trial)
+        raise
+    except BaseException:
+        breaker.abandon_call(trial)
+        raise
+    breaker.after_call(is_failure(response), trial)
+    return response
+
+async def send_attempt(method, url, headers, payload, step, ctx=None, operation_id=None):
+    if rate_limiters is not None:
+        # Queued before the timed section: the wait shows up in its own histogram, not in step latency.
+        run_stats.record_rate_limit_wait(step, await rate_limiters.get(headers.get("Authorization", "")).acquire())
+    if concurrency_limiter is not None:
+        await concurrency_limiter.acquire()
+    started_at = time.time()
+    started = time.perf_counter()
+    response = error = None
+    try:
+        response = await transport.request(method, url, headers=headers, json=payload)
+    except Exception as exc:
+        error = exc
+        raise
+    finally:
+        finished = time.perf_counter()
+        elapsed = finished - started
+        if concurrency_limiter is not None:
+            measured = response is not None or error is not None
+            concurrency_limiter.release(step, elapsed if measured else None, measured and is_failure(response, error))
+        corrected = corrected_latency(started, finished, ctx.ready_at if ctx is not None else None)
+        run_stats.record_request(step, elapsed, corrected, ctx.account if ctx is not None else None,
+                                 step in BACKGROUND_STEPS)
+        if ctx is not None:
+            ctx.record(step, elapsed)
+            ctx.ready_at = finished
+        if recorder is not None:
+            recorder.record(ctx.flow_id if ctx else None, step, OPERATIONS.get(operation_id), method, url, headers, payload,
+                            started_at, elapsed, response, error)
+    return response
+
+def post_with_logging(url, headers, payload, step="post", ctx=None):
+    return run_sync(post_with_logging_async(url, headers, payload, step, ctx))
+
+async def post_with_logging_async(url, headers, payload, step="post", ctx=None):
+    return await request_with_logging_async("POST", url, headers, payload, step, ctx)
+
+async def request_with_logging_async(method, url, headers, payload, step, ctx=None, operation_id=None):
+    try:
+        response = await send_request(method, url, headers, payload, step, ctx, operation_id)
         response.raise_for_status()
         return response.json()
+    except PayloadValidationError as exc:
+        console.print(Panel.fit("\n".join(exc.errors), title=f"[red]Invalid {exc.operation_id} payload[/red]",
+                                subtitle="Not sent: the body does not match the OpenAPI spec"))
+        raise
     except requests.exceptions.HTTPError:
         try:
             err_json = response.json()
@@ -227,10 +566,9 @@ def post_with_logging(url, headers, payload):
             details = "\n".join([f"[bold cyan]{d.get('type')}[/bold cyan] ({d.get('code')}): {d.get('message')}" for d in additional])
             summary = f"[red]Error Code:[/red] {code}\n[red]Message:[/red] {message}\n{details}"
 
-            expected_map = load_expected_responses()
-            expected_info = expected_map.get(code)
+            expected_info = expectations.for_error_code(code)
             if expected_info:
-                console.print(Panel.fit(f"Expected: [green]{expected_info}[/green]\nActual: [cyan]{message}[/cyan]", title="[blue]Error Code Validation[/blue]"))
+                console.print(Panel.fit(f"Expected: [green]{expected_info.message}[/green]\nActual: [cyan]{message}[/cyan]", title="[blue]Error Code Validation[/blue]"))
             else:
                 console.print(f"[yellow]No expectation found for error code {code}[/yellow]")
 
@@ -245,9 +583,12 @@ def post_with_logging(url, headers, payload):
                 console.print(f"[dim]Traceback saved to:[/dim] {tmp.name}\n[bold yellow]To view details:[/bold yellow] [italic]cat {tmp.name}[/italic]")
         raise
 
-def get_with_logging(url, headers):
+def get_with_logging(url, headers, step="get", ctx=None):
+    return run_sync(get_with_logging_async(url, headers, step, ctx))
+
+async def get_with_logging_async(url, headers, step="get", ctx=None, operation_id=None):
     try:
-        response = requests.get(url, headers=headers)
+        response = await send_request("GET", url, headers, None, step, ctx, operation_id)
         response.raise_for_status()
         return response.json()
     except Exception:
@@ -257,17 +598,109 @@ def get_with_logging(url, headers):
             console.print(f"[dim]Traceback saved to:[/dim] {tmp.name}\n[bold yellow]To view details:[/bold yellow] [italic]cat {tmp.name}[/italic]")
         raise
 
+async def send_operation(operation, url, headers, body, step=None, ctx=None, raw=False):
+    # The PaysafeClient transport hook: raw returns the response as is, otherwise
+    # errors are logged and the decoded JSON body is returned.
+    step = step or operation.operation_id
+    if raw:
+        return await send_request(operation.method, url, headers, body, step, ctx, operation.operation_id)
+    if operation.method == "GET":
+        return await get_with_logging_async(url, headers, step, ctx, operation.operation_id)
+    return await request_with_logging_async(operation.method, url, headers, body, step, ctx, operation.operation_id)
+
+api = PaysafeClient(PAYSAFE_API_BASE, send_operation)
+
+def display_pool_stats(stats):
+    table = Table(title="Connection Pool")
+    table.add_column("Base URL")
+    table.add_column("Requests", justify="right")
+    table.add_column("Hits", justify="right")
+    table.add_column("Misses", justify="right")
+    table.add_column("Evictions", justify="right")
+    for base, counts in sorted(stats.items()):
+        table.add_row(base, str(counts["requests"]), str(counts["hits"]), str(counts["misses"]), str(counts["evictions"]))
+    console.print(table)
+
+def display_circuit_breakers(breakers):
+    if breakers.transitions:
+        transitions = Table(title="Circuit Breaker Transitions")
+        transitions.add_column("At (s)", justify="right")
+        transitions.add_column("Endpoint")
+        transitions.add_column("Change")
+        transitions.add_column("Reason")
+        for at, name, previous, state, reason in breakers.transitions:
+            colour = {"open": "red", "half-open": "yellow", "closed": "green"}[state]
+            transitions.add_row(f"{at:.2f}", name, f"{previous} -> [{colour}]{state}[/{colour}]", reason)
+        console.print(transitions)
+    table = Table(title="Circuit Breakers")
+    table.add_column("Endpoint")
+    table.add_column("State")
+    for column in ("Calls", "Failures", "Fast-failed", "Opened"):
+        table.add_column(column, justify="right")
+    for name, breaker in sorted(breakers.breakers.items()):
+        counts = breaker.counts
+        table.add_row(name, breaker.state, str(counts["calls"]), str(counts["failures"]), str(counts["rejected"]), str(counts["to open"]))
+    console.print(table)
+
+def display_concurrency_limit(limiter):
+    table = Table(title="Adaptive Concurrency Limit")
+    for column in ("At (s)", "Limit", "In flight"):
+        table.add_column(column, justify="right")
+    for at, limit, in_flight in limiter.timeline():
+        table.add_row(f"{at:.1f}", f"{limit:.1f}", str(in_flight))
+    console.print(table)
+    changes = ", ".join(f"{count} {change}" for change, count in sorted(limiter.changes.items()))
+    console.print(f"[dim]Limit range {limiter.min_limit}-{limiter.max_limit}; peak in flight {limiter.peak_in_flight}; {changes or 'no changes'}[/dim]")
+
+def display_rate_limits(limiters):
+    table = Table(title=f"Rate Limits ({limiters.rate:g}/s per API key)")
+    table.add_column("API key")
+    for column in ("Burst", "Requests", "Delayed", "Total wait (s)", "Max wait (ms)"):
+        table.add_column(column, justify="right")
+    for authorization, bucket in sorted(limiters.buckets.items(), key=lambda item: key_label(item[0])):
+        table.add_row(key_label(authorization), f"{bucket.burst:g}", str(bucket.granted), str(bucket.delayed),
+                      f"{bucket.waited:.2f}", f"{bucket.max_wait * 1000:.1f}")
+    console.print(table)
+
+def display_handle_pool(pool):
+    counts = pool.counts
+    ready = sum(len(handles) for handles in pool.ready.values())
+    missed = f"[yellow]{counts['missed']}[/yellow]" if counts["missed"] else "0"
+    console.print(Panel.fit(f"Minted: [bold]{counts['minted']}[/bold] ({counts['failed']} failed); "
+                            f"taken by flows: [bold]{counts['taken']}[/bold]; missed (flow minted its own): {missed}\n"
+                            f"Expired before use: {counts['expired']}; left unused: {ready}",
+                            title=f"[blue]Payment Handle Pool ({pool.size} per account, currency and amount)[/blue]"))
+
+def display_response_validation(validator):
+    table = Table(title=f"Response Validation (sample rate {validator.sample_rate:g})")
+    table.add_column("Operation")
+    for column in ("Checked", "Failed", "Mean cost (us)"):
+        table.add_column(column, justify="right")
+    table.add_column("Top violations")
+    for operation_id, row in validator.summary().items():
+        violations = "\n".join(f"{hits}x {error}" for error, hits in row["top_violations"])
+        failed = f"[red]{row['failed']}[/red]" if row["failed"] else "0"
+        table.add_row(operation_id, str(row["checked"]), failed, f"{row['mean_cost'] * 1e6:.0f}", violations)
+    console.print(table)
+    total = sum(validator.cost.values())
+    console.print(f"[dim]{validator.seen} responses, {sum(validator.checked.values())} validated; "
+                  f"validation cost {total * 1000:.1f} ms in total[/dim]")
+
 def run_test(env, currency, amount, refund_flag, cancel_flag, interactive_flag):
+    return run_sync(run_test_async(env, currency, amount, refund_flag, cancel_flag, interactive_flag))
+
+async def run_test_async(env, currency, amount, refund_flag, cancel_flag, interactive_flag, ctx=None):
+    ctx = ctx or FlowContext()
     if not interactive_flag and amount is None:
         console.print("[red]Amount must be provided unless --interactive is enabled.[/red]")
         exit(1)
     if interactive_flag and amount is None:
         amount = prompt_amount()
 
-    expected_map = load_expected_responses()
-    expected = expected_map.get(str(amount))
+    expected = expectations.for_amount(amount)
     if expected:
-        console.print(Panel.fit(f"Simulated Amount: [bold cyan]{amount}[/bold cyan]\nExpecting Code: [italic green]{expected}[/italic green]", title="[blue]Simulation Info[/blue]"))
+        console.print(Panel.fit(f"Simulated Amount: [bold cyan]{amount}[/bold cyan]\nExpecting: [italic green]{expected.message}[/italic green] "
+                                f"(HTTP {expected.http_status}{f', code {expected.error_code}' if expected.error_code else ''})", title="[blue]Simulation Info[/blue]"))
     else:
         console.print(f"[yellow]Note:[/yellow] No known simulator behavior defined for amount = {amount}")
 
@@ -277,15 +710,54 @@ def run_test(env, currency, amount, refund_flag, cancel_flag, interactive_flag):
     account_id = env[f"account_id_cards_{currency.lower()}"]
 
     console.print("[bold]1. Verifying API Health...[/bold]")
-    health = get_with_logging("https://api.test.paysafe.com/paymenthub/v1/monitor", auth_header(public_key))
+    health = await api.verify_that_the_service_is_accessible(headers=auth_header(public_key), step="monitor", ctx=ctx)
     console.print(f"[green]Health Status:[/green] {health['status']}")
 
     console.print("[bold]2. Fetching Payment Methods...[/bold]")
-    methods = get_with_logging(f"https://api.test.paysafe.com/paymenthub/v1/paymentmethods?currencyCode={currency}", auth_header(public_key))
+    methods = await api.look_up_payment_methods(currency_code=currency, headers=auth_header(public_key), step="paymentmethods", ctx=ctx)
     display_payment_methods(methods.get("paymentMethods", []))
 
-    merchant_ref = generate_merchant_ref()
-    console.print(f"[bold]3. Creating Payment Handle... {merchant_ref}[/bold]")
+    console.print(f"[bold]3. Creating Payment Handle... {ctx.merchant_ref}[/bold]")
+    if customer_store is not None and not interactive_flag:
+        ctx.handle_token = customer_store.next_token(store_key(PAYSAFE_API_BASE, account_id, currency))
+    elif handle_pool is not None and not interactive_flag:
+        ctx.handle_token = handle_pool.take((ctx.account, currency, amount))
+    if ctx.handle_token is not None:
+        payload = payment_handle_payload(ctx.merchant_ref, amount, currency, account_id)
+        source = "Stored Customer" if customer_store is not None else "Pre-minted"
+        console.print(f"[green]Using {source} Payment Handle:[/green] {ctx.handle_token}")
+    else:
+        payload = payment_handle_payload(ctx.merchant_ref, amount, currency, account_id, interactive_flag)
+        payment_handle = await api.create_payment_handle(payload, simulator="INTERNAL", headers=auth_header(private_key),
+                                                         step="paymenthandles", ctx=ctx)
+        ctx.handle_token = payment_handle['paymentHandleToken']
+        console.print(f"[green]Payment Handle Created:[/green] {ctx.handle_token}")
+
+    card_info = f"**** **** **** {payload['card']['cardNum'][-4:]}"
+    console.print(Panel.fit(f"About to charge [bold yellow]{amount}[/bold yellow] {currency} using card [cyan]{card_info}[/cyan]", title="[bold blue]Payment Summary[/bold blue]"))
+
+    console.print("[bold]4. Submitting Payment...[/bold]")
+    # The cancel waiter is woken the moment the payment id is known, so it races the poller.
+    cancel_task = None
+    if cancel_flag and 90 <= amount < 100:
+        cancel_task = asyncio.ensure_future(cancel_payment_if_needed_async(ctx, private_key))
+    try:
+        await submit_payment_and_poll_async(ctx, amount, currency, private_key, refund_flag)
+    except BaseException:
+        if cancel_task is not None:
+            if ctx.payment_id is None:
+                cancel_task.cancel()
+            # The payment failure is what gets raised; a cancel failure is still reported.
+            cancel_result = (await asyncio.gather(cancel_task, return_exceptions=True))[0]
+            if isinstance(cancel_result, Exception):
+                console.print(f"[red]Cancellation also failed:[/red] {cancel_result!r}")
+                run_stats.record_error("cancel", cancel_result)
+        raise
+    if cancel_task is not None:
+        await cancel_task
+    return ctx
+
+def payment_handle_payload(merchant_ref, amount, currency, account_id, interactive_flag=False):
     payload = {
         "merchantRefNum": merchant_ref,
         "transactionType": "PAYMENT",
@@ -301,70 +773,541 @@ def run_test(env, currency, amount, refund_flag, cancel_flag, interactive_flag):
         ]
     }
     if interactive_flag:
-        payload = enrich_payload(payload)
-    else:
-        # fallback for automation (static test values)
-        payload.update({
-            "card": {
-                "cardNum": "4000000000002503",
-                "cardExpiry": {"month": "02", "year": "2026"},
-                "cvv": 111,
-                "holderName": "John Doe"
-            },
-            "profile": {
-                "firstName": "John",
-                "lastName": "Doe",
-                "email": "john.doe@paysafe.com"
-            },
-            "billingDetails": {
-                "nickName": "Home",
-                "street": "5335 Gate Pkwy",
-                "city": "Jacksonville",
-                "zip": "32256",
-                "country": "US",
-                "state": "FL"
-            }
-        })
-
-    headers = auth_header(private_key)
-    headers.update({"Content-Type": "application/json", "Simulator": "INTERNAL"})
-    payment_handle = post_with_logging("https://api.test.paysafe.com/paymenthub/v1/paymenthandles", headers, payload)
-    handle_token = payment_handle['paymentHandleToken']
-    console.print(f"[green]Payment Handle Created:[/green] {handle_token}")
+        return enrich_payload(payload)
+    # fallback for automation (static test values)
+    payload.update({
+        "card": dict(TEST_CARD),
+        "profile": {
+            "firstName": "John",
+            "lastName": "Doe",
+            "email": "john.doe@paysafe.com"
+        },
+        "billingDetails": {
+            "nickName": "Home",
+            "street": "5335 Gate Pkwy",
+            "city": "Jacksonville",
+            "zip": "32256",
+            "country": "US",
+            "state": "FL"
+        }
+    })
+    return payload
 
-    card_info = f"**** **** **** {payload['card']['cardNum'][-4:]}"
-    console.print(Panel.fit(f"About to charge [bold yellow]{amount}[/bold yellow] {currency} using card [cyan]{card_info}[/cyan]", title="[bold blue]Payment Summary[/bold blue]"))
+async def mint_payment_handle_async(env, currency, amount):
+    # The handle pool's producer: same card and account as a flow's step 3, outside any flow.
+    payload = payment_handle_payload(generate_merchant_ref(), amount, currency, env[f"account_id_cards_{currency.lower()}"])
+    return await api.create_payment_handle(payload, simulator="INTERNAL", headers=auth_header(env['private_key']),
+                                           step=HANDLE_POOL_STEP)
 
-    console.print("[bold]4. Submitting Payment...[/bold]")
-    threads = []
-    pay_thread = threading.Thread(
-        target=submit_payment_and_poll,
-        args=(handle_token, merchant_ref, amount, currency, private_key, refund_flag),
-        daemon=True
-    )
-    threads.append(pay_thread)
-    pay_thread.start()
+async def provision_customer_async(env, currency):
+    # A customer with the test card stored on it; returns (customer id, MULTI_USE handle).
+    headers = auth_header(env['private_key'])
+    customer = await api.create_customer({
+        "merchantCustomerId": uuid.uuid4().hex,
+        "locale": "en_US",
+        "firstName": "John",
+        "lastName": "Doe",
+        "email": "john.doe@paysafe.com"
+    }, headers=headers, step="customers")
+    payload = payment_handle_payload(generate_merchant_ref(), 0, currency, None)
+    handle_payload = {key: payload[key] for key in ("merchantRefNum", "paymentType", "currencyCode", "customerIp", "card", "billingDetails")}
+    handle = await api.create_payment_handle_for_customer(customer['id'], handle_payload, simulator="INTERNAL", headers=headers,
+                                                          step="customer_paymenthandles")
+    return customer['id'], handle
 
-    if cancel_flag and 90 <= amount < 100:
-        cancel_thread = threading.Thread(
-            target=cancel_payment_if_needed_threadsafe,
-            args=(private_key,),
-            daemon=True
-        )
-        threads.append(cancel_thread)
-        cancel_thread.start()
+async def provision_customers_async(envs, currencies, count):
+    # Tops every (account, currency) up to `count` stored customers; returns the failures.
+    async def provision(env, currency):
+        customer_id, handle = await provision_customer_async(env, currency)
+        customer_store.add(store_key(PAYSAFE_API_BASE, env[f"account_id_cards_{currency.lower()}"], currency), customer_id, handle['id'],
+                           handle['paymentHandleToken'])
+
+    jobs = [provision(env, currency) for env in envs for currency in currencies
+            for _ in range(customer_store.missing(store_key(PAYSAFE_API_BASE, env[f"account_id_cards_{currency.lower()}"], currency), count))]
+    if not jobs:
+        return 0, []
+    results = await asyncio.gather(*jobs, return_exceptions=True)
+    return len(jobs), [result for result in results if isinstance(result, Exception)]
+
+def provision_customers(envs, currencies, count):
+    console.print(f"[dim]Provisioning up to {count} stored customers per account and currency...[/dim]")
+    console.quiet = True
+    try:
+        requested, failures = run_sync(provision_customers_async(envs, currencies, count))
+    finally:
+        console.quiet = False
+    customer_store.save()
+    if requested:
+        console.print(f"[dim]Stored customers: {requested - len(failures)} created, {len(failures)} failed; "
+                      f"cached in {customer_store.path}[/dim]")
+    for failure in failures[:3]:
+        console.print(f"[red]Customer provisioning failed:[/red] {failure!r}")
+    empty = [key for key in (store_key(PAYSAFE_API_BASE, env[f"account_id_cards_{currency.lower()}"], currency) for env in envs for currency in currencies)
+             if customer_store.missing(key, 1)]
+    if empty:
+        console.print(f"[red]No stored customers for {', '.join(empty)}; cannot pay without tokenizing.[/red]")
+        exit(1)
+
+def classify_failure(exc):
+    if isinstance(exc, PayloadValidationError):
+        return f"invalid {exc.operation_id}"
+    if isinstance(exc, CircuitOpenError):
+        return f"circuit open {exc.name}"
+    if isinstance(exc, requests.exceptions.HTTPError) and exc.response is not None:
+        try:
+            code = exc.response.json().get("error", {}).get("code")
+        except ValueError:
+            code = None
+        return f"declined {code}" if code else f"http {exc.response.status_code}"
+    return type(exc).__name__
+
+async def run_flow_async(env, currency, amount, refund_flag, cancel_flag, ctx):
+    # Runs one unattended flow and returns (outcome label, exception or None).
+    try:
+        await run_test_async(env, currency, amount, refund_flag, cancel_flag, False, ctx)
+        return ("approved" if ctx.status == "COMPLETED" else ctx.status.lower()), None
+    except Exception as exc:
+        return classify_failure(exc), exc
+
+async def run_spread_flow_async(env, currency, amount, refund_flag, cancel_flag, ctx):
+    # Like run_flow_async, but under the account the picker assigns when the env holds several.
+    if account_picker is None or len(account_picker.accounts) < 2:
+        return await run_flow_async(env, currency, amount, refund_flag, cancel_flag, ctx)
+    account = account_picker.acquire()
+    ctx.account = account.name
+    try:
+        return await run_flow_async(account.env, currency, amount, refund_flag, cancel_flag, ctx)
+    finally:
+        account_picker.release(account)
+
+async def run_load_async(env, currency, amount, refund_flag, cancel_flag, count, duration, concurrency,
+                         arrivals=None, max_outstanding=None):
+    async def start_flow(intended_start=None):
+        ctx = FlowContext(intended_start=intended_start)
+        outcome, _ = await run_spread_flow_async(env, currency, amount, refund_flag, cancel_flag, ctx)
+        run_stats.record_flow(outcome, ctx.elapsed(), ctx.timings, ctx.account)
+
+    if handle_pool is None:
+        return await run_flows(start_flow, count, duration, concurrency, arrivals, max_outstanding)
+    producer = asyncio.ensure_future(handle_pool.run())
+    try:
+        return await run_flows(start_flow, count, duration, concurrency, arrivals, max_outstanding)
+    finally:
+        producer.cancel()
+        await asyncio.gather(producer, return_exceptions=True)
+
+def prime_handle_pool(env, currency, amount):
+    # One pool key per account the flows can run under; filled before the clock starts.
+    spread = account_picker is not None and len(account_picker.accounts) > 1
+    for account in (account_picker.accounts if spread else [None]):
+        handle_pool.register((account.name if account else None, currency, amount),
+                             functools.partial(mint_payment_handle_async, account.env if account else env, currency, amount))
+    run_sync(handle_pool.fill())
+
+async def run_flows(start_flow, count, duration, concurrency, arrivals=None, max_outstanding=None):
+    if arrivals is not None:
+        return await run_open_loop(start_flow, arrivals, count, duration, max_outstanding)
+    return await run_closed_loop(start_flow, count, duration, concurrency)
+
+def run_load(env, currency, amount, refund_flag, cancel_flag, count, duration, concurrency, stats_out=None,
+             arrivals=None, arrival_label=None, max_outstanding=None):
+    if amount is None:
+        console.print("[red]Amount must be provided for load runs.[/red]")
+        exit(1)
+    shape = f"{arrival_label}, at most {max_outstanding} outstanding" if arrivals is not None else f"concurrency {concurrency}"
+    if account_picker is not None and len(account_picker.accounts) > 1:
+        shape += f", {len(account_picker.accounts)} accounts ({account_picker.strategy})"
+    global run_stats
+    if handle_pool is not None:
+        with status_display(f"Pre-minting {handle_pool.size} payment handles per account..."):
+            prime_handle_pool(env, currency, amount)
+        # The priming requests are set-up, not part of the measured run.
+        run_stats = RunStats()
+    console.rule(f"[bold green]Load run: {count or 'unbounded'} flows, {f'{duration:g} s' if duration else 'no time'} limit, {shape}[/bold green]")
+    console.quiet = True
+    started = time.perf_counter()
+    try:
+        result = run_sync(run_load_async(env, currency, amount, refund_flag, cancel_flag, count, duration, concurrency,
+                                         arrivals, max_outstanding))
+    finally:
+        console.quiet = False
+    elapsed = time.perf_counter() - started
+    if arrivals is not None:
+        display_open_loop_summary(result)
+    display_load_summary(run_stats, elapsed, expectations.expected_outcome(amount))
+    if stats_out:
+        with open(stats_out, "w") as f:
+            json.dump(run_stats.to_dict(), f)
+        console.print(f"[dim]Run stats written to {stats_out} (merge workers with: python metrics.py a.json b.json > merged.json)[/dim]")
+
+async def run_matrix_async(env, scenarios):
+    async def run_scenario(scenario):
+        ctx = FlowContext()
+        outcome, exc = await run_spread_flow_async(env, scenario.currency, scenario.amount, scenario.option == "refund",
+                                                   scenario.option == "cancel", ctx)
+        response = getattr(exc, "response", None)
+        run_stats.record_flow(outcome, ctx.elapsed(), ctx.timings, ctx.account)
+        return ScenarioResult(scenario, outcome, getattr(response, "status_code", None), ctx.elapsed(),
+                              repr(exc) if exc is not None else "")
+
+    return await asyncio.gather(*(run_scenario(scenario) for scenario in scenarios))
+
+def run_matrix(env, scenarios, junit_out=None, json_out=None):
+    # Every scenario runs at once, so the matrix takes about as long as its slowest cell.
+    console.rule(f"[bold green]Scenario matrix: {len(scenarios)} scenarios from {expectations.path}[/bold green]")
+    console.quiet = True
+    started = time.perf_counter()
+    try:
+        results = run_sync(run_matrix_async(env, scenarios))
+    finally:
+        console.quiet = False
+    display_matrix_results(results, time.perf_counter() - started)
+    if junit_out:
+        write_junit(results, junit_out)
+    if json_out:
+        write_json(results, json_out)
+    return results
+
+def display_matrix_results(results, elapsed):
+    table = Table(title="Scenario Matrix")
+    table.add_column("Amount", justify="right")
+    table.add_column("Currency")
+    table.add_column("Option")
+    table.add_column("Expected")
+    table.add_column("Actual")
+    table.add_column("Time (s)", justify="right")
+    table.add_column("Result", justify="center")
+    for result in results:
+        scenario = result.scenario
+        expected = scenario.expected_outcome + (f" / {scenario.expected_status}" if scenario.expected_status else "")
+        actual = result.outcome + (f" / {result.http_status}" if result.http_status else "")
+        table.add_row(str(scenario.amount), scenario.currency, scenario.option, expected, actual, f"{result.elapsed:.2f}",
+                      "[green]pass[/green]" if result.passed else "[red]FAIL[/red]")
+    console.print(table)
+    failed = sum(not result.passed for result in results)
+    console.print(Panel.fit(f"[green]{len(results) - failed} passed[/green], "
+                            f"{f'[red]{failed} failed[/red]' if failed else '0 failed'} in {elapsed:.2f}s",
+                            title="[blue]Matrix Result[/blue]"))
+
+def display_open_loop_summary(arrivals):
+    lag = arrivals.lag.summary()
+    dropped = f"[red]{arrivals.dropped}[/red]" if arrivals.dropped else "0"
+    rate = arrivals.scheduled / arrivals.window if arrivals.window else 0.0
+    console.print(Panel.fit(f"Arrivals due: [bold]{arrivals.scheduled}[/bold] in {arrivals.window:.2f}s ([cyan]{rate:.1f}/s[/cyan])\n"
+                            f"Started: [bold]{arrivals.started}[/bold]; dropped at the outstanding limit: {dropped}\n"
+                            f"Backlog (flows in flight at each arrival): mean {arrivals.backlog.mean:.1f}, peak {arrivals.peak_backlog}\n"
+                            f"Start lag behind schedule: p50 {lag['p50'] * 1000:.1f} ms, p99 {lag['p99'] * 1000:.1f} ms, "
+                            f"max {lag['max'] * 1000:.1f} ms", title="[blue]Open-loop Arrivals[/blue]"))
+
+def display_load_summary(stats, elapsed, expected_outcome=None):
+    console.print(Panel.fit(f"Flows: [bold]{stats.flows}[/bold] in {elapsed:.2f}s "
+                            f"([cyan]{stats.flows / elapsed:.1f} flows/s[/cyan])\n"
+                            f"Requests: [bold]{stats.requests}[/bold] "
+                            f"([cyan]{stats.requests / elapsed:.1f} req/s[/cyan])"
+                            + (f"\nBackground (not counted above): {sum(stats.background_requests.values())} requests"
+                               if stats.background_requests else ""), title="[blue]Throughput[/blue]"))
+
+    outcomes = Table(title="Outcomes")
+    outcomes.add_column("Outcome")
+    outcomes.add_column("Flows", justify="right")
+    outcomes.add_column("Expected", justify="center")
+    for outcome, flows in stats.outcomes.most_common():
+        outcomes.add_row(outcome, str(flows), "" if expected_outcome is None else ("yes" if outcome == expected_outcome else "[red]no[/red]"))
+    console.print(outcomes)
+
+    if stats.account_outcomes:
+        display_account_summary(stats, elapsed)
+
+    if stats.errors:
+        errors = Table(title="Secondary Errors")
+        errors.add_column("Step")
+        errors.add_column("Error")
+        errors.add_column("Count", justify="right")
+        for (step, error), hits in stats.errors.most_common():
+            errors.add_row(step, error, str(hits))
+        console.print(errors)
+
+    if stats.retries or stats.retries_denied:
+        retries = Table(title="Retries")
+        retries.add_column("Step")
+        retries.add_column("Reason")
+        retries.add_column("Retried", justify="right")
+        retries.add_column("Denied by budget", justify="right")
+        for step, reason in sorted(set(stats.retries) | set(stats.retries_denied)):
+            denied = stats.retries_denied[(step, reason)]
+            retries.add_row(step, reason, str(stats.retries[(step, reason)]), f"[red]{denied}[/red]" if denied else "0")
+        console.print(retries)
 
-    for t in threads:
-        t.join()
+    if stats.polls:
+        polls = Table(title="Status Polls per Flow")
+        polls.add_column("Step")
+        for column in ("Flows", "Mean", "Max", "Total", "Response", "Webhook", "Polled"):
+            polls.add_column(column, justify="right")
+        for step, counts in stats.polls.items():
+            sources = stats.status_sources[step]
+            polls.add_row(step, str(len(counts)), f"{sum(counts) / len(counts):.2f}", str(max(counts)), str(sum(counts)),
+                          str(sources["response"]), str(sources["webhook"]), str(sources["poll"]))
+        console.print(polls)
+
+    console.print(latency_table("Per-step Latency (ms)", "Step", stats.step_summary()))
+    if stats.rate_limit_wait:
+        console.print(latency_table("Rate-limit Wait per Step, Not Included Above (ms)", "Step", stats.rate_limit_wait_summary()))
+    console.print(correction_table(stats.step_summary(), stats.corrected_step_summary()))
+    console.print(latency_table("Flow Latency by Outcome (ms)", "Outcome", stats.outcome_summary()))
+    if len(stats.outcomes) > 1:
+        for outcome, _ in stats.outcomes.most_common():
+            console.print(latency_table(f"Per-step Latency for {outcome} (ms)", "Step", stats.outcome_step_summary(outcome)))
+
+def display_account_summary(stats, elapsed):
+    table = Table(title="Per-account Results")
+    table.add_column("Account")
+    for column in ("Flows", "Requests", "Req/s", "Flow p50 (ms)", "Flow p99 (ms)"):
+        table.add_column(column, justify="right")
+    table.add_column("Outcomes")
+    latency = stats.account_summary()
+    for account in sorted(stats.account_outcomes):
+        outcomes = stats.account_outcomes[account]
+        flows, requests = sum(outcomes.values()), stats.account_requests[account]
+        table.add_row(account, str(flows), str(requests), f"{requests / elapsed:.1f}",
+                      f"{latency[account]['p50'] * 1000:.1f}", f"{latency[account]['p99'] * 1000:.1f}",
+                      ", ".join(f"{hits} {outcome}" for outcome, hits in outcomes.most_common()))
+    console.print(table)
+
+def run_replay(env, paths, speed, concurrency):
+    # Authorization is redacted in recordings; the monitor and payment-method lookups use
+    # the public key and every other call the private one, as in run_test_async.
+    public_ops = {VERIFY_THAT_THE_SERVICE_IS_ACCESSIBLE.operation_id, LOOK_UP_PAYMENT_METHODS.operation_id}
+
+    def headers_for(record):
+        return auth_header(env['public_key'] if record.get("operation_id") in public_ops else env['private_key'])
+
+    async def send(method, url, headers, body, record):
+        return await send_request(method, url, headers, body, record.get("step") or "replay", None, record.get("operation_id"))
+
+    replayer = Replayer(send, PAYSAFE_API_BASE, speed or None, concurrency, headers_for, card=TEST_CARD)
+    console.rule(f"[bold green]Replay: {', '.join(paths)} at {f'{speed:g}x' if speed else 'full'} speed, "
+                 f"{concurrency} in flight[/bold green]")
+    started = time.perf_counter()
+    run_sync(replayer.run(iter_records(paths)))
+    display_replay_summary(replayer, time.perf_counter() - started)
+    return replayer
+
+def display_replay_summary(replayer, elapsed):
+    lag = replayer.lag.summary() if replayer.lag.count else None
+    console.print(Panel.fit(f"Requests: [bold]{replayer.sent}[/bold] in {elapsed:.2f}s "
+                            f"([cyan]{replayer.sent / elapsed:.1f} req/s[/cyan])\n"
+                            f"Status differs from recording: [bold]{replayer.mismatched}[/bold]; "
+                            f"errors: [bold]{sum(replayer.errors.values())}[/bold]; unreadable lines: {replayer.skipped}"
+                            + (f"\nSchedule lag: p99 {lag['p99'] * 1000:.1f} ms, max {lag['max'] * 1000:.1f} ms" if lag else ""),
+                            title="[blue]Replay[/blue]"))
+    statuses = Table(title="Status Codes")
+    statuses.add_column("Operation")
+    for column in ("Recorded", "Replayed", "Requests"):
+        statuses.add_column(column, justify="right")
+    for (operation, recorded, replayed), hits in sorted(replayer.statuses.items(), key=lambda item: (str(item[0][0]), -item[1])):
+        style = "" if recorded == replayed else "[red]"
+        statuses.add_row(str(operation), str(recorded), f"{style}{replayed}", str(hits))
+    for (operation, error), hits in replayer.errors.most_common():
+        statuses.add_row(str(operation), "", f"[red]{error}", str(hits))
+    console.print(statuses)
+    console.print(latency_table("Per-step Latency (ms)", "Step", run_stats.step_summary()))
+
+def correction_table(raw, corrected):
+    # Raw latency starts at the actual send; corrected latency starts when the request was
+    # due. The gap between the two is stall introduced by the client itself.
+    table = Table(title="Per-step Latency, Raw -> Corrected for Coordinated Omission (ms)")
+    table.add_column("Step")
+    for column in ("p50", "p99", "p99.9", "Max"):
+        table.add_column(column, justify="right")
+    for step, row in raw.items():
+        fixed = corrected.get(step, row)
+        cells = []
+        for key in ("p50", "p99", "p99.9", "max"):
+            # Highlight steps where the client added more than 10% on top of the raw figure.
+            style = "yellow" if fixed[key] > row[key] * 1.1 else "default"
+            cells.append(f"{row[key] * 1000:.1f} -> [{style}]{fixed[key] * 1000:.1f}[/{style}]")
+        table.add_row(step, *cells)
+    return table
+
+def latency_table(title, label, summary):
+    table = Table(title=title)
+    table.add_column(label)
+    for column in ("Count", "Mean", "p50", "p90", "p99", "p99.9", "Max"):
+        table.add_column(column, justify="right")
+    for name, row in summary.items():
+        table.add_row(name, str(row["count"]), *(f"{row[k] * 1000:.1f}" for k in ("mean", "p50", "p90", "p99", "p99.9", "max")))
+    return table
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Paysafe Card Payment Test Tool")
     parser.add_argument("--env", help="Path to Postman env JSON", required=True)
-    parser.add_argument("--currency", choices=["USD", "GBP"], required=True)
+    parser.add_argument("--currency", choices=["USD", "GBP"], help="Required except with --replay and --matrix (which defaults to both)")
     parser.add_argument("--amount", type=int, help="Amount in minor units (optional if interactive)", required=False)
     parser.add_argument("--refund", action="store_true", help="Trigger refund if payment completes")
     parser.add_argument("--cancel", action="store_true", help="Attempt cancellation if delayed payment")
     parser.add_argument("--interactive", action="store_true", help="Enable interactive form input for card, address, profile, and amount")
+    parser.add_argument("--engine", choices=["threads", "asyncio"], default="threads", help="HTTP engine: blocking requests on worker threads, or native asyncio")
+    parser.add_argument("--count", type=int, help="Load mode: run this many complete flows")
+    parser.add_argument("--duration", type=float, help="Load mode: keep starting flows for this many seconds")
+    parser.add_argument("--concurrency", type=int, default=1, help="Load mode: number of flows in flight at once")
+    parser.add_argument("--arrival-rate", type=float, help="Open-loop load: start this many flows per second regardless of completions")
+    parser.add_argument("--arrival-process", choices=["constant", "poisson"], default="constant", help="Open-loop load: evenly spaced or Poisson arrivals")
+    parser.add_argument("--rate-schedule", help="Open-loop load: SECONDS:RATE steps, e.g. 60:10,120:50,60:10 (instead of --arrival-rate)")
+    parser.add_argument("--max-outstanding", type=int, default=1000, help="Open-loop load: drop arrivals while this many flows are in flight")
+    parser.add_argument("--poll-initial", type=float, default=0.05, help="Seconds before the second status poll; doubles after each poll")
+    parser.add_argument("--poll-max-interval", type=float, default=2.0, help="Upper bound on the backoff between status polls")
+    parser.add_argument("--poll-deadline", type=float, default=30.0, help="Give up polling a payment or refund after this many seconds")
+    parser.add_argument("--webhook-port", type=int, help="Listen for Paysafe webhook notifications on this port instead of polling first")
+    parser.add_argument("--webhook-host", default="127.0.0.1", help="Interface for the webhook listener (a secret is required off loopback)")
+    parser.add_argument("--webhook-secret", help="HMAC key used to verify the Signature header of incoming webhooks")
+    parser.add_argument("--webhook-timeout", type=float, default=10.0, help="Seconds to wait for a webhook before falling back to polling")
+    parser.add_argument("--pool-size", type=int, default=10, help="Number of per-host connection pools to keep")
+    parser.add_argument("--pool-max-per-host", type=int, default=None, help="Maximum keep-alive connections per host (default: --concurrency, at least 10 for threads and 100 for asyncio)")
+    parser.add_argument("--pool-idle-timeout", type=float, default=30.0, help="Seconds before an idle host pool is evicted (0 disables)")
+    parser.add_argument("--request-timeout", type=float, default=DEFAULT_TIMEOUT, help="Seconds before a request that has not been answered fails as a timeout (0 disables)")
+    parser.add_argument("--pool-stats", action="store_true", help="Print connection pool hit/miss stats at the end of the run")
+    parser.add_argument("--no-validate-requests", action="store_true", help="Skip client-side validation of request bodies against the OpenAPI spec")
+    parser.add_argument("--validate-responses", type=float, default=0.0, metavar="RATE", help="Validate this fraction (0-1) of responses against the spec and summarise violations")
+    parser.add_argument("--stats-out", help="Load mode: write mergeable latency histograms and counters to this JSON file")
+    parser.add_argument("--record", metavar="PATH", help="Record every request and response as JSON lines to PATH (e.g. requests.jsonl)")
+    parser.add_argument("--record-max-mb", type=float, default=100.0, help="Rotate the recording after this many MB")
+    parser.add_argument("--record-backups", type=int, default=5, help="Rotated recordings to keep (PATH.1 ... PATH.N)")
+    parser.add_argument("--retries", type=int, default=None, help="Retries after a transient failure (5xx, 429, code 1007, network error); default 2, 0 for --matrix")
+    parser.add_argument("--retry-rule", action="append", default=[], metavar="OPERATION=ATTEMPTS", help="Per-operation attempt limit, e.g. process-payment=1; repeatable")
+    parser.add_argument("--retry-budget", type=float, default=0.1, help="Retries allowed as a fraction of requests (plus a burst of 10)")
+    parser.add_argument("--circuit-breaker", action="store_true", help="Fail fast on endpoints whose recent calls mostly failed (5xx, 429, network errors)")
+    parser.add_argument("--breaker-threshold", type=float, default=0.5, help="Circuit breaker: failure share of the window that opens it")
+    parser.add_argument("--breaker-window", type=int, default=20, help="Circuit breaker: number of recent calls considered")
+    parser.add_argument("--breaker-min-calls", type=int, default=10, help="Circuit breaker: calls needed in the window before it can open")
+    parser.add_argument("--breaker-open-seconds", type=float, default=5.0, help="Circuit breaker: seconds to fail fast before a half-open trial call")
+    parser.add_argument("--adaptive-concurrency", action="store_true", help="Adapt requests in flight (AIMD) to latency and 429/5xx; --concurrency or --max-outstanding is the ceiling")
+    parser.add_argument("--adaptive-initial", type=int, default=10, help="Adaptive concurrency: starting limit")
+    parser.add_argument("--adaptive-tolerance", type=float, default=2.0, help="Adaptive concurrency: back off when a request takes this many times its step's baseline latency")
+    parser.add_argument("--rate-limit", type=float, default=0.0, metavar="RPS", help="Send at most RPS requests per second with each API key (0 = unlimited)")
+    parser.add_argument("--rate-burst", type=float, help="Rate limit: requests an idle key may send at once (default: one second's worth)")
+    parser.add_argument("--account-strategy", choices=STRATEGIES, default="round-robin", help="How flows are spread over the credential sets in --env (public_key_2, ...)")
+    parser.add_argument("--handle-pool", type=int, default=0, metavar="SIZE", help="Load mode: keep SIZE payment handles pre-minted per account so flows skip step 3 (0 = off)")
+    parser.add_argument("--handle-ttl-margin", type=float, default=60.0, help="Handle pool: discard handles this many seconds before they expire")
+    parser.add_argument("--stored-customers", type=int, default=0, metavar="COUNT", help="Pay with the stored cards of COUNT customers per account and currency instead of tokenizing the card in every flow")
+    parser.add_argument("--customer-cache", default=".paysafe_customers.json", help="Stored customers: JSON file where provisioned customers and their handles are kept between runs")
+    parser.add_argument("--base-url", default=PAYSAFE_API_BASE, help="Payments API base URL, e.g. http://127.0.0.1:8080/paymenthub for simulator.py")
+    parser.add_argument("--replay", nargs="+", metavar="PATH", help="Replay recorded JSON-lines traffic (list rotated files oldest first) instead of running flows")
+    parser.add_argument("--replay-speed", type=float, default=1.0, help="Replay: multiple of the recorded pace (1 = original timing, 0 = as fast as possible)")
+    parser.add_argument("--replay-concurrency", type=int, default=DEFAULT_MAX_IN_FLIGHT, help="Replay: maximum number of requests in flight at once")
+    parser.add_argument("--matrix", action="store_true", help="Run every expect_response.json amount x currency x option at once and check the outcomes")
+    parser.add_argument("--matrix-options", default=",".join(MATRIX_OPTIONS), help="Matrix: comma-separated options to cover (plain, refund, cancel)")
+    parser.add_argument("--junit-out", help="Matrix: write JUnit XML results to this file")
+    parser.add_argument("--json-out", help="Matrix: write JSON results to this file")
     args = parser.parse_args()
+    if not args.currency and not (args.replay or args.matrix):
+        parser.error("--currency is required unless --replay or --matrix is given")
+    if args.handle_pool and (args.matrix or args.replay):
+        # Only load runs draw from the pool; the other modes would mint handles nobody takes.
+        parser.error("--handle-pool applies to load runs and cannot be combined with --matrix or --replay")
+    arrivals = arrival_label = None
+    if args.arrival_rate or args.rate_schedule:
+        try:
+            schedule = parse_schedule(args.rate_schedule) if args.rate_schedule else None
+        except ValueError as exc:
+            parser.error(str(exc))
+        if schedule is None and not (args.count or args.duration):
+            parser.error("--arrival-rate needs --count or --duration")
+        arrivals = arrival_offsets(args.arrival_rate, schedule, args.arrival_process == "poisson")
+        arrival_label = f"{args.arrival_process} arrivals at " + (args.rate_schedule if schedule else f"{args.arrival_rate:g}/s")
+    configure_api(args.base_url)
+    configure_breakers(args.circuit_breaker, args.breaker_threshold, args.breaker_window, args.breaker_min_calls, args.breaker_open_seconds)
+    # The matrix checks first-response outcomes, and retrying 1007 declines would only multiply their delays.
+    retries = args.retries if args.retries is not None else (0 if args.matrix else 2)
+    try:
+        configure_retries(retries + 1, args.retry_rule, args.retry_budget)
+    except ValueError as exc:
+        parser.error(str(exc))
+    configure_recording(args.record, int(args.record_max_mb * 1024 * 1024), args.record_backups)
     env = load_env(args.env)
-    run_test(env, args.currency, args.amount, args.refund, args.cancel, args.interactive)
+    try:
+        configure_accounts(env, args.account_strategy)
+    except ValueError as exc:
+        parser.error(f"{args.env}: {exc}")
+    for account in account_picker.accounts:
+        for currency in ([args.currency] if args.currency else ["USD", "GBP"] if args.matrix else []):
+            if not account.account_id(currency):
+                parser.error(f"{args.env}: {account.name} has no account_id_cards_{currency.lower()}")
+    load_expected_responses()
+    configure_validation(not args.no_validate_requests, args.validate_responses)
+    scenarios = None
+    if args.matrix:
+        options = [option.strip() for option in args.matrix_options.split(",") if option.strip()]
+        unknown = set(options) - set(MATRIX_OPTIONS)
+        if unknown:
+            parser.error(f"Unknown --matrix-options: {', '.join(sorted(unknown))}")
+        scenarios = build_scenarios(expectations, [args.currency] if args.currency else ["USD", "GBP"], options)
+        slowest = max((scenario.expectation.delay for scenario in scenarios), default=0.0)
+        if args.poll_deadline <= slowest:
+            # Otherwise the longest delayed approvals would be reported as timeouts.
+            args.poll_deadline = slowest + 5
+            console.print(f"[dim]Poll deadline raised to {args.poll_deadline:g}s for the {slowest:g}s delayed scenarios[/dim]")
+    else:
+        expected = expectations.for_amount(args.amount)
+        slowest = expected.delay if expected is not None else 0.0
+    if args.request_timeout and args.request_timeout <= slowest:
+        # Declines such as amount 96 answer only after their delay; that is the outcome under test, not a stall.
+        args.request_timeout = slowest + 5
+        console.print(f"[dim]Request timeout raised to {args.request_timeout:g}s for the {slowest:g}s delayed responses[/dim]")
+    # Keep at least one pooled connection per concurrent flow so load runs never churn connections.
+    in_flight = (args.replay_concurrency if args.replay else
+                 len(scenarios) if scenarios is not None else
+                 args.max_outstanding if arrivals is not None else args.concurrency)
+    max_per_host = args.pool_max_per_host or max(100 if args.engine == "asyncio" else 10, in_flight)
+    configure_pollers(args.poll_initial, args.poll_max_interval, args.poll_deadline)
+    configure_rate_limit(args.rate_limit, args.rate_burst)
+    if args.stored_customers and args.handle_pool:
+        parser.error("--stored-customers and --handle-pool are alternatives; pick one")
+    configure_handle_pool(args.handle_pool, args.handle_ttl_margin)
+    configure_concurrency_limit(args.adaptive_concurrency, args.adaptive_initial, max(in_flight, args.adaptive_initial), args.adaptive_tolerance)
+    if args.webhook_port:
+        try:
+            configure_webhooks(args.webhook_host, args.webhook_port, args.webhook_timeout, args.webhook_secret).start()
+        except (OSError, ValueError) as exc:
+            console.print(f"[red]Cannot start webhook listener:[/red] {exc}")
+            exit(1)
+    configure_transport(args.engine, args.pool_size, max_per_host, args.pool_idle_timeout, max_per_host, args.request_timeout)
+    if args.stored_customers and not args.replay:
+        configure_customers(args.customer_cache)
+        provision_customers([account.env for account in account_picker.accounts],
+                            [args.currency] if args.currency else ["USD", "GBP"], args.stored_customers)
+        # Provisioning is set-up, not part of the measured run.
+        run_stats = RunStats()
+    exit_code = 0
+    try:
+        if args.replay:
+            run_replay(env, args.replay, args.replay_speed, args.replay_concurrency)
+        elif args.matrix:
+            results = run_matrix(env, scenarios, args.junit_out, args.json_out)
+            exit_code = 1 if any(not result.passed for result in results) else 0
+        elif args.count or args.duration or arrivals is not None:
+            run_load(env, args.currency, args.amount, args.refund, args.cancel, args.count, args.duration, args.concurrency,
+                     args.stats_out, arrivals, arrival_label, args.max_outstanding)
+        else:
+            run_test(env, args.currency, args.amount, args.refund, args.cancel, args.interactive)
+    finally:
+        if args.pool_stats:
+            display_pool_stats(transport.stats())
+        if circuit_breakers is not None:
+            display_circuit_breakers(circuit_breakers)
+        if handle_pool is not None and handle_pool.counts:
+            display_handle_pool(handle_pool)
+        if rate_limiters is not None:
+            display_rate_limits(rate_limiters)
+        if concurrency_limiter is not None:
+            display_concurrency_limit(concurrency_limiter)
+        if response_validator is not None:
+            display_response_validation(response_validator)
+        if webhook_receiver is not None:
+            webhook_receiver.stop()
+        if recorder is not None:
+            recorder.close()
+            console.print(f"[dim]Recorded {recorder.recorded} requests to {args.record} "
+                          f"({recorder.rotations} rotations, {recorder.dropped} dropped)[/dim]")
+        transport.close()
+    if exit_code:
+        exit(exit_code)
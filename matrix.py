@@ -0,0 +1,106 @@
+import json
+import xml.etree.ElementTree as ET
+
+MATRIX_OPTIONS = ("plain", "refund", "cancel")
+
+
+class Scenario:
+    # One amount x currency x option cell. `refund` applies to approving amounts and
+    # `cancel` to delayed ones; a cancel that lands before the delayed approval leaves
+    # the payment CANCELLED.
+
+    def __init__(self, expectation, currency, option="plain"):
+        self.expectation = expectation
+        self.amount = expectation.amount
+        self.currency = currency
+        self.option = option
+
+    @property
+    def name(self):
+        return f"{self.amount} {self.currency} {self.option}"
+
+    @property
+    def expected_outcome(self):
+        if self.option == "cancel" and self.expectation.outcome == "approved":
+            return "cancelled"
+        return self.expectation.outcome
+
+    @property
+    def expected_status(self):
+        # Only declines pin the HTTP status; approvals answer 200 or 201 depending on the call.
+        return self.expectation.http_status if self.expectation.http_status >= 400 else None
+
+
+def applies(expectation, option):
+    if option == "refund":
+        return expectation.outcome == "approved"
+    if option == "cancel":
+        return expectation.delay > 0
+    return True
+
+
+def build_scenarios(expectations, currencies, options=MATRIX_OPTIONS):
+    return [Scenario(entry, currency, option)
+            for amount, entry in sorted(expectations.by_amount.items())
+            for currency in currencies
+            for option in options if applies(entry, option)]
+
+
+class ScenarioResult:
+
+    def __init__(self, scenario, outcome, http_status=None, elapsed=0.0, detail=""):
+        self.scenario = scenario
+        self.outcome = outcome
+        self.http_status = http_status
+        self.elapsed = elapsed
+        self.detail = detail
+
+    @property
+    def passed(self):
+        expected_status = self.scenario.expected_status
+        return (self.outcome == self.scenario.expected_outcome
+                and (expected_status is None or self.http_status == expected_status))
+
+    @property
+    def failure(self):
+        if self.passed:
+            return None
+        expected = self.scenario.expected_outcome
+        if self.scenario.expected_status is not None:
+            expected += f" (HTTP {self.scenario.expected_status})"
+        actual = self.outcome + (f" (HTTP {self.http_status})" if self.http_status is not None else "")
+        return f"expected {expected}, got {actual}"
+
+    def to_dict(self):
+        return {
+            "name": self.scenario.name,
+            "amount": self.scenario.amount,
+            "currency": self.scenario.currency,
+            "option": self.scenario.option,
+            "expected_outcome": self.scenario.expected_outcome,
+            "expected_status": self.scenario.expected_status,
+            "outcome": self.outcome,
+            "http_status": self.http_status,
+            "elapsed": round(self.elapsed, 3),
+            "passed": self.passed,
+            "detail": self.detail,
+        }
+
+
+def write_json(results, path):
+    with open(path, "w") as f:
+        json.dump({"passed": sum(r.passed for r in results), "failed": sum(not r.passed for r in results),
+                   "scenarios": [r.to_dict() for r in results]}, f, indent=2)
+
+
+def write_junit(results, path, suite="expect_response matrix"):
+    failures = [r for r in results if not r.passed]
+    root = ET.Element("testsuite", name=suite, tests=str(len(results)), failures=str(len(failures)), errors="0",
+                      time=f"{max((r.elapsed for r in results), default=0.0):.3f}")
+    for result in results:
+        case = ET.SubElement(root, "testcase", classname=f"matrix.{result.scenario.currency}.{result.scenario.option}",
+                             name=result.scenario.name, time=f"{result.elapsed:.3f}")
+        if not result.passed:
+            failure = ET.SubElement(case, "failure", message=result.failure)
+            failure.text = result.detail or result.failure
+    ET.ElementTree(root).write(path, encoding="utf-8", xml_declaration=True)
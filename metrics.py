@@ -0,0 +1,274 @@
+import json
+import math
+import sys
+from collections import Counter, defaultdict
+
+SUMMARY_PERCENTILES = (50, 90, 99, 99.9)
+
+
+class Histogram:
+    # Log-bucketed latency histogram in the spirit of HdrHistogram: bucket i covers
+    # (lowest * ratio**(i-1), lowest * ratio**i], so every recorded value is reported
+    # within 10**-significant_digits relative error in O(1) memory per bucket.
+    # Histograms with the same parameters merge by adding bucket counts.
+
+    def __init__(self, lowest=1e-6, significant_digits=2):
+        self.lowest = lowest
+        self.significant_digits = significant_digits
+        self._log_ratio = math.log1p(10.0 ** -significant_digits)
+        self.buckets = Counter()
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def bucket_of(self, value):
+        if value <= self.lowest:
+            return 0
+        return math.ceil(math.log(value / self.lowest) / self._log_ratio)
+
+    def value_of(self, bucket):
+        return self.lowest * math.exp(bucket * self._log_ratio)
+
+    def record(self, value, times=1):
+        self.buckets[self.bucket_of(value)] += times
+        self.count += times
+        self.total += value * times
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other):
+        if (other.lowest, other.significant_digits) != (self.lowest, self.significant_digits):
+            raise ValueError("Cannot merge histograms with different bucket layouts")
+        self.buckets.update(other.buckets)
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def percentile(self, q):
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(q / 100.0 * self.count))
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(self.max, max(self.min, self.value_of(bucket)))
+        return self.max
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def summary(self):
+        row = {"count": self.count, "mean": self.mean, "max": self.max}
+        for q in SUMMARY_PERCENTILES:
+            row[f"p{q:g}"] = self.percentile(q)
+        return row
+
+    def to_dict(self):
+        return {"lowest": self.lowest, "significant_digits": self.significant_digits, "count": self.count,
+                "total": self.total, "min": self.min if self.count else None, "max": self.max,
+                "buckets": {str(bucket): hits for bucket, hits in self.buckets.items()}}
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls(data["lowest"], data["significant_digits"])
+        histogram.buckets = Counter({int(bucket): hits for bucket, hits in data["buckets"].items()})
+        histogram.count = data["count"]
+        histogram.total = data["total"]
+        histogram.min = math.inf if data["min"] is None else data["min"]
+        histogram.max = data["max"]
+        return histogram
+
+
+def corrected_latency(started, finished, ready_at=None):
+    # Latency as seen by a request that was due at `ready_at` (perf_counter seconds) but
+    # only sent at `started`: the client stall before sending is added to the raw time.
+    # Without a due time, or when the request went out on time, it equals the raw time.
+    stall = max(0.0, started - ready_at) if ready_at is not None else 0.0
+    return finished - started + stall
+
+
+class RunStats:
+    # Aggregate counters and per-step latency histograms (seconds) for one process;
+    # `merge` folds in the stats of another worker. Step latency is kept twice: raw,
+    # from the moment the request was sent, and corrected for coordinated omission,
+    # from the moment it should have been sent had the client not stalled. Time a request
+    # spent queued in the client's rate limiter is kept apart, in `rate_limit_wait`.
+    # Runs spread over several merchant accounts also count requests, outcomes and flow
+    # latency per account. Background requests (handle pre-minting) keep their step
+    # latency but are counted in `background_requests`, not in `requests`.
+
+    def __init__(self):
+        self.requests = 0
+        self.background_requests = Counter()
+        self.flows = 0
+        self.outcomes = Counter()
+        self.step_latency = defaultdict(Histogram)
+        self.corrected_step_latency = defaultdict(Histogram)
+        self.rate_limit_wait = defaultdict(Histogram)
+        self.flow_latency = defaultdict(Histogram)
+        self.account_requests = Counter()
+        self.account_outcomes = defaultdict(Counter)
+        self.account_flow_latency = defaultdict(Histogram)
+        self.outcome_step_latency = defaultdict(lambda: defaultdict(Histogram))
+        self.polls = defaultdict(list)
+        self.status_sources = defaultdict(Counter)
+        self.errors = Counter()
+        self.retries = Counter()
+        self.retries_denied = Counter()
+
+    def record_request(self, step, seconds, corrected=None, account=None, background=False):
+        if background:
+            self.background_requests[step] += 1
+        else:
+            self.requests += 1
+        if account is not None and not background:
+            self.account_requests[account] += 1
+        self.step_latency[step].record(seconds)
+        self.corrected_step_latency[step].record(seconds if corrected is None else corrected)
+
+    def record_rate_limit_wait(self, step, seconds):
+        self.rate_limit_wait[step].record(seconds)
+
+    def record_flow(self, outcome, seconds, timings=None, account=None):
+        self.flows += 1
+        self.outcomes[outcome] += 1
+        self.flow_latency[outcome].record(seconds)
+        if account is not None:
+            self.account_outcomes[account][outcome] += 1
+            self.account_flow_latency[account].record(seconds)
+        for step, samples in (timings or {}).items():
+            for sample in samples:
+                self.outcome_step_latency[outcome][step].record(sample)
+
+    def record_retry(self, step, reason, allowed=True):
+        (self.retries if allowed else self.retries_denied)[(step, reason)] += 1
+
+    def record_error(self, step, exc):
+        self.errors[(step, type(exc).__name__)] += 1
+
+    def record_polls(self, step, polls, source="poll"):
+        self.polls[step].append(polls)
+        self.status_sources[step][source] += 1
+
+    def merge(self, other):
+        self.requests += other.requests
+        self.background_requests.update(other.background_requests)
+        self.flows += other.flows
+        self.outcomes.update(other.outcomes)
+        for step, histogram in other.step_latency.items():
+            self.step_latency[step].merge(histogram)
+        for step, histogram in other.corrected_step_latency.items():
+            self.corrected_step_latency[step].merge(histogram)
+        for step, histogram in other.rate_limit_wait.items():
+            self.rate_limit_wait[step].merge(histogram)
+        for outcome, histogram in other.flow_latency.items():
+            self.flow_latency[outcome].merge(histogram)
+        self.account_requests.update(other.account_requests)
+        for account, outcomes in other.account_outcomes.items():
+            self.account_outcomes[account].update(outcomes)
+        for account, histogram in other.account_flow_latency.items():
+            self.account_flow_latency[account].merge(histogram)
+        for outcome, steps in other.outcome_step_latency.items():
+            for step, histogram in steps.items():
+                self.outcome_step_latency[outcome][step].merge(histogram)
+        for step, counts in other.polls.items():
+            self.polls[step].extend(counts)
+        for step, sources in other.status_sources.items():
+            self.status_sources[step].update(sources)
+        self.errors.update(other.errors)
+        self.retries.update(other.retries)
+        self.retries_denied.update(other.retries_denied)
+        return self
+
+    def to_dict(self):
+        return {
+            "requests": self.requests,
+            "background_requests": dict(self.background_requests),
+            "flows": self.flows,
+            "outcomes": dict(self.outcomes),
+            "step_latency": {step: h.to_dict() for step, h in self.step_latency.items()},
+            "corrected_step_latency": {step: h.to_dict() for step, h in self.corrected_step_latency.items()},
+            "rate_limit_wait": {step: h.to_dict() for step, h in self.rate_limit_wait.items()},
+            "flow_latency": {outcome: h.to_dict() for outcome, h in self.flow_latency.items()},
+            "account_requests": dict(self.account_requests),
+            "account_outcomes": {account: dict(outcomes) for account, outcomes in self.account_outcomes.items()},
+            "account_flow_latency": {account: h.to_dict() for account, h in self.account_flow_latency.items()},
+            "outcome_step_latency": {outcome: {step: h.to_dict() for step, h in steps.items()}
+                                     for outcome, steps in self.outcome_step_latency.items()},
+            "polls": dict(self.polls),
+            "status_sources": {step: dict(sources) for step, sources in self.status_sources.items()},
+            "errors": [[step, error, hits] for (step, error), hits in self.errors.items()],
+            "retries": [[step, reason, hits] for (step, reason), hits in self.retries.items()],
+            "retries_denied": [[step, reason, hits] for (step, reason), hits in self.retries_denied.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        stats.requests = data["requests"]
+        stats.background_requests.update(data.get("background_requests", {}))
+        stats.flows = data["flows"]
+        stats.outcomes.update(data["outcomes"])
+        for step, h in data["step_latency"].items():
+            stats.step_latency[step] = Histogram.from_dict(h)
+        for step, h in data.get("corrected_step_latency", {}).items():
+            stats.corrected_step_latency[step] = Histogram.from_dict(h)
+        for step, h in data.get("rate_limit_wait", {}).items():
+            stats.rate_limit_wait[step] = Histogram.from_dict(h)
+        for outcome, h in data["flow_latency"].items():
+            stats.flow_latency[outcome] = Histogram.from_dict(h)
+        stats.account_requests.update(data.get("account_requests", {}))
+        for account, outcomes in data.get("account_outcomes", {}).items():
+            stats.account_outcomes[account].update(outcomes)
+        for account, h in data.get("account_flow_latency", {}).items():
+            stats.account_flow_latency[account] = Histogram.from_dict(h)
+        for outcome, steps in data["outcome_step_latency"].items():
+            for step, h in steps.items():
+                stats.outcome_step_latency[outcome][step] = Histogram.from_dict(h)
+        for step, counts in data["polls"].items():
+            stats.polls[step].extend(counts)
+        for step, sources in data["status_sources"].items():
+            stats.status_sources[step].update(sources)
+        for step, error, hits in data["errors"]:
+            stats.errors[(step, error)] += hits
+        for step, reason, hits in data.get("retries", ()):
+            stats.retries[(step, reason)] += hits
+        for step, reason, hits in data.get("retries_denied", ()):
+            stats.retries_denied[(step, reason)] += hits
+        return stats
+
+    def step_summary(self):
+        return {step: histogram.summary() for step, histogram in self.step_latency.items()}
+
+    def corrected_step_summary(self):
+        return {step: histogram.summary() for step, histogram in self.corrected_step_latency.items()}
+
+    def rate_limit_wait_summary(self):
+        return {step: histogram.summary() for step, histogram in self.rate_limit_wait.items()}
+
+    def account_summary(self):
+        return {account: histogram.summary() for account, histogram in self.account_flow_latency.items()}
+
+    def outcome_summary(self):
+        return {outcome: histogram.summary() for outcome, histogram in self.flow_latency.items()}
+
+    def outcome_step_summary(self, outcome):
+        return {step: histogram.summary() for step, histogram in self.outcome_step_latency[outcome].items()}
+
+
+def merge_files(paths):
+    merged = RunStats()
+    for path in paths:
+        with open(path, "r") as f:
+            merged.merge(RunStats.from_dict(json.load(f)))
+    return merged
+
+
+if __name__ == "__main__":
+    # python metrics.py worker1.json worker2.json ... > merged.json
+    json.dump(merge_files(sys.argv[1:]).to_dict(), sys.stdout)
@@ -0,0 +1,404 @@
+# Generated by generate_client.py from paysafe_payments_api_spec.yaml; do not edit.
+# Re-run `python generate_client.py` after updating the spec.
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import quote, urlencode
+
+SPEC_SHA256 = "24d1ec80145213cc483c296c54d49756b71782c6dbeca9db2241b25257e5d5e1"
+DEFAULT_BASE_URL = "https://api.test.paysafe.com/paymenthub"
+
+
+class Operation:
+
+    __slots__ = ("operation_id", "method", "template", "path_params", "query_params", "headers")
+
+    def __init__(self, operation_id: str, method: str, template: str, path_params: Tuple[str, ...],
+                 query_params: Tuple[str, ...], headers: Dict[str, str]):
+        self.operation_id = operation_id
+        self.method = method
+        self.template = template
+        self.path_params = path_params
+        self.query_params = query_params
+        self.headers = headers
+
+    def path(self, values: Dict[str, Any]) -> str:
+        if not values:
+            return self.template
+        return self.template.format(**{name: quote(str(value), safe="") for name, value in values.items()})
+
+
+Send = Callable[..., Awaitable[Any]]
+
+CANCEL_MANDATE = Operation('cancel-mandate', 'PUT', '/v1/customers/{customerId}/paymenthandles/{paymentHandleId}/mandates/{mandateId}', ('customerId', 'paymentHandleId', 'mandateId'), (), {'Accept': 'application/json', 'Content-Type': 'application/json'})
+CANCEL_ORIGINAL_CREDIT = Operation('cancel-original-credit', 'PUT', '/v1/originalcredits/{originalCreditId}', ('originalCreditId',), (), {'Accept': 'application/json', 'Content-Type': 'application/json'})
+CANCEL_PAYMENTS = Operation('cancel-payments', 'PUT', '/v1/payments/{paymentId}', ('paymentId',), (), {'Accept': 'application/json', 'Content-Type': 'application/json'})
+CANCEL_REFUND = Operation('cancel-refund', 'PUT', '/v1/refunds/{refundId}', ('refundId',), (), {'Accept': 'application/json', 'Content-Type': 'application/json'})
+CANCEL_SETTLEMENT = Operation('cancel-settlement', 'PUT', '/v1/settlements/{settlementId}', ('settlementId',), (), {'Accept': 'application/json', 'Content-Type': 'application/json'})
+CANCEL_STANDALONE_CREDIT = Operation('cancel-standalone-credit', 'PUT', '/v1/standalonecredits/{standaloneCreditId}', ('standaloneCreditId',), (), {'Accept': 'application/json', 'Content-Type': 'application/json'})
+CREATE_A_SIGHTLINE_REGISTRATION_CALL = Operation('create-a-sightline-registration-call', 'POST', '/v1/sightline/registrations', (), (), {'Accept': 'application/json', 'Content-Type': 'application/json'})
+CREATE_A_VIPPREFERRED_REGISTRATION_CALL = Operation('create-a-vippreferred-registration-call', 'POST', '/v1/vippreferred/registrations', (), (), {'Accept': 'application/json', 'Content-Type': 'application/json'})
+CREATE_ADDRESS = Operation('create-address', 'POST', '/v1/customers/{customerId}/addresses', ('customerId',), (), {'Accept': 'application/json', 'Content-Type': 'application/json'})
+CREATE_CUSTOMER = Operation('create-customer', 'POST', '/v1/customers', (), (), {'Accept': 'application/json', 'Content-Type': 'application/json'})
+CREATE_MANDATE = Operation('create-mandate', 'POST', '/v1/customers/{customerId}/paymenthandles/{paymentHandleId}/mandates', ('customerId', 'paymentHandleId'), (), {'Accept': 'application/json', 'Content-Type': 'application/json'})
+CREATE_PAYMENT_HANDLE = Operation('create-payment-handle', 'POST', '/v1/paymenthandles', (), (), {'Accept': 'application/json', 'Content-Type': 'application/json'})
+CREATE_PAYMENT_HANDLE_FOR_CUSTOMER = Operation('create-payment-handle-for-customer', 'POST', '/v1/customers/{customerId}/paymenthandles', ('customerId',), (), {'Accept': 'application/json', 'Content-Type': 'application/json'})
+CREATE_SINGLE_USE_CUSTOMER_TOKEN = Operation('create-single-use-customer-token', 'POST', '/v1/customers/{customerId}/singleusecustomertokens', ('customerId',), (), {'Accept': 'application/json', 'Content-Type': 'application/json'})
+DELETE_AN_ADDRESS = Operation('delete-an-address', 'DELETE', '/v1/customers/{customerId}/addresses/{addressId}', ('customerId', 'addressId'), (), {'Accept': 'application/json'})
+DELETE_CUSTOMER = Operation('delete-customer', 'DELETE', '/v1/customers/{customerId}', ('customerId',), (), {'Accept': 'application/json'})
+DELETE_CUSTOMER_PAYMENT_HANDLE = Operation('delete-customer-payment-handle', 'DELETE', '/v1/customers/{customerId}/paymenthandles/{paymenthandleId}', ('customerId', 'paymenthandleId'), (), {'Accept': 'application/json'})
+GET_ADDRESS = Operation('get-address', 'GET', '/v1/customers/{customerId}/addresses/{addressId}', ('customerId', 'addressId'), (), {'Accept': 'application/json'})
+GET_BALANCE = Operation('get-balance', 'GET', '/v1/balances', (), ('paymentType', 'currencyCode', 'accountId'), {'Accept': 'application/json'})
+GET_BANK = Operation('get-bank', 'GET', '/v1/banks', (), ('paymentType', 'currencyCode', 'countryCode', 'accountId'), {'Accept': 'application/json'})
+GET_CUSTOMER = Operation('get-customer', 'GET', '/v1/customers/{customerId}', ('customerId',), ('fields',), {'Accept': 'application/json'})
+GET_CUSTOMER_PAYMENT_HANDLE = Operation('get-customer-payment-handle', 'GET', '/v1/customers/{customerId}/paymenthandles/{paymenthandleId}', ('customerId', 'paymenthandleId'), (), {'Accept': 'application/json'})
+GET_CUSTOMER_USING_MERCHANT_CUSTOMER_ID = Operation('get-customer-using-merchant-customer-id', 'GET', '/v1/customers', (), ('merchantCustomerId', 'fields'), {'Accept': 'application/json'})
+GET_ORIGINAL_CREDIT = Operation('get-original-credit', 'GET', '/v1/originalcredits/{originalCreditId}', ('originalCreditId',), (), {'Accept': 'application/json'})
+GET_PAYMENT_HANDLE = Operation('get-payment-handle', 'GET', '/v1/paymenthandles/{paymentHandleId}', ('paymentHandleId',), (), {'Accept': 'application/json'})
+GET_PAYMENT_HANDLE_USING_MERCHANT_REFERENCE_NUMBER = Operation('get-payment-handle-using-merchant-reference-number', 'GET', '/v1/paymenthandles', (), ('merchantRefNum', 'limit', 'offset', 'startDate', 'endDate'), {'Accept': 'application/json'})
+GET_PAYMENT_USING_MERCHANT_REFERENCE_NUMBER = Operation('get-payment-using-merchant-reference-number', 'GET', '/v1/payments', (), ('merchantRefNum', 'limit', 'offset', 'startDate', 'endDate'), {'Accept': 'application/json'})
+GET_PAYMENTS = Operation('get-payments', 'GET', '/v1/payments/{paymentId}', ('paymentId',), (), {'Accept': 'application/json'})
+GET_REFUND = Operation('get-refund', 'GET', '/v1/refunds/{refundId}', ('refundId',), (), {'Accept': 'application/json'})
+GET_REFUNDS_USING_MERCHANT_REFERENCE_NUMBER = Operation('get-refunds-using-merchant-reference-number', 'GET', '/v1/refunds', (), ('merchantRefNum', 'limit', 'offset', 'startDate', 'endDate'), {'Accept': 'application/json'})
+GET_REGISTRATION_BY_ID = Operation('get-registration-by-id', 'GET', '/v1/registration/{registrationId}', ('registrationId',), (), {'Accept': 'application/json'})
+GET_SETTLEMENTS = Operation('get-settlements', 'GET', '/v1/settlements/{settlementId}', ('settlementId',), (), {'Accept': 'application/json'})
+GET_SETTLEMENTS_USING_MERCHANT_REFERENCE_NUMBER = Operation('get-settlements-using-merchant-reference-number', 'GET', '/v1/settlements', (), ('merchantRefNum', 'limit', 'offset', 'startDate', 'endDate'), {'Accept': 'application/json'})
+GET_SINGLE_USE_CUSTOMER_TOKEN = Operation('get-single-use-customer-token', 'GET', '/v1/singleusecustomertokens/{singleusecustomertokenId}', ('singleusecustomertokenId',), (), {'Accept': 'application/json'})
+GET_STANDALONE_CREDIT = Operation('get-standalone-credit', 'GET', '/v1/standalonecredits/{standaloneCreditId}', ('standaloneCreditId',), (), {'Accept': 'application/json'})
+GET_STANDALONE_CREDIT_USING_MERCHANT_REFERENCE_NUMBER = Operation('get-standalone-credit-using-merchant-reference-number', 'GET', '/v1/standalonecredits', (), ('merchantRefNum', 'limit', 'offset', 'startDate', 'endDate'), {'Accept': 'application/json'})
+GET_V1_ORIGINALCREDITS = Operation('get-v1-originalcredits', 'GET', '/v1/originalcredits', (), ('merchantRefNum', 'limit', 'offset', 'startDate', 'endDate'), {'Accept': 'application/json'})
+GET_VERIFICATION = Operation('get-verification', 'GET', '/v1/verifications/{verificationId}', ('verificationId',), (), {'Accept': 'application/json'})
+GET_VERIFICATION_USING_MERCHANT_REFERENCE_NUMBER = Operation('get-verification-using-merchant-reference-number', 'GET', '/v1/verifications', (), ('merchantRefNum', 'limit', 'offset', 'startDate', 'endDate'), {'Accept': 'application/json'})
+GET_VIPPREFERRED_REGISTRATION_BY_ID = Operation('get-vippreferred-registration-by-id', 'GET', '/v1/vippreferred/registrations/{registrationId}', ('registrationId',), (), {'Accept': 'application/json'})
+GET_VOID_AUTHORIZATION = Operation('get-void-authorization', 'GET', '/v1/voidauths/{voidAuthId}', ('voidAuthId',), (), {'Accept': 'application/json'})
+GET_VOID_AUTHORIZATION_USING_MERCHANT_REFERENCE_NUMBER = Operation('get-void-authorization-using-merchant-reference-number', 'GET', '/v1/voidauths', (), ('merchantRefNum', 'limit', 'offset', 'startDate', 'endDate'), {'Accept': 'application/json'})
+LOOK_UP_MANDATE_STATUS = Operation('look-up-mandate-status', 'GET', '/v1/customers/{customerId}/paymenthandles/{paymentHandleId}/mandates/{mandateId}', ('customerId', 'paymentHandleId', 'mandateId'), (), {'Accept': 'application/json'})
+LOOK_UP_PAYMENT_METHODS = Operation('look-up-payment-methods', 'GET', '/v1/paymentmethods', (), ('currencyCode',), {'Accept': 'application/json'})
+PATCH_V1_STANDALONECREDITS_STANDALONE_CREDIT_ID = Operation('patch-v1-standalonecredits-standalone_credit_id', 'PATCH', '/v1/standalonecredits/{standaloneCreditId}', ('standaloneCreditId',), (), {'Accept': 'application/json', 'Content-Type': 'application/json'})
+PROCESS_ORIGINAL_CREDIT = Operation('process-original-credit', 'POST', '/v1/originalcredits', (), (), {'Accept': 'application/json', 'Content-Type': 'application/json'})
+PROCESS_PAYMENT = Operation('process-payment', 'POST', '/v1/payments', (), (), {'Accept': 'application/json', 'Content-Type': 'application/json'})
+PROCESS_REFUND = Operation('process-refund', 'POST', '/v1/settlements/{settlementId}/refunds', ('settlementId',), (), {'Accept': 'application/json', 'Content-Type': 'application/json'})
+PROCESS_SETTLEMENT = Operation('process-settlement', 'POST', '/v1/payments/{paymentId}/settlements', ('paymentId',), (), {'Accept': 'application/json', 'Content-Type': 'application/json'})
+PROCESS_STANDALONE_CREDIT = Operation('process-standalone-credit', 'POST', '/v1/standalonecredits', (), (), {'Accept': 'application/json', 'Content-Type': 'application/json'})
+PUT_V1_CUSTOMERS_CUSTOMER_ID = Operation('put-v1-customers-customer_id', 'PUT', '/v1/customers/{customerId}', ('customerId',), (), {'Accept': 'application/json', 'Content-Type': 'application/json'})
+SEARCH_FOR_PAYMENT_HANDLE = Operation('search-for-payment-handle', 'POST', '/v1/singleusepaymenthandles/search', (), (), {'Accept': 'application/json', 'Content-Type': 'application/json'})
+STORE_LOCATOR = Operation('store-locator', 'GET', '/v1/paysafecashstores', (), ('lat', 'long', 'radius', 'limit', 'offset', 'sortOrder', 'moneyFlowDirection', 'accountId'), {'Accept': 'application/json'})
+UPDATE_AN_ADDRESS = Operation('update-an-address', 'PUT', '/v1/customers/{customerId}/addresses/{addressId}', ('customerId', 'addressId'), (), {'Accept': 'application/json', 'Content-Type': 'application/json'})
+UPDATE_CUSTOMER_PAYMENT_HANDLE = Operation('update-customer-payment-handle', 'PUT', '/v1/customers/{customerId}/paymenthandles/{paymenthandleId}', ('customerId', 'paymenthandleId'), (), {'Accept': 'application/json', 'Content-Type': 'application/json'})
+VERIFICATION = Operation('verification', 'POST', '/v1/verifications', (), (), {'Accept': 'application/json', 'Content-Type': 'application/json'})
+VERIFY_THAT_THE_SERVICE_IS_ACCESSIBLE = Operation('verify-that-the-service-is-accessible', 'GET', '/v1/monitor', (), (), {'Accept': 'application/json'})
+VOID_AUTHORIZATION = Operation('void-authorization', 'POST', '/v1/payments/{paymentId}/voidauths', ('paymentId',), (), {'Accept': 'application/json', 'Content-Type': 'application/json'})
+
+OPERATIONS = {
+    'cancel-mandate': CANCEL_MANDATE,
+    'cancel-original-credit': CANCEL_ORIGINAL_CREDIT,
+    'cancel-payments': CANCEL_PAYMENTS,
+    'cancel-refund': CANCEL_REFUND,
+    'cancel-settlement': CANCEL_SETTLEMENT,
+    'cancel-standalone-credit': CANCEL_STANDALONE_CREDIT,
+    'create-a-sightline-registration-call': CREATE_A_SIGHTLINE_REGISTRATION_CALL,
+    'create-a-vippreferred-registration-call': CREATE_A_VIPPREFERRED_REGISTRATION_CALL,
+    'create-address': CREATE_ADDRESS,
+    'create-customer': CREATE_CUSTOMER,
+    'create-mandate': CREATE_MANDATE,
+    'create-payment-handle': CREATE_PAYMENT_HANDLE,
+    'create-payment-handle-for-customer': CREATE_PAYMENT_HANDLE_FOR_CUSTOMER,
+    'create-single-use-customer-token': CREATE_SINGLE_USE_CUSTOMER_TOKEN,
+    'delete-an-address': DELETE_AN_ADDRESS,
+    'delete-customer': DELETE_CUSTOMER,
+    'delete-customer-payment-handle': DELETE_CUSTOMER_PAYMENT_HANDLE,
+    'get-address': GET_ADDRESS,
+    'get-balance': GET_BALANCE,
+    'get-bank': GET_BANK,
+    'get-customer': GET_CUSTOMER,
+    'get-customer-payment-handle': GET_CUSTOMER_PAYMENT_HANDLE,
+    'get-customer-using-merchant-customer-id': GET_CUSTOMER_USING_MERCHANT_CUSTOMER_ID,
+    'get-original-credit': GET_ORIGINAL_CREDIT,
+    'get-payment-handle': GET_PAYMENT_HANDLE,
+    'get-payment-handle-using-merchant-reference-number': GET_PAYMENT_HANDLE_USING_MERCHANT_REFERENCE_NUMBER,
+    'get-payment-using-merchant-reference-number': GET_PAYMENT_USING_MERCHANT_REFERENCE_NUMBER,
+    'get-payments': GET_PAYMENTS,
+    'get-refund': GET_REFUND,
+    'get-refunds-using-merchant-reference-number': GET_REFUNDS_USING_MERCHANT_REFERENCE_NUMBER,
+    'get-registration-by-id': GET_REGISTRATION_BY_ID,
+    'get-settlements': GET_SETTLEMENTS,
+    'get-settlements-using-merchant-reference-number': GET_SETTLEMENTS_USING_MERCHANT_REFERENCE_NUMBER,
+    'get-single-use-customer-token': GET_SINGLE_USE_CUSTOMER_TOKEN,
+    'get-standalone-credit': GET_STANDALONE_CREDIT,
+    'get-standalone-credit-using-merchant-reference-number': GET_STANDALONE_CREDIT_USING_MERCHANT_REFERENCE_NUMBER,
+    'get-v1-originalcredits': GET_V1_ORIGINALCREDITS,
+    'get-verification': GET_VERIFICATION,
+    'get-verification-using-merchant-reference-number': GET_VERIFICATION_USING_MERCHANT_REFERENCE_NUMBER,
+    'get-vippreferred-registration-by-id': GET_VIPPREFERRED_REGISTRATION_BY_ID,
+    'get-void-authorization': GET_VOID_AUTHORIZATION,
+    'get-void-authorization-using-merchant-reference-number': GET_VOID_AUTHORIZATION_USING_MERCHANT_REFERENCE_NUMBER,
+    'look-up-mandate-status': LOOK_UP_MANDATE_STATUS,
+    'look-up-payment-methods': LOOK_UP_PAYMENT_METHODS,
+    'patch-v1-standalonecredits-standalone_credit_id': PATCH_V1_STANDALONECREDITS_STANDALONE_CREDIT_ID,
+    'process-original-credit': PROCESS_ORIGINAL_CREDIT,
+    'process-payment': PROCESS_PAYMENT,
+    'process-refund': PROCESS_REFUND,
+    'process-settlement': PROCESS_SETTLEMENT,
+    'process-standalone-credit': PROCESS_STANDALONE_CREDIT,
+    'put-v1-customers-customer_id': PUT_V1_CUSTOMERS_CUSTOMER_ID,
+    'search-for-payment-handle': SEARCH_FOR_PAYMENT_HANDLE,
+    'store-locator': STORE_LOCATOR,
+    'update-an-address': UPDATE_AN_ADDRESS,
+    'update-customer-payment-handle': UPDATE_CUSTOMER_PAYMENT_HANDLE,
+    'verification': VERIFICATION,
+    'verify-that-the-service-is-accessible': VERIFY_THAT_THE_SERVICE_IS_ACCESSIBLE,
+    'void-authorization': VOID_AUTHORIZATION,
+}
+
+
+class PaysafeClient:
+    # One method per spec operation. Each builds the URL from the precomputed template,
+    # merges the operation's default headers with the caller's, and hands the request to
+    # `send(operation, url, headers, body, **options)`, which owns transport and logging.
+
+    def __init__(self, base_url: str = DEFAULT_BASE_URL, send: Optional[Send] = None):
+        base_url = base_url.rstrip("/")
+        self.base_url = base_url[:-3] if base_url.endswith("/v1") else base_url
+        self.send = send
+
+    def _call(self, operation: Operation, path_values: Dict[str, Any], query: Dict[str, Any], body: Any,
+              headers: Optional[Dict[str, str]], extra_headers: Dict[str, Optional[str]], options: Dict[str, Any]) -> Awaitable[Any]:
+        url = self.base_url + operation.path(path_values)
+        query = {name: value for name, value in query.items() if value is not None}
+        if query:
+            url += "?" + urlencode(query)
+        merged = dict(operation.headers)
+        merged.update({name: value for name, value in extra_headers.items() if value is not None})
+        if headers:
+            merged.update(headers)
+        return self.send(operation, url, merged, body, **options)
+
+    def cancel_mandate(self, customer_id: str, payment_handle_id: str, mandate_id: str, body: Dict[str, Any], *, simulator: Optional[str] = None, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """PUT /v1/customers/{customerId}/paymenthandles/{paymentHandleId}/mandates/{mandateId}: Cancel a Mandate"""
+        return self._call(CANCEL_MANDATE, {'customerId': customer_id, 'paymentHandleId': payment_handle_id, 'mandateId': mandate_id}, {}, body, headers, {'Simulator': simulator}, options)
+
+    def cancel_original_credit(self, original_credit_id: str, body: Dict[str, Any], *, simulator: Optional[str] = None, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """PUT /v1/originalcredits/{originalCreditId}: Cancel Original Credit"""
+        return self._call(CANCEL_ORIGINAL_CREDIT, {'originalCreditId': original_credit_id}, {}, body, headers, {'Simulator': simulator}, options)
+
+    def cancel_payments(self, payment_id: str, body: Dict[str, Any], *, simulator: Optional[str] = None, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """PUT /v1/payments/{paymentId}: Cancel Payment"""
+        return self._call(CANCEL_PAYMENTS, {'paymentId': payment_id}, {}, body, headers, {'Simulator': simulator}, options)
+
+    def cancel_refund(self, refund_id: str, body: Dict[str, Any], *, simulator: Optional[str] = None, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """PUT /v1/refunds/{refundId}: Cancel Refund"""
+        return self._call(CANCEL_REFUND, {'refundId': refund_id}, {}, body, headers, {'Simulator': simulator}, options)
+
+    def cancel_settlement(self, settlement_id: str, body: Dict[str, Any], *, simulator: Optional[str] = None, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """PUT /v1/settlements/{settlementId}: Cancel Settlement"""
+        return self._call(CANCEL_SETTLEMENT, {'settlementId': settlement_id}, {}, body, headers, {'Simulator': simulator}, options)
+
+    def cancel_standalone_credit(self, standalone_credit_id: str, body: Dict[str, Any], *, simulator: Optional[str] = None, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """PUT /v1/standalonecredits/{standaloneCreditId}: Cancel Standalone Credit"""
+        return self._call(CANCEL_STANDALONE_CREDIT, {'standaloneCreditId': standalone_credit_id}, {}, body, headers, {'Simulator': simulator}, options)
+
+    def create_a_sightline_registration_call(self, body: Dict[str, Any], *, simulator: Optional[str] = None, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """POST /v1/sightline/registrations: Create a Partial Registration Call"""
+        return self._call(CREATE_A_SIGHTLINE_REGISTRATION_CALL, {}, {}, body, headers, {'Simulator': simulator}, options)
+
+    def create_a_vippreferred_registration_call(self, body: Dict[str, Any], *, simulator: Optional[str] = None, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """POST /v1/vippreferred/registrations: Create a Registration Call"""
+        return self._call(CREATE_A_VIPPREFERRED_REGISTRATION_CALL, {}, {}, body, headers, {'Simulator': simulator}, options)
+
+    def create_address(self, customer_id: str, body: Dict[str, Any], *, simulator: Optional[str] = None, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """POST /v1/customers/{customerId}/addresses: Create an Address"""
+        return self._call(CREATE_ADDRESS, {'customerId': customer_id}, {}, body, headers, {'Simulator': simulator}, options)
+
+    def create_customer(self, body: Dict[str, Any], *, simulator: Optional[str] = None, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """POST /v1/customers: Create a Customer"""
+        return self._call(CREATE_CUSTOMER, {}, {}, body, headers, {'Simulator': simulator}, options)
+
+    def create_mandate(self, customer_id: str, payment_handle_id: str, body: Dict[str, Any], *, simulator: Optional[str] = None, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """POST /v1/customers/{customerId}/paymenthandles/{paymentHandleId}/mandates: Create a Mandate for a Customer"""
+        return self._call(CREATE_MANDATE, {'customerId': customer_id, 'paymentHandleId': payment_handle_id}, {}, body, headers, {'Simulator': simulator}, options)
+
+    def create_payment_handle(self, body: Dict[str, Any], *, simulator: Optional[str] = None, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """POST /v1/paymenthandles: Create a Payment Handle"""
+        return self._call(CREATE_PAYMENT_HANDLE, {}, {}, body, headers, {'Simulator': simulator}, options)
+
+    def create_payment_handle_for_customer(self, customer_id: str, body: Dict[str, Any], *, simulator: Optional[str] = None, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """POST /v1/customers/{customerId}/paymenthandles: Create a Payment Handle For a Customer"""
+        return self._call(CREATE_PAYMENT_HANDLE_FOR_CUSTOMER, {'customerId': customer_id}, {}, body, headers, {'Simulator': simulator}, options)
+
+    def create_single_use_customer_token(self, customer_id: str, body: Dict[str, Any], *, simulator: Optional[str] = None, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """POST /v1/customers/{customerId}/singleusecustomertokens: Create a Single-Use Customer Token"""
+        return self._call(CREATE_SINGLE_USE_CUSTOMER_TOKEN, {'customerId': customer_id}, {}, body, headers, {'Simulator': simulator}, options)
+
+    def delete_an_address(self, customer_id: str, address_id: str, *, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """DELETE /v1/customers/{customerId}/addresses/{addressId}: Delete an Address"""
+        return self._call(DELETE_AN_ADDRESS, {'customerId': customer_id, 'addressId': address_id}, {}, None, headers, {}, options)
+
+    def delete_customer(self, customer_id: str, *, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """DELETE /v1/customers/{customerId}: Delete a Customer"""
+        return self._call(DELETE_CUSTOMER, {'customerId': customer_id}, {}, None, headers, {}, options)
+
+    def delete_customer_payment_handle(self, customer_id: str, paymenthandle_id: str, *, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """DELETE /v1/customers/{customerId}/paymenthandles/{paymenthandleId}: Delete Customer Payment Handle"""
+        return self._call(DELETE_CUSTOMER_PAYMENT_HANDLE, {'customerId': customer_id, 'paymenthandleId': paymenthandle_id}, {}, None, headers, {}, options)
+
+    def get_address(self, customer_id: str, address_id: str, *, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """GET /v1/customers/{customerId}/addresses/{addressId}: Get Address"""
+        return self._call(GET_ADDRESS, {'customerId': customer_id, 'addressId': address_id}, {}, None, headers, {}, options)
+
+    def get_balance(self, *, payment_type: str, currency_code: str, account_id: Optional[str] = None, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """GET /v1/balances: Get Balance"""
+        return self._call(GET_BALANCE, {}, {'paymentType': payment_type, 'currencyCode': currency_code, 'accountId': account_id}, None, headers, {}, options)
+
+    def get_bank(self, *, payment_type: str, currency_code: str, country_code: str, account_id: str, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """GET /v1/banks: Get Bank"""
+        return self._call(GET_BANK, {}, {'paymentType': payment_type, 'currencyCode': currency_code, 'countryCode': country_code, 'accountId': account_id}, None, headers, {}, options)
+
+    def get_customer(self, customer_id: str, *, fields: Optional[str] = None, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """GET /v1/customers/{customerId}: Get customer profile by Customer Id."""
+        return self._call(GET_CUSTOMER, {'customerId': customer_id}, {'fields': fields}, None, headers, {}, options)
+
+    def get_customer_payment_handle(self, customer_id: str, paymenthandle_id: str, *, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """GET /v1/customers/{customerId}/paymenthandles/{paymenthandleId}: Get Customer Payment Handle"""
+        return self._call(GET_CUSTOMER_PAYMENT_HANDLE, {'customerId': customer_id, 'paymenthandleId': paymenthandle_id}, {}, None, headers, {}, options)
+
+    def get_customer_using_merchant_customer_id(self, *, merchant_customer_id: str, fields: Optional[str] = None, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """GET /v1/customers: Get Customer Using Merchant Customer Id"""
+        return self._call(GET_CUSTOMER_USING_MERCHANT_CUSTOMER_ID, {}, {'merchantCustomerId': merchant_customer_id, 'fields': fields}, None, headers, {}, options)
+
+    def get_original_credit(self, original_credit_id: str, *, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """GET /v1/originalcredits/{originalCreditId}: Get Original Credit"""
+        return self._call(GET_ORIGINAL_CREDIT, {'originalCreditId': original_credit_id}, {}, None, headers, {}, options)
+
+    def get_payment_handle(self, payment_handle_id: str, *, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """GET /v1/paymenthandles/{paymentHandleId}: Get Payment Handle"""
+        return self._call(GET_PAYMENT_HANDLE, {'paymentHandleId': payment_handle_id}, {}, None, headers, {}, options)
+
+    def get_payment_handle_using_merchant_reference_number(self, *, merchant_ref_num: str, limit: Optional[float] = None, offset: Optional[float] = None, start_date: Optional[str] = None, end_date: Optional[str] = None, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """GET /v1/paymenthandles: Get Payment Handle Using Merchant Reference Number"""
+        return self._call(GET_PAYMENT_HANDLE_USING_MERCHANT_REFERENCE_NUMBER, {}, {'merchantRefNum': merchant_ref_num, 'limit': limit, 'offset': offset, 'startDate': start_date, 'endDate': end_date}, None, headers, {}, options)
+
+    def get_payment_using_merchant_reference_number(self, *, merchant_ref_num: str, limit: Optional[float] = None, offset: Optional[float] = None, start_date: Optional[str] = None, end_date: Optional[str] = None, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """GET /v1/payments: Get Payments Using Merchant Reference Number"""
+        return self._call(GET_PAYMENT_USING_MERCHANT_REFERENCE_NUMBER, {}, {'merchantRefNum': merchant_ref_num, 'limit': limit, 'offset': offset, 'startDate': start_date, 'endDate': end_date}, None, headers, {}, options)
+
+    def get_payments(self, payment_id: str, *, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """GET /v1/payments/{paymentId}: Get Payments"""
+        return self._call(GET_PAYMENTS, {'paymentId': payment_id}, {}, None, headers, {}, options)
+
+    def get_refund(self, refund_id: str, *, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """GET /v1/refunds/{refundId}: Get Refund"""
+        return self._call(GET_REFUND, {'refundId': refund_id}, {}, None, headers, {}, options)
+
+    def get_refunds_using_merchant_reference_number(self, *, merchant_ref_num: str, limit: Optional[float] = None, offset: Optional[float] = None, start_date: Optional[str] = None, end_date: Optional[str] = None, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """GET /v1/refunds: Get Refunds Using Merchant Reference Number"""
+        return self._call(GET_REFUNDS_USING_MERCHANT_REFERENCE_NUMBER, {}, {'merchantRefNum': merchant_ref_num, 'limit': limit, 'offset': offset, 'startDate': start_date, 'endDate': end_date}, None, headers, {}, options)
+
+    def get_registration_by_id(self, registration_id: str, *, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """GET /v1/registration/{registrationId}: Get Registration By Id"""
+        return self._call(GET_REGISTRATION_BY_ID, {'registrationId': registration_id}, {}, None, headers, {}, options)
+
+    def get_settlements(self, settlement_id: str, *, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """GET /v1/settlements/{settlementId}: Get Settlements"""
+        return self._call(GET_SETTLEMENTS, {'settlementId': settlement_id}, {}, None, headers, {}, options)
+
+    def get_settlements_using_merchant_reference_number(self, *, merchant_ref_num: str, limit: Optional[float] = None, offset: Optional[float] = None, start_date: Optional[str] = None, end_date: Optional[str] = None, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """GET /v1/settlements: Get Settlements Using Merchant Reference Number"""
+        return self._call(GET_SETTLEMENTS_USING_MERCHANT_REFERENCE_NUMBER, {}, {'merchantRefNum': merchant_ref_num, 'limit': limit, 'offset': offset, 'startDate': start_date, 'endDate': end_date}, None, headers, {}, options)
+
+    def get_single_use_customer_token(self, singleusecustomertoken_id: str, *, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """GET /v1/singleusecustomertokens/{singleusecustomertokenId}: Get Single-Use Customer Token"""
+        return self._call(GET_SINGLE_USE_CUSTOMER_TOKEN, {'singleusecustomertokenId': singleusecustomertoken_id}, {}, None, headers, {}, options)
+
+    def get_standalone_credit(self, standalone_credit_id: str, *, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """GET /v1/standalonecredits/{standaloneCreditId}: Get Standalone Credit"""
+        return self._call(GET_STANDALONE_CREDIT, {'standaloneCreditId': standalone_credit_id}, {}, None, headers, {}, options)
+
+    def get_standalone_credit_using_merchant_reference_number(self, *, merchant_ref_num: str, limit: Optional[float] = None, offset: Optional[float] = None, start_date: Optional[str] = None, end_date: Optional[str] = None, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """GET /v1/standalonecredits: Get Standalone Credit Using Merchant Reference Number"""
+        return self._call(GET_STANDALONE_CREDIT_USING_MERCHANT_REFERENCE_NUMBER, {}, {'merchantRefNum': merchant_ref_num, 'limit': limit, 'offset': offset, 'startDate': start_date, 'endDate': end_date}, None, headers, {}, options)
+
+    def get_v1_originalcredits(self, *, merchant_ref_num: str, limit: Optional[float] = None, offset: Optional[float] = None, start_date: Optional[str] = None, end_date: Optional[str] = None, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """GET /v1/originalcredits: Get Original Credit Using Merchant Reference Number"""
+        return self._call(GET_V1_ORIGINALCREDITS, {}, {'merchantRefNum': merchant_ref_num, 'limit': limit, 'offset': offset, 'startDate': start_date, 'endDate': end_date}, None, headers, {}, options)
+
+    def get_verification(self, verification_id: str, *, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """GET /v1/verifications/{verificationId}: Get Verification"""
+        return self._call(GET_VERIFICATION, {'verificationId': verification_id}, {}, None, headers, {}, options)
+
+    def get_verification_using_merchant_reference_number(self, *, merchant_ref_num: str, limit: Optional[float] = None, offset: Optional[float] = None, start_date: Optional[str] = None, end_date: Optional[str] = None, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """GET /v1/verifications: Get Verification Using Merchant Reference Number"""
+        return self._call(GET_VERIFICATION_USING_MERCHANT_REFERENCE_NUMBER, {}, {'merchantRefNum': merchant_ref_num, 'limit': limit, 'offset': offset, 'startDate': start_date, 'endDate': end_date}, None, headers, {}, options)
+
+    def get_vippreferred_registration_by_id(self, registration_id: str, *, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """GET /v1/vippreferred/registrations/{registrationId}: Get Registration by Id"""
+        return self._call(GET_VIPPREFERRED_REGISTRATION_BY_ID, {'registrationId': registration_id}, {}, None, headers, {}, options)
+
+    def get_void_authorization(self, void_auth_id: str, *, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """GET /v1/voidauths/{voidAuthId}: Get Void Authorization"""
+        return self._call(GET_VOID_AUTHORIZATION, {'voidAuthId': void_auth_id}, {}, None, headers, {}, options)
+
+    def get_void_authorization_using_merchant_reference_number(self, *, merchant_ref_num: str, limit: Optional[float] = None, offset: Optional[float] = None, start_date: Optional[str] = None, end_date: Optional[str] = None, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """GET /v1/voidauths: Get Void Authorization Using Merchant Reference Number"""
+        return self._call(GET_VOID_AUTHORIZATION_USING_MERCHANT_REFERENCE_NUMBER, {}, {'merchantRefNum': merchant_ref_num, 'limit': limit, 'offset': offset, 'startDate': start_date, 'endDate': end_date}, None, headers, {}, options)
+
+    def look_up_mandate_status(self, customer_id: str, payment_handle_id: str, mandate_id: str, *, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """GET /v1/customers/{customerId}/paymenthandles/{paymentHandleId}/mandates/{mandateId}: Look Up Mandate Status"""
+        return self._call(LOOK_UP_MANDATE_STATUS, {'customerId': customer_id, 'paymentHandleId': payment_handle_id, 'mandateId': mandate_id}, {}, None, headers, {}, options)
+
+    def look_up_payment_methods(self, *, currency_code: str, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """GET /v1/paymentmethods: Look Up Payment Methods"""
+        return self._call(LOOK_UP_PAYMENT_METHODS, {}, {'currencyCode': currency_code}, None, headers, {}, options)
+
+    def patch_v1_standalonecredits_standalone_credit_id(self, standalone_credit_id: str, body: Dict[str, Any], *, simulator: Optional[str] = None, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """PATCH /v1/standalonecredits/{standaloneCreditId}: Patch Standalone Credit Using Interac e-Transfer Fraud API"""
+        return self._call(PATCH_V1_STANDALONECREDITS_STANDALONE_CREDIT_ID, {'standaloneCreditId': standalone_credit_id}, {}, body, headers, {'Simulator': simulator}, options)
+
+    def process_original_credit(self, body: Dict[str, Any], *, simulator: Optional[str] = None, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """POST /v1/originalcredits: Process Original Credit"""
+        return self._call(PROCESS_ORIGINAL_CREDIT, {}, {}, body, headers, {'Simulator': simulator}, options)
+
+    def process_payment(self, body: Dict[str, Any], *, simulator: Optional[str] = None, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """POST /v1/payments: Process Payment"""
+        return self._call(PROCESS_PAYMENT, {}, {}, body, headers, {'Simulator': simulator}, options)
+
+    def process_refund(self, settlement_id: str, body: Dict[str, Any], *, simulator: Optional[str] = None, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """POST /v1/settlements/{settlementId}/refunds: Process Refund"""
+        return self._call(PROCESS_REFUND, {'settlementId': settlement_id}, {}, body, headers, {'Simulator': simulator}, options)
+
+    def process_settlement(self, payment_id: str, body: Dict[str, Any], *, simulator: Optional[str] = None, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """POST /v1/payments/{paymentId}/settlements: Process Settlement"""
+        return self._call(PROCESS_SETTLEMENT, {'paymentId': payment_id}, {}, body, headers, {'Simulator': simulator}, options)
+
+    def process_standalone_credit(self, body: Dict[str, Any], *, simulator: Optional[str] = None, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """POST /v1/standalonecredits: Process Standalone Credit"""
+        return self._call(PROCESS_STANDALONE_CREDIT, {}, {}, body, headers, {'Simulator': simulator}, options)
+
+    def put_v1_customers_customer_id(self, customer_id: str, body: Dict[str, Any], *, simulator: Optional[str] = None, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """PUT /v1/customers/{customerId}: Update a Customer"""
+        return self._call(PUT_V1_CUSTOMERS_CUSTOMER_ID, {'customerId': customer_id}, {}, body, headers, {'Simulator': simulator}, options)
+
+    def search_for_payment_handle(self, body: Dict[str, Any], *, simulator: Optional[str] = None, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """POST /v1/singleusepaymenthandles/search: Search for SafetyPay Payment Handle"""
+        return self._call(SEARCH_FOR_PAYMENT_HANDLE, {}, {}, body, headers, {'Simulator': simulator}, options)
+
+    def store_locator(self, *, lat: float, long: float, radius: float, money_flow_direction: str, account_id: str, limit: Optional[float] = None, offset: Optional[float] = None, sort_order: Optional[str] = None, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """GET /v1/paysafecashstores: Store Locator"""
+        return self._call(STORE_LOCATOR, {}, {'lat': lat, 'long': long, 'radius': radius, 'limit': limit, 'offset': offset, 'sortOrder': sort_order, 'moneyFlowDirection': money_flow_direction, 'accountId': account_id}, None, headers, {}, options)
+
+    def update_an_address(self, customer_id: str, address_id: str, body: Dict[str, Any], *, simulator: Optional[str] = None, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """PUT /v1/customers/{customerId}/addresses/{addressId}: Update an Address"""
+        return self._call(UPDATE_AN_ADDRESS, {'customerId': customer_id, 'addressId': address_id}, {}, body, headers, {'Simulator': simulator}, options)
+
+    def update_customer_payment_handle(self, customer_id: str, paymenthandle_id: str, body: Dict[str, Any], *, simulator: Optional[str] = None, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """PUT /v1/customers/{customerId}/paymenthandles/{paymenthandleId}: Update a Customer Payment Handle"""
+        return self._call(UPDATE_CUSTOMER_PAYMENT_HANDLE, {'customerId': customer_id, 'paymenthandleId': paymenthandle_id}, {}, body, headers, {'Simulator': simulator}, options)
+
+    def verification(self, body: Dict[str, Any], *, simulator: Optional[str] = None, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """POST /v1/verifications: Verification"""
+        return self._call(VERIFICATION, {}, {}, body, headers, {'Simulator': simulator}, options)
+
+    def verify_that_the_service_is_accessible(self, *, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """GET /v1/monitor: Verify That The Service Is Accessible"""
+        return self._call(VERIFY_THAT_THE_SERVICE_IS_ACCESSIBLE, {}, {}, None, headers, {}, options)
+
+    def void_authorization(self, payment_id: str, body: Dict[str, Any], *, simulator: Optional[str] = None, headers: Optional[Dict[str, str]] = None, **options: Any) -> Awaitable[Any]:
+        """POST /v1/payments/{paymentId}/voidauths: Void Authorization"""
+        return self._call(VOID_AUTHORIZATION, {'paymentId': payment_id}, {}, body, headers, {'Simulator': simulator}, options)
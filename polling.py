@@ -0,0 +1,65 @@
+import asyncio
+import random
+import time
+
+# Final values of the status enums in paysafe_payments_api_spec.yaml; every other
+# value (RECEIVED, INITIATED, PROCESSING, PENDING, HELD) can still change.
+PAYMENT_TERMINAL_STATES = frozenset({"COMPLETED", "FAILED", "CANCELLED", "EXPIRED"})
+SETTLEMENT_TERMINAL_STATES = frozenset({"COMPLETED", "FAILED", "CANCELLED", "EXPIRED"})
+REFUND_TERMINAL_STATES = frozenset({"COMPLETED", "FAILED", "CANCELLED", "EXPIRED"})
+
+
+class PollResult:
+
+    def __init__(self, document, polls, elapsed, timed_out, source="poll"):
+        self.document = document
+        self.polls = polls
+        self.elapsed = elapsed
+        self.timed_out = timed_out
+        self.source = source
+
+    @property
+    def status(self):
+        return (self.document or {}).get("status")
+
+
+class Poller:
+    # Polls a status resource with exponential backoff and jitter until it reaches
+    # a terminal state or the deadline passes. The first poll is sent immediately;
+    # `sleep` replaces asyncio.sleep for the waits between polls.
+
+    def __init__(self, terminal_states, initial_interval=0.05, multiplier=2.0, max_interval=2.0,
+                 deadline=30.0, jitter=0.2, clock=time.perf_counter):
+        self.terminal_states = frozenset(terminal_states)
+        self.initial_interval = initial_interval
+        self.multiplier = multiplier
+        self.max_interval = max_interval
+        self.deadline = deadline
+        self.jitter = jitter
+        self.clock = clock
+
+    def intervals(self):
+        interval = self.initial_interval
+        while True:
+            spread = interval * self.jitter
+            yield max(0.0, interval + random.uniform(-spread, spread))
+            interval = min(self.max_interval, interval * self.multiplier)
+
+    def is_terminal(self, document):
+        return (document or {}).get("status") in self.terminal_states
+
+    async def poll(self, fetch, sleep=None):
+        started = self.clock()
+        give_up_at = started + self.deadline
+        polls = 0
+        document = None
+        for interval in self.intervals():
+            document = await fetch()
+            polls += 1
+            if self.is_terminal(document):
+                return PollResult(document, polls, self.clock() - started, False)
+            remaining = give_up_at - self.clock()
+            if remaining <= 0:
+                break
+            await (sleep or asyncio.sleep)(min(interval, remaining))
+        return PollResult(document, polls, self.clock() - started, True)
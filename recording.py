@@ -0,0 +1,137 @@
+import json
+import os
+import queue
+import threading
+
+SECRET_HEADERS = frozenset({"authorization", "proxy-authorization", "cookie", "set-cookie", "signature", "x-api-key"})
+REDACTED = "<redacted>"
+# Card fields in request and response bodies: the number keeps its last four digits,
+# the expiry is redacted and the CVV is dropped.
+DROPPED_CARD_FIELDS = frozenset({"cvv"})
+REDACTED_CARD_FIELDS = frozenset({"cardExpiry"})
+_STOP = object()
+
+
+def redact_headers(headers):
+    return {name: REDACTED if name.lower() in SECRET_HEADERS else value for name, value in (headers or {}).items()}
+
+
+def mask_card(card):
+    masked = {name: REDACTED if name in REDACTED_CARD_FIELDS else value
+              for name, value in card.items() if name not in DROPPED_CARD_FIELDS}
+    if masked.get("cardNum") is not None:
+        number = str(masked["cardNum"])
+        masked["cardNum"] = "*" * max(0, len(number) - 4) + number[-4:]
+    return masked
+
+
+def redact_body(body):
+    # Copies `body` with every "card" object masked; the flow's own payload is left alone.
+    if isinstance(body, dict):
+        return {name: mask_card(value) if name == "card" and isinstance(value, dict) else redact_body(value)
+                for name, value in body.items()}
+    if isinstance(body, list):
+        return [redact_body(item) for item in body]
+    return body
+
+
+def decode_body(content):
+    if not content:
+        return None
+    try:
+        return json.loads(content)
+    except ValueError:
+        return content.decode("utf-8", errors="replace")
+
+
+class TrafficRecorder:
+    # Streams request/response records as JSON lines. `record` only enqueues; a
+    # background thread decodes, serialises and writes through a large buffer, and
+    # rotates the file (path -> path.1 -> ... -> path.N) once it passes `max_bytes`.
+    # If the writer falls `queue_size` records behind, new records are dropped and
+    # counted rather than stalling the flows.
+
+    def __init__(self, path, max_bytes=100 * 1024 * 1024, backups=5, queue_size=100000, flush_interval=0.2):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.flush_interval = flush_interval
+        self.recorded = 0
+        self.dropped = 0
+        self.rotations = 0
+        self._queue = queue.Queue(queue_size)
+        self._file = None
+        self._size = 0
+        self._thread = threading.Thread(target=self._run, name="traffic-recorder", daemon=True)
+        self._open()
+        self._thread.start()
+
+    def record(self, flow_id, step, operation, method, url, headers, body, started, elapsed, response=None, error=None):
+        entry = (flow_id, step, operation, method, url, headers, body, started, elapsed,
+                 None if response is None else (response.status_code, dict(response.headers), response.content),
+                 None if error is None else type(error).__name__)
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _open(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        self._file = open(self.path, "ab", buffering=1024 * 1024)
+        self._size = self._file.tell()
+
+    def _rotate(self):
+        self._file.close()
+        for generation in range(self.backups - 1, 0, -1):
+            older = f"{self.path}.{generation}"
+            if os.path.exists(older):
+                os.replace(older, f"{self.path}.{generation + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self.rotations += 1
+        self._open()
+
+    def _line(self, entry):
+        flow_id, step, operation, method, url, headers, body, started, elapsed, response, error = entry
+        record = {
+            "ts": started,
+            "flow_id": flow_id,
+            "step": step,
+            "operation_id": operation.operation_id if operation else None,
+            "method": method,
+            "template": operation.template if operation else None,
+            "url": url,
+            "request_headers": redact_headers(headers),
+            "request_body": redact_body(body),
+            "elapsed_ms": round(elapsed * 1000, 3),
+        }
+        if response is not None:
+            status, response_headers, content = response
+            record.update(status=status, response_headers=redact_headers(response_headers), response_body=redact_body(decode_body(content)))
+        if error is not None:
+            record["error"] = error
+        return (json.dumps(record, separators=(",", ":"), default=str) + "\n").encode("utf-8")
+
+    def _run(self):
+        while True:
+            try:
+                entry = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                self._file.flush()
+                continue
+            if entry is _STOP:
+                break
+            line = self._line(entry)
+            if self._size and self._size + len(line) > self.max_bytes:
+                self._rotate()
+            self._file.write(line)
+            self._size += len(line)
+            self.recorded += 1
+        self._file.close()
@@ -0,0 +1,187 @@
+import asyncio
+import json
+import uuid
+from collections import Counter, OrderedDict
+from urllib.parse import urlsplit, urlunsplit
+
+from metrics import Histogram
+from recording import REDACTED
+
+# Response fields whose values later requests refer to (in the path or the body).
+ID_FIELDS = frozenset({"id", "paymentHandleToken", "paymentId", "settlementId", "refundId"})
+# Request fields that must be unique per replay, or Paysafe rejects the request as a duplicate.
+FRESH_FIELDS = frozenset({"merchantRefNum"})
+# Requests in flight when the caller does not cap them.
+DEFAULT_MAX_IN_FLIGHT = 100
+
+
+def iter_records(paths):
+    # Streams records from one or more JSON-lines files (oldest rotation first); a line is
+    # decoded only when it is reached, so capture size does not bound memory. Lines that do
+    # not decode are yielded as None so the caller can count them.
+    for path in paths:
+        with open(path, "rb") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    yield None
+
+
+def rebase(url, base_url):
+    # Point a recorded URL at another deployment, keeping everything from /v1/ on.
+    if not base_url:
+        return url
+    parts = urlsplit(url)
+    marker = parts.path.find("/v1/")
+    if marker < 0:
+        return url
+    base = urlsplit(base_url.rstrip("/"))
+    return urlunsplit((base.scheme, base.netloc, base.path + parts.path[marker:], parts.query, ""))
+
+
+class IdMap:
+    # Recorded id -> id issued during the replay, for the most recent `max_ids` ids.
+
+    def __init__(self, max_ids=1000000):
+        self.max_ids = max_ids
+        self.ids = OrderedDict()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, recorded, replayed):
+        if recorded == replayed:
+            return
+        self.ids[recorded] = replayed
+        if len(self.ids) > self.max_ids:
+            self.ids.popitem(last=False)
+
+    def get(self, value):
+        return self.ids.get(value, value)
+
+    def fresh(self, value):
+        if value not in self.ids:
+            self.add(value, str(uuid.uuid4()))
+        return self.ids[value]
+
+    def rewrite_url(self, url):
+        parts = urlsplit(url)
+        path = "/".join(self.get(segment) for segment in parts.path.split("/"))
+        return urlunsplit((parts.scheme, parts.netloc, path, parts.query, parts.fragment))
+
+    def rewrite_body(self, value, key=None):
+        if isinstance(value, dict):
+            return {k: self.rewrite_body(v, k) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self.rewrite_body(v, key) for v in value]
+        if isinstance(value, str):
+            return self.fresh(value) if key in FRESH_FIELDS else self.get(value)
+        return value
+
+    def learn(self, recorded, replayed):
+        # Walk the recorded and replayed response bodies side by side, pairing up ids.
+        if isinstance(recorded, dict) and isinstance(replayed, dict):
+            for key, value in recorded.items():
+                if key not in replayed:
+                    continue
+                if key in ID_FIELDS and isinstance(value, str) and isinstance(replayed[key], str):
+                    self.add(value, replayed[key])
+                else:
+                    self.learn(value, replayed[key])
+        elif isinstance(recorded, list) and isinstance(replayed, list):
+            for old, new in zip(recorded, replayed):
+                self.learn(old, new)
+
+
+class Replayer:
+    # Re-issues recorded traffic through `send(method, url, headers, body, record)`, which
+    # returns a response with `status_code` and `json()`. Records of one flow are sent one
+    # after another so each sees the ids its predecessors were issued; different flows run
+    # concurrently, up to `max_in_flight` requests. `speed` scales the recorded gaps between
+    # request starts (1.0 = original timing, 10.0 = ten times faster); None sends as fast
+    # as `max_in_flight` allows. `headers_for(record)` supplies headers that were redacted
+    # when recording, such as Authorization, and the fields of `card` replace the masked
+    # ones of every recorded "card" object.
+
+    def __init__(self, send, base_url=None, speed=1.0, max_in_flight=DEFAULT_MAX_IN_FLIGHT, headers_for=None, ids=None,
+                 card=None):
+        self.send = send
+        self.base_url = base_url
+        self.speed = speed
+        self.max_in_flight = max_in_flight
+        self.headers_for = headers_for
+        self.ids = ids or IdMap()
+        self.card = card
+        self.sent = 0
+        self.skipped = 0
+        self.errors = Counter()
+        self.statuses = Counter()
+        self.lag = Histogram()
+        self._flows = {}
+
+    async def run(self, records):
+        loop = asyncio.get_running_loop()
+        slots = asyncio.Semaphore(self.max_in_flight)
+        tasks = set()
+        origin = first_ts = None
+        for record in records:
+            if not record or "method" not in record or "url" not in record:
+                self.skipped += 1
+                continue
+            if self.speed and record.get("ts") is not None:
+                if first_ts is None:
+                    origin, first_ts = loop.time(), record["ts"]
+                due = origin + max(0.0, record["ts"] - first_ts) / self.speed
+                delay = due - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                await slots.acquire()
+                self.lag.record(max(0.0, loop.time() - due))
+            else:
+                await slots.acquire()
+            task = asyncio.ensure_future(self._replay(record, self._flows.get(record.get("flow_id"))))
+            if record.get("flow_id") is not None:
+                self._flows[record["flow_id"]] = task
+            tasks.add(task)
+            task.add_done_callback(lambda done, flow_id=record.get("flow_id"): self._finished(done, flow_id, tasks, slots))
+        if tasks:
+            await asyncio.gather(*tasks)
+        return self.sent
+
+    def _finished(self, task, flow_id, tasks, slots):
+        tasks.discard(task)
+        slots.release()
+        if self._flows.get(flow_id) is task:
+            del self._flows[flow_id]
+
+    async def _replay(self, record, previous):
+        if previous is not None:
+            # Wait for the flow's previous request so its ids are known; its failure is
+            # already counted there.
+            await asyncio.wait([previous])
+        url = self.ids.rewrite_url(rebase(record["url"], self.base_url))
+        body = self.ids.rewrite_body(record.get("request_body"))
+        if self.card and isinstance(body, dict) and isinstance(body.get("card"), dict):
+            body = dict(body, card=dict(body["card"], **self.card))
+        headers = {name: value for name, value in (record.get("request_headers") or {}).items() if value != REDACTED}
+        if self.headers_for is not None:
+            headers.update(self.headers_for(record))
+        self.sent += 1
+        try:
+            response = await self.send(record["method"], url, headers, body, record)
+        except Exception as exc:
+            self.errors[(record.get("operation_id") or record["method"], type(exc).__name__)] += 1
+            return
+        self.statuses[(record.get("operation_id") or record["method"], record.get("status"), response.status_code)] += 1
+        if isinstance(record.get("response_body"), (dict, list)):
+            try:
+                self.ids.learn(record["response_body"], response.json())
+            except ValueError:
+                pass
+
+    @property
+    def mismatched(self):
+        return sum(hits for (_, recorded, replayed), hits in self.statuses.items() if recorded != replayed)
@@ -0,0 +1,143 @@
+import difflib
+import random
+import time
+from email.utils import parsedate_to_datetime
+
+import requests
+
+from paysafe_client import OPERATIONS
+
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+# 1007: clearing house timeout, the simulator's (and the processor's) transient failure.
+RETRYABLE_CODES = frozenset({"1007"})
+RETRYABLE_ERRORS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout, ConnectionError, TimeoutError)
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE", "OPTIONS"})
+
+
+class RetryRule:
+    # How one operation may be retried. Without `dup_check`, a retry is only safe for
+    # idempotent methods; with it, a POST is retried with the same merchantRefNum and
+    # dupCheck set, so Paysafe rejects the retry rather than processing it twice.
+
+    def __init__(self, max_attempts=3, statuses=RETRYABLE_STATUSES, codes=RETRYABLE_CODES, dup_check=False):
+        self.max_attempts = max_attempts
+        self.statuses = frozenset(statuses)
+        self.codes = frozenset(str(code) for code in codes)
+        self.dup_check = dup_check
+
+
+class RetryBudget:
+    # Caps retries at `ratio` of first attempts, plus a `burst` allowance, so a failing
+    # dependency sees at most (1 + ratio) times the normal load instead of a retry storm.
+
+    def __init__(self, ratio=0.1, burst=10):
+        self.ratio = ratio
+        self.burst = burst
+        self.tokens = float(burst)
+        self.denied = 0
+
+    def deposit(self):
+        self.tokens = min(self.burst, self.tokens + self.ratio)
+
+    def withdraw(self):
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        self.denied += 1
+        return False
+
+
+def retry_after(response, now=None):
+    # Seconds from a Retry-After header given as delta-seconds or an HTTP date.
+    value = (getattr(response, "headers", None) or {}).get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - (now if now is not None else time.time()))
+    except (TypeError, ValueError):
+        return None
+
+
+def error_code(response):
+    try:
+        document = response.json()
+    except ValueError:
+        return None
+    code = (document.get("error") or {}).get("code") if isinstance(document, dict) else None
+    return None if code is None else str(code)
+
+
+class RetryPolicy:
+    # Per-operation retry rules with exponential backoff and jitter, a Retry-After floor
+    # and a shared retry budget. `rules` maps operation ids to RetryRule; others use
+    # `default_rule`. Rules applied to a non-idempotent method always retry with dupCheck.
+
+    def __init__(self, rules=None, default_rule=None, base_delay=0.1, max_delay=5.0, multiplier=2.0, jitter=0.5,
+                 max_retry_after=30.0, budget=None, rng=None):
+        self.rules = dict(rules or {})
+        self.default_rule = default_rule or RetryRule()
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.max_retry_after = max_retry_after
+        self.budget = budget or RetryBudget()
+        self.random = rng or random.Random()
+        self._resolved = {}
+
+    def rule_for(self, operation_id, method):
+        key = (operation_id, method)
+        rule = self._resolved.get(key)
+        if rule is None:
+            rule = self.rules.get(operation_id, self.default_rule)
+            if method not in IDEMPOTENT_METHODS and not rule.dup_check:
+                rule = RetryRule(rule.max_attempts, rule.statuses, rule.codes, dup_check=True)
+            self._resolved[key] = rule
+        return rule
+
+    def reason(self, rule, method, attempt, payload, response=None, error=None):
+        # Why this attempt's result should be retried, or None if it should not be.
+        if attempt >= rule.max_attempts:
+            return None
+        if method not in IDEMPOTENT_METHODS and not (rule.dup_check and isinstance(payload, dict) and payload.get("merchantRefNum")):
+            return None
+        if error is not None:
+            return type(error).__name__ if isinstance(error, RETRYABLE_ERRORS) else None
+        if response.status_code < 400:
+            return None
+        code = error_code(response)
+        if code is not None and code in rule.codes:
+            return f"code {code}"
+        return f"http {response.status_code}" if response.status_code in rule.statuses else None
+
+    def retry_payload(self, rule, payload):
+        if rule.dup_check and isinstance(payload, dict):
+            return dict(payload, dupCheck=True)
+        return payload
+
+    def delay(self, attempt, response=None):
+        backoff = min(self.max_delay, self.base_delay * self.multiplier ** (attempt - 1))
+        backoff *= 1.0 - self.jitter * self.random.random()
+        floor = retry_after(response) if response is not None else None
+        return max(backoff, min(floor, self.max_retry_after)) if floor is not None else backoff
+
+
+def parse_rule(text, default_rule):
+    # "process-payment=1" -> ("process-payment", RetryRule(max_attempts=1, ...)).
+    operation_id, _, attempts = text.partition("=")
+    operation_id = operation_id.strip()
+    try:
+        max_attempts = int(attempts)
+    except ValueError:
+        raise ValueError(f"Bad retry rule {text!r}; expected OPERATION=ATTEMPTS") from None
+    if operation_id not in OPERATIONS:
+        close = difflib.get_close_matches(operation_id, OPERATIONS, n=3)
+        hint = f"; did you mean {' or '.join(close)}?" if close else "; see the operation ids in paysafe_client.py"
+        raise ValueError(f"Bad retry rule {text!r}: unknown operation {operation_id!r}{hint}")
+    if max_attempts < 1:
+        raise ValueError(f"Bad retry rule {text!r}: ATTEMPTS must be at least 1")
+    return operation_id, RetryRule(max_attempts, default_rule.statuses, default_rule.codes)
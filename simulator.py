@@ -0,0 +1,331 @@
+import argparse
+import asyncio
+import json
+import os
+import secrets
+import socket
+import time
+import uuid
+from collections import OrderedDict
+from urllib.parse import parse_qs, urlsplit
+
+from expectations import Expectation, Expectations
+from transport import AsyncTransport
+from webhooks import signature_for
+
+# Local stand-in for the Paysafe Payments API endpoints main.py uses. Outcomes are
+# driven by the amount table in expect_response.json, and resource ids encode the
+# amount and creation time, so any worker process can answer a status lookup
+# without shared state.
+
+APPROVED = Expectation(0, 200, None, "Approved")
+JSON_HEADERS = "Content-Type: application/json\r\nConnection: keep-alive\r\n"
+REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 401: "Unauthorized", 402: "Payment Required",
+           404: "Not Found", 409: "Conflict", 500: "Internal Server Error"}
+
+
+def make_id(kind, amount, created_ms):
+    return f"{kind}{amount:x}-{created_ms:x}-{secrets.token_hex(6)}"
+
+
+def parse_id(resource_id):
+    try:
+        head, created, _ = resource_id.split("-", 2)
+        return head[0], int(head[1:], 16), int(created, 16)
+    except ValueError:
+        return None
+
+
+def now_ms():
+    return int(time.time() * 1000)
+
+
+def error_body(code, message):
+    return {"error": {"code": str(code), "message": message}}
+
+
+class Simulator:
+
+    # Cancelled payment ids are the only state kept; the oldest are forgotten past
+    # `max_cancelled`, long after their notifications have fired.
+
+    def __init__(self, expectations, time_scale=1.0, refund_delay=0.2, settlement_status="COMPLETED",
+                 webhook_url=None, webhook_secret=None, max_cancelled=100000):
+        self.expectations = expectations
+        self.time_scale = time_scale
+        self.refund_delay = refund_delay
+        self.settlement_status = settlement_status
+        self.webhook_url = webhook_url
+        self.webhook_secret = webhook_secret
+        self.cancelled = OrderedDict()
+        self.max_cancelled = max_cancelled
+        self.requests = 0
+        self._webhooks = AsyncTransport(max_per_host=50) if webhook_url else None
+
+    def scenario(self, amount):
+        return self.expectations.for_amount(amount) or APPROVED
+
+    def delay_for(self, amount):
+        return self.scenario(amount).delay * self.time_scale
+
+    def payment_status(self, payment_id, amount, created_ms):
+        if payment_id in self.cancelled:
+            return "CANCELLED"
+        if now_ms() - created_ms < self.delay_for(amount) * 1000:
+            return "PENDING"
+        return "COMPLETED"
+
+    def notify(self, event, document, after=0.0):
+        if self._webhooks is None:
+            return
+        asyncio.get_running_loop().call_later(after, self._fire, event, document)
+
+    def _fire(self, event, document):
+        # A payment cancelled while its completion was pending is reported as cancelled.
+        if event == "PAYMENT_COMPLETED" and document["id"] in self.cancelled:
+            event, document = "PAYMENT_CANCELLED", dict(document, status="CANCELLED")
+        body = {"id": secrets.token_hex(8), "eventName": event, "eventDate": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "resourceId": document["id"], "payload": document}
+        asyncio.ensure_future(self._post_webhook(body))
+
+    async def _post_webhook(self, body):
+        raw = json.dumps(body).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        if self.webhook_secret:
+            headers["Signature"] = signature_for(self.webhook_secret, raw)
+        try:
+            await self._webhooks.request("POST", self.webhook_url, headers=headers, json=body)
+        except Exception:
+            pass
+
+    async def handle(self, method, target, headers, body):
+        # Returns (status, document, delay_seconds).
+        self.requests += 1
+        if "authorization" not in headers:
+            return 401, error_body(5279, "The API key is missing."), 0.0
+        parts = urlsplit(target)
+        path = parts.path
+        index = path.find("/v1/")
+        segments = path[index + 4:].strip("/").split("/") if index >= 0 else []
+        try:
+            payload = json.loads(body) if body else {}
+        except ValueError:
+            return 400, error_body(5068, "Field error(s): invalid JSON body."), 0.0
+        route = (method, segments[0] if segments else "", len(segments))
+
+        if route == ("GET", "monitor", 1):
+            return 200, {"status": "READY"}, 0.0
+        if route == ("GET", "paymentmethods", 1):
+            currency = parse_qs(parts.query).get("currencyCode", ["USD"])[0]
+            return 200, {"paymentMethods": [{"paymentMethod": "CARD", "currencyCode": currency, "accountId": "1009688230",
+                                             "processorCode": "SIM", "mccDescription": "Simulator"}]}, 0.0
+        if route == ("POST", "paymenthandles", 1):
+            return 201, {"id": make_id("H", int(payload.get("amount", 0)), now_ms()), "status": "PAYABLE",
+                         "paymentHandleToken": "SC" + secrets.token_hex(7), "merchantRefNum": payload.get("merchantRefNum"),
+                         "amount": payload.get("amount"), "currencyCode": payload.get("currencyCode"), "usage": "SINGLE_USE",
+                         "timeToLiveSeconds": 899}, 0.0
+        if route == ("POST", "customers", 1):
+            return 201, {"id": str(uuid.uuid4()), "status": "ACTIVE", "merchantCustomerId": payload.get("merchantCustomerId"),
+                         "locale": payload.get("locale"), "firstName": payload.get("firstName"),
+                         "lastName": payload.get("lastName")}, 0.0
+        if route == ("POST", "customers", 3) and segments[2] == "paymenthandles":
+            card = payload.get("card") or {}
+            return 201, {"id": str(uuid.uuid4()), "merchantRefNum": payload.get("merchantRefNum"), "status": "PAYABLE",
+                         "usage": "MULTI_USE", "paymentType": "CARD", "action": "NONE",
+                         "paymentHandleToken": "CP" + secrets.token_hex(7), "customerId": segments[1],
+                         "card": {"lastDigits": str(card.get("cardNum", ""))[-4:], "cardExpiry": card.get("cardExpiry")}}, 0.0
+        if route == ("POST", "payments", 1):
+            return self.create_payment(payload)
+        if route == ("GET", "payments", 2):
+            return self.get_payment(segments[1])
+        if route == ("PUT", "payments", 2):
+            return self.cancel_payment(segments[1], payload)
+        if route == ("POST", "payments", 3) and segments[2] == "settlements":
+            return self.create_settlement(segments[1], payload)
+        if route == ("POST", "settlements", 3) and segments[2] == "refunds":
+            return self.create_refund(segments[1], payload)
+        if route == ("GET", "refunds", 2):
+            return self.get_refund(segments[1])
+        return 404, error_body(5269, f"No resource at {method} {path}"), 0.0
+
+    def create_payment(self, payload):
+        amount = int(payload.get("amount", 0))
+        scenario = self.scenario(amount)
+        delay = self.delay_for(amount)
+        if scenario.http_status >= 400:
+            return scenario.http_status, error_body(scenario.error_code, scenario.message), delay
+        created = now_ms()
+        payment_id = make_id("P", amount, created)
+        document = {"id": payment_id, "merchantRefNum": payload.get("merchantRefNum"), "amount": amount,
+                    "currencyCode": payload.get("currencyCode"), "paymentHandleToken": payload.get("paymentHandleToken"),
+                    "paymentType": "CARD", "txnTime": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                    "status": "PENDING" if delay else "COMPLETED", "availableToSettle": amount}
+        self.notify("PAYMENT_COMPLETED", dict(document, status="COMPLETED"), delay)
+        return 201, document, 0.0
+
+    def get_payment(self, payment_id):
+        parsed = parse_id(payment_id)
+        if parsed is None or parsed[0] != "P":
+            return 404, error_body(5269, f"Payment {payment_id} not found"), 0.0
+        _, amount, created = parsed
+        return 200, {"id": payment_id, "amount": amount, "status": self.payment_status(payment_id, amount, created)}, 0.0
+
+    def cancel_payment(self, payment_id, payload):
+        parsed = parse_id(payment_id)
+        if parsed is None or parsed[0] != "P":
+            return 404, error_body(5269, f"Payment {payment_id} not found"), 0.0
+        _, amount, created = parsed
+        if payload.get("status") != "CANCELLED":
+            return 400, error_body(5068, "Only status CANCELLED is supported"), 0.0
+        if self.payment_status(payment_id, amount, created) == "COMPLETED":
+            return 409, error_body(3406, "The payment has already completed and cannot be cancelled."), 0.0
+        self.cancelled[payment_id] = True
+        while len(self.cancelled) > self.max_cancelled:
+            self.cancelled.popitem(last=False)
+        return 200, {"id": payment_id, "amount": amount, "status": "CANCELLED"}, 0.0
+
+    def create_settlement(self, payment_id, payload):
+        parsed = parse_id(payment_id)
+        if parsed is None or parsed[0] != "P":
+            return 404, error_body(5269, f"Payment {payment_id} not found"), 0.0
+        if payment_id in self.cancelled:
+            return 409, error_body(3406, "The payment has been cancelled and cannot be settled."), 0.0
+        amount = int(payload.get("amount", parsed[1]))
+        settlement_id = make_id("S", amount, now_ms())
+        document = {"id": settlement_id, "merchantRefNum": payload.get("merchantRefNum"), "amount": amount,
+                    "availableToRefund": amount if self.settlement_status == "COMPLETED" else 0,
+                    "txnTime": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()), "status": self.settlement_status}
+        self.notify("SETTLEMENT_COMPLETED", dict(document, status="COMPLETED", availableToRefund=amount), self.refund_delay)
+        return 201, document, 0.0
+
+    def create_refund(self, settlement_id, payload):
+        parsed = parse_id(settlement_id)
+        if parsed is None or parsed[0] != "S":
+            return 404, error_body(5269, f"Settlement {settlement_id} not found"), 0.0
+        amount = int(payload.get("amount", parsed[1]))
+        if amount > parsed[1]:
+            return 400, error_body(3406, "The refund amount exceeds the settled amount."), 0.0
+        refund_id = make_id("R", amount, now_ms())
+        document = {"id": refund_id, "merchantRefNum": payload.get("merchantRefNum"), "amount": amount, "status": "PENDING"}
+        self.notify("REFUND_COMPLETED", dict(document, status="COMPLETED"), self.refund_delay)
+        return 201, document, 0.0
+
+    def get_refund(self, refund_id):
+        parsed = parse_id(refund_id)
+        if parsed is None or parsed[0] != "R":
+            return 404, error_body(5269, f"Refund {refund_id} not found"), 0.0
+        _, amount, created = parsed
+        status = "COMPLETED" if now_ms() - created >= self.refund_delay * 1000 else "PENDING"
+        return 200, {"id": refund_id, "amount": amount, "status": status}, 0.0
+
+
+def render(status, document):
+    body = json.dumps(document).encode("utf-8")
+    head = f"HTTP/1.1 {status} {REASONS.get(status, 'OK')}\r\n{JSON_HEADERS}Content-Length: {len(body)}\r\n\r\n"
+    return head.encode("latin-1") + body
+
+
+class SimulatorProtocol(asyncio.Protocol):
+    # Hand-rolled HTTP/1.1 keep-alive parsing; json.dumps is the only per-request work
+    # that scales with the response size.
+
+    def __init__(self, simulator):
+        self.simulator = simulator
+        self.buffer = b""
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def data_received(self, data):
+        self.buffer += data
+        while True:
+            end = self.buffer.find(b"\r\n\r\n")
+            if end < 0:
+                return
+            lines = self.buffer[:end].decode("latin-1").split("\r\n")
+            headers = {}
+            for line in lines[1:]:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+            length = int(headers.get("content-length", 0))
+            if len(self.buffer) < end + 4 + length:
+                return
+            body = self.buffer[end + 4:end + 4 + length]
+            self.buffer = self.buffer[end + 4 + length:]
+            try:
+                method, target, _ = lines[0].split(" ", 2)
+            except ValueError:
+                self.transport.close()
+                return
+            asyncio.ensure_future(self.respond(method, target, headers, body))
+
+    async def respond(self, method, target, headers, body):
+        status, document, delay = await self.simulator.handle(method, target, headers, body)
+        if delay:
+            await asyncio.sleep(delay)
+        if not self.transport.is_closing():
+            self.transport.write(render(status, document))
+
+
+def open_socket(host, port, reuse_port):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuse_port:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    sock.listen(4096)
+    sock.setblocking(False)
+    return sock
+
+
+def serve(args, reuse_port):
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    simulator = Simulator(Expectations(args.expectations), args.time_scale, args.refund_delay,
+                          args.settlement_status, args.webhook_url, args.webhook_secret)
+
+    async def main():
+        server = await asyncio.get_running_loop().create_server(
+            lambda: SimulatorProtocol(simulator), sock=open_socket(args.host, args.port, reuse_port))
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local Paysafe Payments API simulator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=1, help="Processes sharing the port via SO_REUSEPORT")
+    parser.add_argument("--expectations", default="expect_response.json", help="Amount-to-outcome table")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="Multiply simulator delays (e.g. 0.1 for 10x faster)")
+    parser.add_argument("--refund-delay", type=float, default=0.2, help="Seconds before a refund (and settlement notification) completes")
+    parser.add_argument("--settlement-status", choices=["COMPLETED", "PENDING"], default="COMPLETED")
+    parser.add_argument("--webhook-url", help="POST payment/settlement/refund notifications here, e.g. http://127.0.0.1:8099/webhooks")
+    parser.add_argument("--webhook-secret", help="Sign notifications with this HMAC key")
+    args = parser.parse_args()
+    print(f"Simulator listening on http://{args.host}:{args.port}/paymenthub with {args.workers} worker(s)")
+    if args.workers > 1:
+        # Cancellations are tracked per worker; everything else is derived from the ids.
+        children = []
+        for _ in range(args.workers):
+            pid = os.fork()
+            if pid == 0:
+                serve(args, True)
+                os._exit(0)
+            children.append(pid)
+        try:
+            for pid in children:
+                os.waitpid(pid, 0)
+        except KeyboardInterrupt:
+            pass
+    else:
+        serve(args, False)
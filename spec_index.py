@@ -0,0 +1,203 @@
+import hashlib
+import json
+import os
+import re
+import zlib
+
+SPEC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "paysafe_payments_api_spec.yaml")
+CACHE_SUFFIX = ".idx"
+CACHE_MAGIC = b"PSIDX2"
+HTTP_METHODS = ("get", "put", "post", "delete", "patch", "head", "options")
+# Schema keywords kept in the index; descriptions, examples and vendor extensions are
+# dropped so the cache stays small.
+SCHEMA_KEYWORDS = frozenset({"type", "properties", "required", "enum", "maxLength", "minLength", "maximum", "minimum",
+                             "exclusiveMaximum", "exclusiveMinimum", "pattern", "format", "items", "minItems", "maxItems",
+                             "allOf", "oneOf", "anyOf", "$ref", "readOnly", "writeOnly", "nullable", "default",
+                             "additionalProperties"})
+PARAM_PATTERN = re.compile(r"{(\w+)}")
+
+
+def compact_schema(schema):
+    if isinstance(schema, list):
+        return [compact_schema(item) for item in schema]
+    if not isinstance(schema, dict):
+        return schema
+    compacted = {}
+    for key, value in schema.items():
+        if key == "properties":
+            compacted[key] = {name: compact_schema(prop) for name, prop in value.items()}
+        elif key in SCHEMA_KEYWORDS:
+            compacted[key] = compact_schema(value)
+    return compacted
+
+
+def ref_name(schema):
+    ref = (schema or {}).get("$ref", "")
+    return ref.rsplit("/", 1)[-1] if ref.startswith("#/components/schemas/") else None
+
+
+def collect_enums(name, schema, enums):
+    if not isinstance(schema, dict):
+        return
+    if "enum" in schema:
+        enums[name] = list(schema["enum"])
+    for prop, sub in schema.get("properties", {}).items():
+        collect_enums(f"{name}.{prop}", sub, enums)
+    if isinstance(schema.get("items"), dict):
+        collect_enums(f"{name}[]", schema["items"], enums)
+    for key in ("allOf", "oneOf", "anyOf"):
+        for sub in schema.get(key, []):
+            collect_enums(name, sub, enums)
+
+
+def json_content(section):
+    content = (section or {}).get("content", {})
+    return content.get("application/json") or next(iter(content.values()), {})
+
+
+def build_index(spec):
+    operations = {}
+    for raw_path, item in spec.get("paths", {}).items():
+        path, _, query_template = raw_path.partition("?")
+        shared = item.get("parameters", [])
+        for method in HTTP_METHODS:
+            op = item.get(method)
+            if not isinstance(op, dict):
+                continue
+            operation_id = op.get("operationId") or f"{method}-{path}"
+            params = {"path": [], "query": [], "header": []}
+            for param in shared + op.get("parameters", []):
+                location = param.get("in")
+                if location in params:
+                    params[location].append({"name": param["name"], "required": bool(param.get("required")),
+                                             "schema": compact_schema(param.get("schema", {}))})
+            for name in re.findall(r"(\w+)={\w+}", query_template):
+                if name not in [p["name"] for p in params["query"]]:
+                    params["query"].append({"name": name, "required": True, "schema": {"type": "string"}})
+            body = json_content(op.get("requestBody"))
+            responses = {}
+            response_examples = {}
+            for status, response in op.get("responses", {}).items():
+                content = json_content(response)
+                if "schema" in content:
+                    responses[str(status)] = compact_schema(content["schema"])
+                response_examples[str(status)] = {key: example.get("value") for key, example in content.get("examples", {}).items()
+                                                  if isinstance(example, dict)}
+            operations[operation_id] = {
+                "operation_id": operation_id,
+                "method": method.upper(),
+                "path": path,
+                "path_params": PARAM_PATTERN.findall(path),
+                "parameters": params,
+                "summary": op.get("summary", ""),
+                "tags": list(op.get("tags", ())),
+                "request_schema": compact_schema(body["schema"]) if "schema" in body else None,
+                "request_examples": {key: example.get("value") for key, example in body.get("examples", {}).items()
+                                     if isinstance(example, dict)},
+                "response_schemas": responses,
+                "response_examples": response_examples,
+            }
+    schemas = {name: compact_schema(schema) for name, schema in spec.get("components", {}).get("schemas", {}).items()}
+    enums = {}
+    for name, schema in schemas.items():
+        collect_enums(name, schema, enums)
+    return {
+        "servers": [server["url"] for server in spec.get("servers", [])],
+        "operations": operations,
+        "schemas": schemas,
+        "enums": enums,
+    }
+
+
+def parse_spec(raw):
+    import yaml
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    return yaml.load(raw, Loader=loader)
+
+
+def load_index(spec_path=SPEC_PATH, cache_path=None):
+    # The cache is zlib-compressed JSON prefixed with the SHA-256 of the spec it was built
+    # from; a spec edit changes the hash and triggers a rebuild. Unlike a pickle, a tampered
+    # cache file can at worst produce a wrong index, never run code.
+    cache_path = cache_path or spec_path + CACHE_SUFFIX
+    with open(spec_path, "rb") as f:
+        raw = f.read()
+    digest = hashlib.sha256(raw).hexdigest().encode("ascii")
+    header = CACHE_MAGIC + digest
+    try:
+        with open(cache_path, "rb") as f:
+            cached = f.read()
+        if cached.startswith(header):
+            return SpecIndex(json.loads(zlib.decompress(cached[len(header):])))
+    except (OSError, zlib.error, ValueError):
+        pass
+    data = build_index(parse_spec(raw))
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            # YAML timestamps in examples have no JSON form; they are kept as their text.
+            f.write(header + zlib.compress(json.dumps(data, separators=(",", ":"), default=str).encode("utf-8"), 6))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # Read-only checkout: keep working from the freshly built index.
+        pass
+    return SpecIndex(data)
+
+
+class SpecIndex:
+
+    def __init__(self, data):
+        self.servers = data["servers"]
+        self.operations = data["operations"]
+        self.routes = {(op["method"], op["path"]): operation_id for operation_id, op in self.operations.items()}
+        self.schemas = data["schemas"]
+        self.enums = {name: tuple(values) for name, values in data["enums"].items()}
+
+    def operation(self, method, path):
+        operation_id = self.routes.get((method.upper(), path))
+        return self.operations.get(operation_id) if operation_id else None
+
+    def request_schema(self, method, path):
+        op = self.operation(method, path)
+        return op["request_schema"] if op else None
+
+    def response_schema(self, method, path, status):
+        op = self.operation(method, path)
+        return op["response_schemas"].get(str(status)) if op else None
+
+    def schema(self, name):
+        return self.schemas.get(name)
+
+    def resolve(self, schema):
+        # Follows a chain of $refs to the referenced component schema.
+        seen = set()
+        while isinstance(schema, dict) and "$ref" in schema:
+            name = ref_name(schema)
+            if name is None or name in seen:
+                break
+            seen.add(name)
+            schema = self.schemas.get(name, {})
+        return schema
+
+    def enum(self, name):
+        return self.enums.get(name)
+
+
+_default = None
+
+
+def default_index():
+    global _default
+    if _default is None:
+        _default = load_index()
+    return _default
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+    path = sys.argv[1] if len(sys.argv) > 1 else SPEC_PATH
+    started = time.perf_counter()
+    index = load_index(path)
+    print(f"{len(index.operations)} operations, {len(index.schemas)} schemas, {len(index.enums)} enums "
+          f"loaded in {(time.perf_counter() - started) * 1000:.1f} ms")
@@ -0,0 +1,67 @@
+import os
+import sys
+import unittest
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from accounts import AccountPicker, parse_accounts  # noqa: E402
+
+ENV = {
+    "public_key": "pub1", "private_key": "priv1", "account_id_cards_usd": "1001",
+    "public_key_2": "pub2", "private_key_2": "priv2", "account_id_cards_usd_2": "2001", "weight_2": "3",
+    "account_name_2": "backup", "base_url": "https://example.com",
+}
+
+
+class ParseAccountsTest(unittest.TestCase):
+
+    def test_plain_and_suffixed_sets(self):
+        first, second = parse_accounts(ENV)
+        self.assertEqual((first.name, first.weight), ("account 1", 1.0))
+        self.assertEqual(first.env, {"public_key": "pub1", "private_key": "priv1", "account_id_cards_usd": "1001"})
+        self.assertEqual((second.name, second.weight, second.env["private_key"]), ("backup", 3.0, "priv2"))
+        self.assertEqual(second.account_id("USD"), "2001")
+        self.assertIsNone(second.account_id("GBP"))
+
+    def test_incomplete_set_is_rejected(self):
+        with self.assertRaisesRegex(ValueError, "private_key_3"):
+            parse_accounts(dict(ENV, public_key_3="pub3"))
+        with self.assertRaises(ValueError):
+            parse_accounts(dict(ENV, weight_2="0"))
+        with self.assertRaises(ValueError):
+            parse_accounts({"base_url": "https://example.com"})
+
+
+class AccountPickerTest(unittest.TestCase):
+
+    def names(self, picker, flows):
+        picked = [picker.acquire() for _ in range(flows)]
+        for account in picked:
+            picker.release(account)
+        return [account.name for account in picked]
+
+    def test_round_robin(self):
+        picker = AccountPicker(parse_accounts(ENV))
+        self.assertEqual(self.names(picker, 4), ["account 1", "backup", "account 1", "backup"])
+
+    def test_weighted_interleaves_by_weight(self):
+        picker = AccountPicker(parse_accounts(ENV), "weighted")
+        names = self.names(picker, 8)
+        self.assertEqual(Counter(names), {"backup": 6, "account 1": 2})
+        self.assertNotEqual(names[:3], ["backup"] * 3)
+
+    def test_least_in_flight_avoids_busy_accounts(self):
+        picker = AccountPicker(parse_accounts(dict(ENV, weight_2="1")), "least-in-flight")
+        busy = picker.acquire()
+        self.assertEqual(busy.name, "account 1")
+        self.assertEqual([picker.acquire().name for _ in range(2)], ["backup", "account 1"])
+        self.assertEqual((busy.in_flight, busy.assigned), (2, 2))
+
+    def test_unknown_strategy(self):
+        with self.assertRaises(ValueError):
+            AccountPicker(parse_accounts(ENV), "random")
+
+
+if __name__ == "__main__":
+    unittest.main()
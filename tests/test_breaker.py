@@ -0,0 +1,89 @@
+import os
+import sys
+import unittest
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreakers, CircuitOpenError, is_failure  # noqa: E402
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeResponse:
+
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+class CircuitBreakerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breakers = CircuitBreakers(clock=self.clock, failure_threshold=0.5, window=4, min_calls=4, open_for=5.0)
+        self.breaker = self.breakers.get("process-payment")
+
+    def call(self, failed):
+        trial = self.breaker.before_call()
+        self.breaker.after_call(failed, trial)
+
+    def test_opens_on_failure_share_and_fails_fast(self):
+        for failed in (False, True, False):
+            self.call(failed)
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.call(True)
+        self.assertEqual(self.breaker.state, OPEN)
+        with self.assertRaises(CircuitOpenError) as raised:
+            self.breaker.before_call()
+        self.assertAlmostEqual(raised.exception.retry_in, 5.0)
+        self.assertEqual(self.breaker.counts["rejected"], 1)
+
+    def test_half_open_trial_closes_or_reopens(self):
+        for _ in range(4):
+            self.call(True)
+        self.clock.now += 5.0
+        self.assertTrue(self.breaker.before_call())
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+        self.breaker.after_call(True, trial=True)
+        self.assertEqual(self.breaker.state, OPEN)
+        self.clock.now += 5.0
+        self.call(False)
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.assertEqual([t[2:4] for t in self.breakers.transitions],
+                         [(CLOSED, OPEN), (OPEN, HALF_OPEN), (HALF_OPEN, OPEN), (OPEN, HALF_OPEN), (HALF_OPEN, CLOSED)])
+        self.assertEqual(self.breakers.transitions[1][0], 5.0)
+
+    def test_late_results_do_not_change_state(self):
+        admitted = [self.breaker.before_call() for _ in range(6)]
+        for trial in admitted[:4]:
+            self.breaker.after_call(True, trial)
+        self.assertEqual(self.breaker.state, OPEN)
+        self.breaker.after_call(True, admitted[4])
+        self.clock.now += 5.0
+        self.assertTrue(self.breaker.before_call())
+        self.breaker.after_call(False, admitted[5])
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        self.breaker.abandon_call(trial=True)
+        self.assertTrue(self.breaker.before_call())
+        self.assertEqual(len(self.breakers.transitions), 2)
+
+    def test_only_server_failures_count(self):
+        self.assertTrue(is_failure(FakeResponse(503)))
+        self.assertTrue(is_failure(FakeResponse(429)))
+        self.assertFalse(is_failure(FakeResponse(402)))
+        self.assertTrue(is_failure(error=requests.exceptions.Timeout()))
+        self.assertFalse(is_failure(error=ValueError()))
+
+
+if __name__ == "__main__":
+    unittest.main()
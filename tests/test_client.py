@@ -0,0 +1,48 @@
+import asyncio
+import hashlib
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import generate_client  # noqa: E402
+import paysafe_client  # noqa: E402
+from spec_index import SPEC_PATH, default_index  # noqa: E402
+
+
+async def echo(operation, url, headers, body, **options):
+    return operation, url, headers, body, options
+
+
+class GeneratedClientTest(unittest.TestCase):
+
+    def test_generated_module_is_current(self):
+        with open(SPEC_PATH, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        with open(generate_client.OUTPUT_PATH) as f:
+            self.assertEqual(f.read(), generate_client.render(default_index(), digest),
+                             "paysafe_client.py is stale; run python generate_client.py")
+
+    def test_covers_every_operation(self):
+        self.assertEqual(set(paysafe_client.OPERATIONS), set(default_index().operations))
+
+    def test_builds_urls_and_headers(self):
+        client = paysafe_client.PaysafeClient("http://127.0.0.1:8080/paymenthub/v1/", echo)
+        operation, url, headers, body, options = asyncio.run(
+            client.process_settlement("p/1", {"amount": 5}, simulator="INTERNAL", headers={"Authorization": "Basic x"}, step="settlement"))
+        self.assertEqual((operation.method, url), ("POST", "http://127.0.0.1:8080/paymenthub/v1/payments/p%2F1/settlements"))
+        self.assertEqual(headers, {"Accept": "application/json", "Content-Type": "application/json",
+                                   "Simulator": "INTERNAL", "Authorization": "Basic x"})
+        self.assertEqual((body, options), ({"amount": 5}, {"step": "settlement"}))
+
+    def test_encodes_query_parameters(self):
+        client = paysafe_client.PaysafeClient(send=echo)
+        _, url, headers, body, _ = asyncio.run(client.look_up_payment_methods(currency_code="USD"))
+        self.assertEqual(url, "https://api.test.paysafe.com/paymenthub/v1/paymentmethods?currencyCode=USD")
+        self.assertNotIn("Content-Type", headers)
+        self.assertIsNone(body)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from customers import CustomerStore, store_key  # noqa: E402
+
+
+class CustomerStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "customers.json")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_missing_file_starts_empty(self):
+        store = CustomerStore(self.path)
+        key = store_key("https://api.test.paysafe.com/paymenthub", "1009688230", "USD")
+        self.assertEqual(key, "api.test.paysafe.com/1009688230/USD")
+        self.assertEqual(store.missing(key, 3), 3)
+        self.assertIsNone(store.next_token(key))
+
+    def test_saved_customers_are_reused(self):
+        store = CustomerStore(self.path)
+        store.add("1/USD", "c1", "h1", "CP1")
+        store.add("1/USD", "c2", "h2", "CP2")
+        store.save()
+        reloaded = CustomerStore(self.path)
+        self.assertEqual(reloaded.missing("1/USD", 3), 1)
+        self.assertEqual(reloaded.missing("1/USD", 1), 0)
+        self.assertEqual([reloaded.next_token("1/USD") for _ in range(3)], ["CP1", "CP2", "CP1"])
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+
+    def test_base_urls_do_not_share_customers(self):
+        store = CustomerStore(self.path)
+        sandbox = store_key("https://api.test.paysafe.com/paymenthub", "1", "USD")
+        simulator = store_key("http://127.0.0.1:8080/paymenthub", "1", "USD")
+        store.add(simulator, "c1", "h1", "CP1")
+        store.save()
+        reloaded = CustomerStore(self.path)
+        self.assertEqual(reloaded.missing(sandbox, 1), 1)
+        self.assertIsNone(reloaded.next_token(sandbox))
+        self.assertEqual(reloaded.next_token(simulator), "CP1")
+        self.assertNotEqual(simulator, store_key("http://127.0.0.1:9090/paymenthub", "1", "USD"))
+
+
+if __name__ == "__main__":
+    unittest.main()
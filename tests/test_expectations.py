@@ -0,0 +1,54 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from expectations import Expectations  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class ExpectationsTest(unittest.TestCase):
+
+    def test_indexes_repo_table(self):
+        expectations = Expectations(os.path.join(ROOT, "expect_response.json"))
+        self.assertEqual(expectations.for_amount(5).error_code, "3009")
+        self.assertEqual(expectations.for_error_code(3009).amount, 5)
+        self.assertEqual(expectations.for_amount(91).delay, 10.0)
+        self.assertEqual(expectations.expected_outcome(5), "declined 3009")
+        self.assertEqual(expectations.expected_outcome(100), "approved")
+        self.assertIsNone(expectations.expected_outcome(123456))
+        self.assertIn(5, [entry.amount for entry in expectations.for_http_status(402)])
+
+    def test_reloads_when_mtime_changes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "expect.json")
+            with open(path, "w") as f:
+                json.dump([{"amount": 1, "http_status": 200, "error_code": None, "response": "Approved"}], f)
+            expectations = Expectations(path, check_interval=0)
+            self.assertEqual(expectations.expected_outcome(1), "approved")
+            with open(path, "w") as f:
+                json.dump([{"amount": 1, "http_status": 402, "error_code": 3009, "response": "Declined"}], f)
+            os.utime(path, (os.stat(path).st_atime, os.stat(path).st_mtime + 5))
+            self.assertEqual(expectations.expected_outcome(1), "declined 3009")
+
+    def test_entries_without_amount_index_by_code(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "expect.json")
+            with open(path, "w") as f:
+                json.dump([{"error_code": "3022", "response": "Insufficient funds"}], f)
+            expectations = Expectations(path)
+            self.assertEqual(expectations.for_error_code("3022").message, "Insufficient funds")
+            self.assertEqual(expectations.by_amount, {})
+
+    def test_missing_file_is_empty(self):
+        expectations = Expectations("/nonexistent/expect.json")
+        self.assertFalse(expectations.loaded)
+        self.assertIsNone(expectations.for_amount(5))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+import asyncio
+import os
+import sys
+import threading
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+from main import FlowContext  # noqa: E402
+
+
+class FakeResponse:
+    ok = True
+    text = ""
+
+    def json(self):
+        return {"status": "CANCELLED"}
+
+
+class FakeApi:
+
+    def __init__(self):
+        self.cancelled = []
+
+    async def cancel_payments(self, payment_id, payload, **kwargs):
+        self.cancelled.append(payment_id)
+        return FakeResponse()
+
+
+def wait_in_thread(target):
+    # Runs `target` on its own thread and loop, as the threadsafe cancel helper does.
+    result = {}
+    started = threading.Event()
+
+    def run():
+        started.set()
+        try:
+            result["value"] = target()
+        except Exception as exc:  # surfaced by the assertions below
+            result["error"] = exc
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    started.wait()
+    return thread, result
+
+
+class FlowContextTest(unittest.TestCase):
+
+    def setUp(self):
+        patcher = mock.patch.object(main.console, "quiet", True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_known_payment_id_returns_at_once(self):
+        ctx = FlowContext()
+        ctx.set_payment_id("pay-1")
+        self.assertEqual(asyncio.run(ctx.wait_for_payment_id()), "pay-1")
+
+    def test_waiter_on_same_loop_is_woken(self):
+        async def run():
+            ctx = FlowContext()
+            waiter = asyncio.ensure_future(ctx.wait_for_payment_id())
+            await asyncio.sleep(0)
+            ctx.set_payment_id("pay-2")
+            return await asyncio.wait_for(waiter, 1)
+        self.assertEqual(asyncio.run(run()), "pay-2")
+
+    def test_waiter_on_another_thread_is_woken(self):
+        ctx = FlowContext()
+        registered = threading.Event()
+
+        async def wait():
+            waiter = asyncio.ensure_future(ctx.wait_for_payment_id())
+            await asyncio.sleep(0)
+            registered.set()
+            return await asyncio.wait_for(waiter, 5)
+
+        thread, result = wait_in_thread(lambda: asyncio.run(wait()))
+        self.assertTrue(registered.wait(5))
+
+        async def pay():
+            ctx.set_payment_id("pay-3")
+        asyncio.run(pay())
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(result, {"value": "pay-3"})
+
+    def test_waiters_on_several_loops_are_all_woken(self):
+        ctx = FlowContext()
+        threads = [wait_in_thread(lambda: asyncio.run(asyncio.wait_for(ctx.wait_for_payment_id(), 5)))
+                   for _ in range(3)]
+        while len(ctx._payment_waiters) < 3:
+            threading.Event().wait(0.01)
+        ctx.set_payment_id("pay-4")
+        for thread, result in threads:
+            thread.join(5)
+            self.assertEqual(result, {"value": "pay-4"})
+
+    def test_threadsafe_cancel_waits_for_payment_from_another_loop(self):
+        fake = FakeApi()
+        ctx = FlowContext()
+        with mock.patch.object(main, "api", fake):
+            thread, result = wait_in_thread(lambda: main.cancel_payment_if_needed_threadsafe(ctx, "key"))
+            while not ctx._payment_waiters:
+                threading.Event().wait(0.01)
+            self.assertEqual(fake.cancelled, [])
+            ctx.set_payment_id("pay-5")
+            thread.join(5)
+        self.assertFalse(thread.is_alive())
+        self.assertNotIn("error", result)
+        self.assertEqual(fake.cancelled, ["pay-5"])
+
+    def test_payment_set_while_cancel_thread_starts_is_not_lost(self):
+        # Either the cancel sees the id up front or its waiter is registered before it is set.
+        for attempt in range(50):
+            fake = FakeApi()
+            ctx = FlowContext()
+            with mock.patch.object(main, "api", fake):
+                thread, result = wait_in_thread(lambda: main.cancel_payment_if_needed_threadsafe(ctx, "key"))
+                ctx.set_payment_id(f"pay-{attempt}")
+                thread.join(5)
+            self.assertFalse(thread.is_alive())
+            self.assertEqual(fake.cancelled, [f"pay-{attempt}"])
+
+    def test_closed_waiting_loop_does_not_break_set(self):
+        ctx = FlowContext()
+
+        async def give_up():
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(ctx.wait_for_payment_id(), 0.01)
+        asyncio.run(give_up())
+        ctx.set_payment_id("pay-6")
+        self.assertEqual(ctx.payment_id, "pay-6")
+
+
+if __name__ == "__main__":
+    unittest.main()
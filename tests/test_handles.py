@@ -0,0 +1,103 @@
+import asyncio
+import itertools
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from handles import HandlePool  # noqa: E402
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def minter(ttl=899, fail=False):
+    serial = itertools.count()
+
+    async def mint():
+        await asyncio.sleep(0)
+        if fail:
+            raise ConnectionError("down")
+        return {"paymentHandleToken": f"SC{next(serial)}", "timeToLiveSeconds": ttl}
+    return mint
+
+
+class HandlePoolTest(unittest.TestCase):
+
+    def test_fill_then_take_in_order(self):
+        pool = HandlePool(size=3)
+        pool.register(("a", "USD", 1), minter())
+        asyncio.run(pool.fill())
+        self.assertEqual([pool.take(("a", "USD", 1)) for _ in range(4)], ["SC0", "SC1", "SC2", None])
+        self.assertEqual((pool.counts["minted"], pool.counts["taken"], pool.counts["missed"]), (3, 3, 1))
+
+    def test_unregistered_key_is_not_a_miss(self):
+        pool = HandlePool(size=3)
+        self.assertIsNone(pool.take(("a", "GBP", 1)))
+        self.assertEqual(pool.counts["missed"], 0)
+
+    def test_handles_near_expiry_are_evicted(self):
+        clock = FakeClock()
+        pool = HandlePool(size=2, ttl_margin=60, clock=clock)
+        pool.register("k", minter(ttl=300))
+        asyncio.run(pool.fill())
+        clock.now = 240.0
+        self.assertIsNone(pool.take("k"))
+        self.assertEqual(pool.counts["expired"], 2)
+
+    def test_producer_refills_what_flows_take(self):
+        async def run():
+            pool = HandlePool(size=2, sweep_interval=10)
+            pool.register("k", minter())
+            producer = asyncio.ensure_future(pool.run())
+            for _ in range(5):
+                await asyncio.sleep(0.01)
+            taken = [pool.take("k"), pool.take("k")]
+            for _ in range(5):
+                await asyncio.sleep(0.01)
+            producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+            return pool, taken
+        pool, taken = asyncio.run(run())
+        self.assertEqual(taken, ["SC0", "SC1"])
+        self.assertEqual((len(pool.ready["k"]), pool.counts["minted"]), (2, 4))
+
+    def test_failed_mints_back_off(self):
+        async def run():
+            pool = HandlePool(size=2, failure_backoff=60)
+            pool.register("k", minter(fail=True))
+            producer = asyncio.ensure_future(pool.run())
+            for _ in range(5):
+                await asyncio.sleep(0.01)
+            producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+            return pool
+        pool = asyncio.run(run())
+        self.assertEqual(pool.counts["failed"], 2)
+        self.assertEqual(pool.pending["k"], 0)
+
+    def test_cancel_sticks_when_a_wakeup_lands_in_the_same_tick(self):
+        async def run():
+            pool = HandlePool(size=1, sweep_interval=10)
+            pool.register("k", minter())
+            producer = asyncio.ensure_future(pool.run())
+            for _ in range(5):
+                await asyncio.sleep(0.01)
+            # A flow takes a handle (waking the producer) just as the run ends and cancels it.
+            pool.take("k")
+            await asyncio.sleep(0)
+            producer.cancel()
+            await asyncio.wait_for(asyncio.gather(producer, return_exceptions=True), 1)
+            return producer
+        self.assertTrue(asyncio.run(run()).cancelled())
+
+
+if __name__ == "__main__":
+    unittest.main()
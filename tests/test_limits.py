@@ -0,0 +1,141 @@
+import asyncio
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import base64  # noqa: E402
+
+from limits import AIMDLimiter, RateLimiters, TokenBucket, key_label  # noqa: E402
+
+
+class AIMDLimiterTest(unittest.TestCase):
+
+    def cycle(self, limiter, step, latency, overloaded=False):
+        limiter._take()
+        limiter.release(step, latency, overloaded)
+
+    def test_additive_increase_while_latency_is_stable(self):
+        limiter = AIMDLimiter(initial=4, max_limit=100)
+        for _ in range(4):
+            self.cycle(limiter, "payments", 0.010)
+        self.assertAlmostEqual(limiter.limit, 5.0, delta=0.1)
+
+    def test_multiplicative_decrease_once_per_round(self):
+        limiter = AIMDLimiter(initial=8, max_limit=100)
+        for _ in range(8):
+            self.cycle(limiter, "payments", 0.010)
+        high = limiter.limit
+        # Only the first of a round of overloaded responses (the new, halved limit) cuts.
+        for _ in range(int(high / 2)):
+            self.cycle(limiter, "payments", 0.010, overloaded=True)
+        self.assertAlmostEqual(limiter.limit, high / 2)
+        self.assertEqual(limiter.changes["decrease (overload)"], 1)
+        for _ in range(2):
+            self.cycle(limiter, "payments", 0.010, overloaded=True)
+        self.assertAlmostEqual(limiter.limit, high / 4)
+
+    def test_backs_off_when_smoothed_latency_rises(self):
+        limiter = AIMDLimiter(initial=4, max_limit=100, smoothing=0.5)
+        for _ in range(10):
+            self.cycle(limiter, "payments", 0.010)
+            self.cycle(limiter, "payment_status", 0.001)
+        before = limiter.limit
+        for _ in range(10):
+            self.cycle(limiter, "payments", 0.050)
+        self.assertLess(limiter.limit, before)
+        self.assertGreater(limiter.changes["decrease (latency)"], 0)
+        self.assertAlmostEqual(limiter.baselines["payment_status"], 0.001)
+
+    def test_noisy_but_stationary_latency_keeps_the_limit(self):
+        # A running minimum of the smoothed latency ends up in the noise's low tail, so
+        # ordinary jitter would read as a slowdown and ratchet the limit down.
+        rng = random.Random(7)
+        limiter = AIMDLimiter(initial=20, max_limit=100)
+        for _ in range(20000):
+            self.cycle(limiter, "payments", rng.expovariate(1 / 0.020))
+        self.assertGreater(limiter.limit, 50)
+        self.assertLess(limiter.changes["decrease (latency)"], 20)
+        self.assertAlmostEqual(limiter.baselines["payments"], 0.020, delta=0.005)
+
+    def test_waiters_get_slots_in_order(self):
+        async def run():
+            limiter = AIMDLimiter(initial=2, max_limit=2)
+            order = []
+
+            async def request(name):
+                await limiter.acquire()
+                order.append(name)
+                await asyncio.sleep(0.01)
+                limiter.release("s", 0.01)
+            cancelled = asyncio.ensure_future(asyncio.sleep(0))
+            tasks = [asyncio.ensure_future(request(n)) for n in range(5)]
+            await asyncio.sleep(0)
+            self.assertEqual((limiter.in_flight, len(limiter._waiters)), (2, 3))
+            tasks[3].cancel()
+            await asyncio.gather(*tasks, cancelled, return_exceptions=True)
+            return order, limiter
+        order, limiter = asyncio.run(run())
+        self.assertEqual(order, [0, 1, 2, 4])
+        self.assertEqual((limiter.in_flight, limiter.peak_in_flight), (0, 2))
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TokenBucketTest(unittest.TestCase):
+
+    def test_burst_then_evenly_spaced_reservations(self):
+        clock = FakeClock()
+        bucket = TokenBucket(10, burst=3, clock=clock)
+        waits = [bucket.reserve() for _ in range(5)]
+        self.assertEqual(waits[:3], [0.0, 0.0, 0.0])
+        self.assertAlmostEqual(waits[3], 0.1)
+        self.assertAlmostEqual(waits[4], 0.2)
+        self.assertEqual((bucket.granted, bucket.delayed), (5, 2))
+        self.assertAlmostEqual(bucket.max_wait, 0.2)
+
+    def test_refills_up_to_burst_only(self):
+        clock = FakeClock()
+        bucket = TokenBucket(10, burst=2, clock=clock)
+        bucket.reserve()
+        bucket.reserve()
+        clock.now = 60.0
+        self.assertEqual([bucket.reserve() for _ in range(2)], [0.0, 0.0])
+        self.assertAlmostEqual(bucket.reserve(), 0.1)
+
+    def test_cancelled_waiter_returns_its_token(self):
+        async def run():
+            bucket = TokenBucket(100, burst=1)
+            await bucket.acquire()
+            waiting = asyncio.ensure_future(bucket.acquire())
+            await asyncio.sleep(0)
+            waiting.cancel()
+            await asyncio.gather(waiting, return_exceptions=True)
+            return bucket
+        bucket = asyncio.run(run())
+        self.assertEqual(bucket.granted, 1)
+        self.assertGreater(bucket.tokens, -0.5)
+
+    def test_one_bucket_per_key(self):
+        limiters = RateLimiters(5)
+        self.assertIs(limiters.get("Basic a"), limiters.get("Basic a"))
+        self.assertIsNot(limiters.get("Basic a"), limiters.get("Basic b"))
+        self.assertEqual(limiters.get("Basic a").burst, 5.0)
+
+    def test_key_label_hides_the_password(self):
+        token = base64.b64encode(b"pmle-123:B-qa2-0-secret").decode()
+        self.assertEqual(key_label(f"Basic {token}"), "pmle-123")
+        self.assertTrue(key_label("Basic not-base64!").startswith("key "))
+
+
+if __name__ == "__main__":
+    unittest.main()
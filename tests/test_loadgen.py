@@ -0,0 +1,62 @@
+import asyncio
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from loadgen import arrival_offsets, parse_schedule, run_closed_loop, run_open_loop  # noqa: E402
+
+
+class ArrivalTest(unittest.TestCase):
+
+    def test_constant_and_poisson_rates(self):
+        constant = list(arrival_offsets(schedule=[(1.0, 4.0)]))
+        self.assertEqual(constant, [0.0, 0.25, 0.5, 0.75])
+        poisson = list(arrival_offsets(schedule=[(100.0, 50.0)], poisson=True, rng=random.Random(1)))
+        self.assertAlmostEqual(len(poisson) / 100.0, 50.0, delta=2.0)
+        self.assertEqual(poisson, sorted(poisson))
+
+    def test_schedule_steps(self):
+        schedule = parse_schedule("1:2, 1:0, 0.5:4")
+        self.assertEqual(schedule, [(1.0, 2.0), (1.0, 0.0), (0.5, 4.0)])
+        self.assertEqual(list(arrival_offsets(schedule=schedule)), [0.0, 0.5, 2.0, 2.25])
+        with self.assertRaises(ValueError):
+            parse_schedule("10")
+
+    def test_open_loop_does_not_wait_for_completions(self):
+        release = None
+
+        async def run():
+            nonlocal release
+            release = asyncio.Event()
+            intended = []
+
+            async def flow(due):
+                intended.append(due)
+                await release.wait()
+            runner = asyncio.ensure_future(run_open_loop(flow, arrival_offsets(rate=200.0), count=10, max_outstanding=6))
+            await asyncio.sleep(0.1)
+            release.set()
+            return await runner, intended
+        stats, intended = asyncio.run(run())
+        self.assertEqual((stats.scheduled, stats.started, stats.dropped, stats.peak_backlog), (10, 6, 4, 6))
+        self.assertEqual(len(intended), 6)
+        self.assertAlmostEqual(intended[5] - intended[0], 0.025, delta=1e-6)
+
+    def test_closed_loop_bounds_concurrency(self):
+        in_flight = peak = 0
+
+        async def flow():
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+        self.assertEqual(asyncio.run(run_closed_loop(flow, count=20, concurrency=4)), 20)
+        self.assertEqual(peak, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
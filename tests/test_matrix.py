@@ -0,0 +1,57 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from expectations import Expectations  # noqa: E402
+from matrix import ScenarioResult, build_scenarios, write_json, write_junit  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class MatrixTest(unittest.TestCase):
+
+    def setUp(self):
+        self.scenarios = {s.name: s for s in build_scenarios(Expectations(os.path.join(ROOT, "expect_response.json")), ["USD", "GBP"])}
+
+    def test_options_apply_where_meaningful(self):
+        self.assertIn("1 USD refund", self.scenarios)
+        self.assertNotIn("1 USD cancel", self.scenarios)
+        self.assertNotIn("5 GBP refund", self.scenarios)
+        self.assertEqual(self.scenarios["91 GBP cancel"].expected_outcome, "cancelled")
+        self.assertEqual(self.scenarios["96 USD cancel"].expected_outcome, "declined 1007")
+        self.assertEqual(self.scenarios["6 USD plain"].expected_status, 500)
+        self.assertIsNone(self.scenarios["100 USD plain"].expected_status)
+
+    def test_checks_outcome_and_status(self):
+        decline = self.scenarios["5 USD plain"]
+        self.assertTrue(ScenarioResult(decline, "declined 3009", 402).passed)
+        wrong_status = ScenarioResult(decline, "declined 3009", 500)
+        self.assertFalse(wrong_status.passed)
+        self.assertEqual(wrong_status.failure, "expected declined 3009 (HTTP 402), got declined 3009 (HTTP 500)")
+        self.assertTrue(ScenarioResult(self.scenarios["1 USD refund"], "approved").passed)
+        self.assertFalse(ScenarioResult(self.scenarios["90 USD plain"], "timeout").passed)
+
+    def test_writes_junit_and_json(self):
+        results = [ScenarioResult(self.scenarios["1 USD plain"], "approved", elapsed=0.5),
+                   ScenarioResult(self.scenarios["5 USD plain"], "approved", elapsed=0.25)]
+        with tempfile.TemporaryDirectory() as tmp:
+            junit, report = os.path.join(tmp, "matrix.xml"), os.path.join(tmp, "matrix.json")
+            write_junit(results, junit)
+            write_json(results, report)
+            suite = ET.parse(junit).getroot()
+            with open(report) as f:
+                data = json.load(f)
+        self.assertEqual((suite.get("tests"), suite.get("failures")), ("2", "1"))
+        self.assertEqual(suite.find("testcase[@name='5 USD plain']/failure").get("message"),
+                         "expected declined 3009 (HTTP 402), got approved")
+        self.assertEqual((data["passed"], data["failed"]), (1, 1))
+        self.assertEqual(data["scenarios"][1]["expected_status"], 402)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import json
+import math
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from metrics import Histogram, RunStats, corrected_latency  # noqa: E402
+
+
+def exact_percentile(values, q):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100.0 * len(ordered)) - 1)]
+
+
+class HistogramTest(unittest.TestCase):
+
+    def test_percentiles_within_relative_error(self):
+        rng = random.Random(7)
+        values = [rng.lognormvariate(-4, 1.2) for _ in range(20000)]
+        histogram = Histogram()
+        for value in values:
+            histogram.record(value)
+        for q in (50, 90, 99, 99.9):
+            self.assertAlmostEqual(histogram.percentile(q), exact_percentile(values, q), delta=exact_percentile(values, q) * 0.011)
+        self.assertEqual(histogram.max, max(values))
+
+    def test_merge_matches_single_histogram(self):
+        rng = random.Random(3)
+        values = [rng.expovariate(50) for _ in range(5000)]
+        whole, left, right = Histogram(), Histogram(), Histogram()
+        for index, value in enumerate(values):
+            whole.record(value)
+            (left if index % 2 else right).record(value)
+        merged = left.merge(right)
+        self.assertEqual(merged.buckets, whole.buckets)
+        self.assertEqual(merged.summary()["p99.9"], whole.summary()["p99.9"])
+
+    def test_rejects_mismatched_layouts(self):
+        with self.assertRaises(ValueError):
+            Histogram().merge(Histogram(significant_digits=3))
+
+
+class RunStatsTest(unittest.TestCase):
+
+    def test_round_trip_and_merge(self):
+        first, second = RunStats(), RunStats()
+        first.record_request("payments", 0.02)
+        first.record_flow("approved", 0.1, {"payments": [0.02]})
+        second.record_request("payments", 0.04)
+        second.record_flow("declined 3009", 0.05, {"payments": [0.04]})
+        second.record_error("cancel", TimeoutError())
+        restored = RunStats.from_dict(json.loads(json.dumps(second.to_dict())))
+        merged = first.merge(restored)
+        self.assertEqual((merged.requests, merged.flows), (2, 2))
+        self.assertEqual(merged.step_summary()["payments"]["count"], 2)
+        self.assertEqual(set(merged.outcome_summary()), {"approved", "declined 3009"})
+        self.assertEqual(merged.outcome_step_summary("declined 3009")["payments"]["count"], 1)
+        self.assertEqual(merged.errors[("cancel", "TimeoutError")], 1)
+
+    def test_corrected_latency_kept_beside_raw(self):
+        stats = RunStats()
+        stats.record_request("payments", 0.02, 0.5)
+        stats.record_request("payments", 0.03)
+        data = json.loads(json.dumps(stats.to_dict()))
+        self.assertEqual(RunStats.from_dict(data).corrected_step_summary()["payments"]["max"], 0.5)
+        self.assertEqual(stats.step_summary()["payments"]["max"], 0.03)
+        del data["corrected_step_latency"]
+        self.assertEqual(RunStats.from_dict(data).corrected_step_summary(), {})
+
+    def test_rate_limit_wait_kept_apart_from_latency(self):
+        stats = RunStats()
+        stats.record_request("payments", 0.02)
+        stats.record_rate_limit_wait("payments", 0.3)
+        restored = RunStats.from_dict(json.loads(json.dumps(stats.to_dict())))
+        merged = RunStats().merge(restored).merge(stats)
+        self.assertEqual(merged.rate_limit_wait_summary()["payments"]["count"], 2)
+        self.assertEqual(merged.step_summary()["payments"]["max"], 0.02)
+
+    def test_per_account_breakdown(self):
+        stats = RunStats()
+        stats.record_request("payments", 0.02, account="backup")
+        stats.record_request("payments", 0.02)
+        stats.record_flow("approved", 0.1, account="backup")
+        stats.record_flow("http 429", 0.2, account="account 1")
+        merged = RunStats.from_dict(json.loads(json.dumps(stats.to_dict()))).merge(stats)
+        self.assertEqual(merged.account_requests, {"backup": 2})
+        self.assertEqual(merged.account_outcomes["account 1"], {"http 429": 2})
+        self.assertEqual(merged.account_summary()["backup"]["count"], 2)
+
+    def test_background_requests_kept_out_of_totals(self):
+        stats = RunStats()
+        stats.record_request("payments", 0.02, account="backup")
+        stats.record_request("paymenthandle_pool", 0.05, account="backup", background=True)
+        merged = RunStats.from_dict(json.loads(json.dumps(stats.to_dict()))).merge(stats)
+        self.assertEqual(merged.requests, 2)
+        self.assertEqual(merged.background_requests, {"paymenthandle_pool": 2})
+        self.assertEqual(merged.account_requests, {"backup": 2})
+        self.assertEqual(merged.step_summary()["paymenthandle_pool"]["count"], 2)
+
+
+class CorrectedLatencyTest(unittest.TestCase):
+
+    def test_first_request_stalled_past_its_arrival(self):
+        # Scheduled at t=10 by the arrival schedule, sent at t=10.4, answered at t=10.45.
+        self.assertAlmostEqual(corrected_latency(10.4, 10.45, ready_at=10.0), 0.45)
+
+    def test_stall_after_poll_wait(self):
+        # The poll wait ended at t=5.2 but the loop only got round to the next poll at t=5.5.
+        self.assertAlmostEqual(corrected_latency(5.5, 5.53, ready_at=5.2), 0.33)
+
+    def test_no_stall_equals_raw(self):
+        self.assertEqual(corrected_latency(3.0, 3.25, ready_at=3.0), 0.25)
+        # A request sent before it was due (ready_at still ahead) is not credited.
+        self.assertEqual(corrected_latency(3.0, 3.25, ready_at=3.1), 0.25)
+        self.assertEqual(corrected_latency(3.0, 3.25), 0.25)
+
+
+if __name__ == "__main__":
+    unittest.main()
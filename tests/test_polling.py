@@ -0,0 +1,126 @@
+import asyncio
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+from polling import PAYMENT_TERMINAL_STATES, REFUND_TERMINAL_STATES, Poller  # noqa: E402
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def fetcher(statuses, clock=None, cost=0.0):
+    # Returns each status in turn, repeating the last; `cost` is how long each fetch takes.
+    calls = []
+
+    async def fetch():
+        calls.append(len(calls))
+        if clock is not None:
+            clock.now += cost
+        return {"id": "p1", "status": statuses[min(len(calls) - 1, len(statuses) - 1)]}
+    return fetch, calls
+
+
+class PollerTest(unittest.TestCase):
+
+    def poller(self, clock, **options):
+        options.setdefault("jitter", 0.0)
+        return Poller(PAYMENT_TERMINAL_STATES, clock=clock, **options)
+
+    def test_backoff_doubles_up_to_max_interval(self):
+        clock = FakeClock()
+        poller = self.poller(clock, initial_interval=0.1, max_interval=0.5, deadline=60)
+        fetch, calls = fetcher(["PROCESSING"] * 6 + ["COMPLETED"])
+        result = asyncio.run(poller.poll(fetch, clock.sleep))
+        self.assertEqual([round(seconds, 6) for seconds in clock.sleeps], [0.1, 0.2, 0.4, 0.5, 0.5, 0.5])
+        self.assertEqual((result.status, result.polls, result.timed_out), ("COMPLETED", 7, False))
+        self.assertAlmostEqual(result.elapsed, 2.2)
+
+    def test_jitter_stays_within_spread(self):
+        poller = Poller(PAYMENT_TERMINAL_STATES, initial_interval=1.0, max_interval=4.0, jitter=0.2)
+        intervals = poller.intervals()
+        for expected in (1.0, 2.0, 4.0, 4.0):
+            self.assertTrue(expected * 0.8 <= next(intervals) <= expected * 1.2)
+
+    def test_deadline_times_out_with_last_document(self):
+        clock = FakeClock()
+        poller = self.poller(clock, initial_interval=1.0, max_interval=1.0, deadline=3.5)
+        fetch, calls = fetcher(["PENDING"])
+        result = asyncio.run(poller.poll(fetch, clock.sleep))
+        self.assertTrue(result.timed_out)
+        self.assertEqual((result.status, result.polls), ("PENDING", 5))
+        # The last wait is cut short so the final poll lands on the deadline.
+        self.assertEqual(clock.sleeps, [1.0, 1.0, 1.0, 0.5])
+        self.assertEqual(result.elapsed, 3.5)
+
+    def test_slow_fetches_count_against_the_deadline(self):
+        clock = FakeClock()
+        poller = self.poller(clock, initial_interval=1.0, deadline=2.0)
+        fetch, calls = fetcher(["PROCESSING"], clock, cost=3.0)
+        result = asyncio.run(poller.poll(fetch, clock.sleep))
+        self.assertTrue(result.timed_out)
+        self.assertEqual((len(calls), clock.sleeps), (1, []))
+
+    def test_every_terminal_state_stops_polling(self):
+        for status in ("COMPLETED", "FAILED", "CANCELLED", "EXPIRED"):
+            clock = FakeClock()
+            fetch, calls = fetcher(["PROCESSING", status])
+            result = asyncio.run(self.poller(clock).poll(fetch, clock.sleep))
+            self.assertEqual((result.status, result.polls, result.timed_out), (status, 2, False))
+
+    def test_non_terminal_states(self):
+        poller = Poller(REFUND_TERMINAL_STATES)
+        for status in ("RECEIVED", "INITIATED", "PROCESSING", "PENDING", "HELD", None):
+            self.assertFalse(poller.is_terminal({"status": status}))
+        self.assertFalse(poller.is_terminal(None))
+        self.assertTrue(poller.is_terminal({"status": "COMPLETED"}))
+
+
+class AwaitTerminalStatusTest(unittest.TestCase):
+
+    def setUp(self):
+        for name, value in (("webhook_receiver", None), ("console", mock.Mock(quiet=True))):
+            patcher = mock.patch.object(main, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_terminal_create_response_skips_polling(self):
+        clock = FakeClock()
+        fetch, calls = fetcher(["COMPLETED"])
+        ctx = main.FlowContext()
+        created = {"id": "p1", "status": "COMPLETED"}
+        result = asyncio.run(main.await_terminal_status(ctx, "payment_status", created,
+                                                        Poller(PAYMENT_TERMINAL_STATES, clock=clock), fetch, "..."))
+        self.assertEqual((result.source, result.polls, calls), ("response", 0, []))
+        self.assertIs(result.document, created)
+        self.assertEqual(ctx.polls["payment_status"], 0)
+
+    def test_pending_create_response_is_polled(self):
+        clock = FakeClock()
+        fetch, calls = fetcher(["PROCESSING", "COMPLETED"])
+        ctx = main.FlowContext()
+        with mock.patch.object(ctx, "pause", clock.sleep):
+            result = asyncio.run(main.await_terminal_status(ctx, "payment_status", {"id": "p1", "status": "PENDING"},
+                                                            Poller(PAYMENT_TERMINAL_STATES, jitter=0.0, clock=clock),
+                                                            fetch, "..."))
+        self.assertEqual((result.source, result.status, result.polls), ("poll", "COMPLETED", 2))
+        self.assertEqual(ctx.polls["payment_status"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
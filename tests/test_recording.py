@@ -0,0 +1,71 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from paysafe_client import OPERATIONS  # noqa: E402
+from recording import TrafficRecorder  # noqa: E402
+
+
+class FakeResponse:
+    status_code = 201
+    headers = {"Content-Type": "application/json", "Set-Cookie": "session=1"}
+    content = b'{"id": "p-1", "status": "COMPLETED"}'
+
+
+class TrafficRecorderTest(unittest.TestCase):
+
+    def record(self, recorder, position=0):
+        recorder.record("flow-1", "payments", OPERATIONS["process-payment"], "POST", "http://h/paymenthub/v1/payments",
+                        {"Authorization": "Basic c2VjcmV0", "Accept": "application/json"}, {"amount": position},
+                        1700000000.0 + position, 0.0123, FakeResponse())
+
+    def test_writes_redacted_json_lines(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "requests.jsonl")
+            recorder = TrafficRecorder(path)
+            self.record(recorder)
+            recorder.close()
+            with open(path) as f:
+                entry = json.loads(f.readline())
+            self.assertEqual(entry["template"], "/v1/payments")
+            self.assertEqual(entry["request_headers"]["Authorization"], "<redacted>")
+            self.assertEqual(entry["response_headers"]["Set-Cookie"], "<redacted>")
+            self.assertEqual((entry["status"], entry["response_body"]["id"], entry["elapsed_ms"]), (201, "p-1", 12.3))
+
+    def test_masks_card_details(self):
+        card = {"cardNum": "4000000000002503", "cardExpiry": {"month": "02", "year": "2026"}, "cvv": 111,
+                "holderName": "John Doe"}
+        body = {"merchantRefNum": "ref-1", "card": card}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "requests.jsonl")
+            recorder = TrafficRecorder(path)
+            recorder.record("flow-1", "payment_handle", OPERATIONS["create-payment-handle"], "POST",
+                            "http://h/paymenthub/v1/paymenthandles", {}, body, 1700000000.0, 0.01, FakeResponse())
+            recorder.close()
+            with open(path) as f:
+                entry = json.loads(f.readline())
+        self.assertEqual(entry["request_body"]["card"], {"cardNum": "************2503", "cardExpiry": "<redacted>",
+                                                         "holderName": "John Doe"})
+        self.assertEqual(entry["request_body"]["merchantRefNum"], "ref-1")
+        self.assertEqual(body["card"], card)
+
+    def test_rotates_by_size(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "requests.jsonl")
+            recorder = TrafficRecorder(path, max_bytes=2000, backups=2)
+            for position in range(30):
+                self.record(recorder, position)
+            recorder.close()
+            self.assertGreater(recorder.rotations, 2)
+            self.assertEqual(sorted(os.listdir(tmp)), ["requests.jsonl", "requests.jsonl.1", "requests.jsonl.2"])
+            for name in os.listdir(tmp):
+                self.assertLessEqual(os.path.getsize(os.path.join(tmp, name)), 2000)
+            self.assertEqual(recorder.recorded, 30)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from replay import IdMap, Replayer, iter_records, rebase  # noqa: E402
+
+
+class FakeResponse:
+
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self.body = body
+
+    def json(self):
+        return self.body
+
+
+def record(flow_id, ts, method, url, body=None, response_body=None, status=200):
+    return {"ts": ts, "flow_id": flow_id, "step": "s", "operation_id": None, "method": method, "url": url,
+            "request_headers": {"Authorization": "<redacted>", "Accept": "application/json"},
+            "request_body": body, "status": status, "response_body": response_body}
+
+
+class ReplayTest(unittest.TestCase):
+
+    def test_rewrites_ids_along_a_flow(self):
+        base = "https://api.test.paysafe.com/paymenthub"
+        records = [
+            record("f1", 0.0, "POST", base + "/v1/paymenthandles", {"merchantRefNum": "ref-1"},
+                   {"id": "h-old", "paymentHandleToken": "tok-old"}, 201),
+            record("f1", 0.1, "POST", base + "/v1/payments", {"merchantRefNum": "ref-1", "paymentHandleToken": "tok-old"},
+                   {"id": "p-old"}, 201),
+            record("f1", 0.2, "GET", base + "/v1/payments/p-old", response_body={"id": "p-old"}),
+        ]
+        sent = []
+        issued = iter(["h-new", "p-new", "p-new"])
+
+        async def send(method, url, headers, body, original):
+            await asyncio.sleep(0)
+            sent.append((method, url, headers, body))
+            new_id = next(issued)
+            return FakeResponse(original["status"], {"id": new_id, "paymentHandleToken": "tok-new"})
+
+        replayer = Replayer(send, "http://127.0.0.1:8080/paymenthub", speed=None,
+                            headers_for=lambda r: {"Authorization": "Basic key"})
+        self.assertEqual(asyncio.run(replayer.run(iter(records))), 3)
+        (_, _, headers, handle), (_, _, _, payment), (_, status_url, _, _) = sent
+        self.assertEqual(headers, {"Accept": "application/json", "Authorization": "Basic key"})
+        self.assertNotEqual(handle["merchantRefNum"], "ref-1")
+        self.assertEqual(payment, {"merchantRefNum": handle["merchantRefNum"], "paymentHandleToken": "tok-new"})
+        self.assertEqual(status_url, "http://127.0.0.1:8080/paymenthub/v1/payments/p-new")
+        self.assertEqual(replayer.mismatched, 0)
+
+    def test_masked_card_is_replaced(self):
+        masked = {"cardNum": "************2503", "cardExpiry": "<redacted>", "holderName": "John Doe"}
+        card = {"cardNum": "4000000000002503", "cardExpiry": {"month": "02", "year": "2026"}, "cvv": 111}
+        sent = []
+
+        async def send(method, url, headers, body, original):
+            sent.append(body)
+            return FakeResponse(201, {"id": "h-new"})
+
+        replayer = Replayer(send, speed=None, card=card)
+        asyncio.run(replayer.run(iter([record("f1", 0.0, "POST", "http://h/v1/paymenthandles",
+                                              {"merchantRefNum": "ref-1", "card": masked})])))
+        self.assertEqual(sent[0]["card"], dict(card, holderName="John Doe"))
+
+    def test_speed_scales_recorded_gaps(self):
+        records = [record(str(n), n * 0.5, "GET", "http://h/v1/monitor") for n in range(3)]
+
+        async def send(method, url, headers, body, original):
+            return FakeResponse(200, {})
+
+        async def run():
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            await Replayer(send, speed=10.0).run(iter(records))
+            return loop.time() - started
+        self.assertAlmostEqual(asyncio.run(run()), 0.1, delta=0.05)
+
+    def test_streams_files_and_counts_bad_lines(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "requests.jsonl")
+            with open(path, "w") as f:
+                f.write(json.dumps(record("a", 0, "GET", "http://h/v1/monitor")) + "\n{truncated\n\n")
+            records = list(iter_records([path]))
+        self.assertEqual(len(records), 2)
+        self.assertIsNone(records[1])
+
+    def test_rebase_and_id_map(self):
+        self.assertEqual(rebase("https://a/paymenthub/v1/payments/1?x=1", "http://b:8080/ph/"), "http://b:8080/ph/v1/payments/1?x=1")
+        ids = IdMap(max_ids=1)
+        ids.add("a", "b")
+        ids.add("c", "d")
+        self.assertEqual((ids.get("a"), ids.get("c")), ("a", "d"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+import asyncio
+import os
+import random
+import socket
+import sys
+import unittest
+from email.utils import formatdate
+from unittest import mock
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+from metrics import RunStats  # noqa: E402
+from retry import RetryBudget, RetryPolicy, RetryRule, parse_rule, retry_after  # noqa: E402
+from transport import AsyncTransport  # noqa: E402
+
+
+class FakeResponse:
+
+    def __init__(self, status_code, body=None, headers=None):
+        self.status_code = status_code
+        self.body = body
+        self.headers = headers or {}
+
+    def json(self):
+        if self.body is None:
+            raise ValueError("no body")
+        return self.body
+
+
+class CountingTransport(AsyncTransport):
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.payloads = []
+
+    async def request(self, method, url, json=None, **kwargs):
+        self.payloads.append(json)
+        return await super().request(method, url, json=json, **kwargs)
+
+
+class RetryPolicyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.policy = RetryPolicy(rng=random.Random(1))
+
+    def test_classifies_transient_failures(self):
+        rule = self.policy.rule_for("get-payments", "GET")
+        declined = FakeResponse(500, {"error": {"code": "1007"}})
+        self.assertEqual(self.policy.reason(rule, "GET", 1, None, declined), "code 1007")
+        self.assertEqual(self.policy.reason(rule, "GET", 1, None, FakeResponse(503)), "http 503")
+        self.assertEqual(self.policy.reason(rule, "GET", 1, None, error=requests.exceptions.ConnectionError()), "ConnectionError")
+        self.assertIsNone(self.policy.reason(rule, "GET", 1, None, FakeResponse(402, {"error": {"code": "3009"}})))
+        self.assertIsNone(self.policy.reason(rule, "GET", 1, None, error=KeyError("x")))
+        self.assertIsNone(self.policy.reason(rule, "GET", 3, None, FakeResponse(503)))
+
+    def test_posts_retry_only_with_merchant_ref_and_dup_check(self):
+        rule = self.policy.rule_for("process-payment", "POST")
+        self.assertTrue(rule.dup_check)
+        self.assertIsNone(self.policy.reason(rule, "POST", 1, {"amount": 6}, FakeResponse(503)))
+        payload = {"merchantRefNum": "ref-1", "amount": 6}
+        self.assertEqual(self.policy.reason(rule, "POST", 1, payload, FakeResponse(503)), "http 503")
+        self.assertEqual(self.policy.retry_payload(rule, payload), {"merchantRefNum": "ref-1", "amount": 6, "dupCheck": True})
+        self.assertEqual(self.policy.retry_payload(self.policy.rule_for("cancel-payments", "PUT"), {"status": "CANCELLED"}),
+                         {"status": "CANCELLED"})
+
+    def test_timeouts_are_retried_like_connection_errors(self):
+        get = self.policy.rule_for("get-payments", "GET")
+        for error in (requests.exceptions.ReadTimeout(), requests.exceptions.ConnectTimeout(), asyncio.TimeoutError()):
+            self.assertIsNotNone(self.policy.reason(get, "GET", 1, None, error=error))
+        post = self.policy.rule_for("process-payment", "POST")
+        timeout = requests.exceptions.Timeout()
+        self.assertIsNone(self.policy.reason(post, "POST", 1, {"amount": 6}, error=timeout))
+        self.assertEqual(self.policy.reason(post, "POST", 1, {"merchantRefNum": "ref-1"}, error=timeout), "Timeout")
+
+    def test_per_operation_override(self):
+        operation_id, rule = parse_rule("process-payment=1", RetryRule())
+        policy = RetryPolicy({operation_id: rule})
+        self.assertEqual(policy.rule_for("process-payment", "POST").max_attempts, 1)
+        self.assertTrue(policy.rule_for("process-payment", "POST").dup_check)
+        self.assertEqual(policy.rule_for("get-payments", "GET").max_attempts, 3)
+        with self.assertRaises(ValueError):
+            parse_rule("process-payment", RetryRule())
+
+    def test_rule_rejects_unknown_operations_and_attempts(self):
+        with self.assertRaisesRegex(ValueError, "unknown operation 'process-paymnet'"):
+            parse_rule("process-paymnet=1", RetryRule())
+        for attempts in ("0", "-2"):
+            with self.assertRaisesRegex(ValueError, "at least 1"):
+                parse_rule(f"process-payment={attempts}", RetryRule())
+        self.assertEqual(parse_rule(" get-payments =4", RetryRule())[0], "get-payments")
+
+    def test_backoff_honours_retry_after(self):
+        policy = RetryPolicy(base_delay=0.1, max_delay=1.0, jitter=0.0, max_retry_after=5.0)
+        self.assertEqual([policy.delay(n) for n in (1, 2, 3, 6)], [0.1, 0.2, 0.4, 1.0])
+        self.assertEqual(policy.delay(1, FakeResponse(503, headers={"Retry-After": "2"})), 2.0)
+        self.assertEqual(policy.delay(1, FakeResponse(503, headers={"Retry-After": "120"})), 5.0)
+        self.assertAlmostEqual(retry_after(FakeResponse(429, headers={"Retry-After": formatdate(1000.0 + 30, usegmt=True)}), now=1000.0), 30.0)
+        self.assertIsNone(retry_after(FakeResponse(429, headers={"Retry-After": "soon"})))
+        jittered = RetryPolicy(base_delay=1.0, jitter=0.5, rng=random.Random(2))
+        self.assertTrue(all(0.5 <= jittered.delay(1) <= 1.0 for _ in range(100)))
+
+    def test_budget_limits_retries_to_a_ratio(self):
+        budget = RetryBudget(ratio=0.1, burst=2)
+        allowed = 0
+        for _ in range(100):
+            budget.deposit()
+            allowed += budget.withdraw()
+        self.assertEqual(allowed, 11)
+        self.assertEqual(budget.denied, 89)
+
+
+class TimedOutRequestRetryTest(unittest.IsolatedAsyncioTestCase):
+    # Runs main's retry loop against a socket that accepts but never answers, so every
+    # attempt ends in the transport's own timeout.
+
+    def setUp(self):
+        self.sock = socket.socket()
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.listen(16)
+        self.addCleanup(self.sock.close)
+        self.url = f"http://127.0.0.1:{self.sock.getsockname()[1]}"
+        self.transport = CountingTransport(timeout=0.05)
+        self.stats = RunStats()
+        for name, value in (("transport", self.transport), ("run_stats", self.stats), ("circuit_breakers", None),
+                            ("retry_policy", RetryPolicy(base_delay=0.0, rng=random.Random(1)))):
+            patcher = mock.patch.object(main, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def asyncTearDown(self):
+        self.transport.close()
+
+    async def test_timed_out_get_is_retried(self):
+        with self.assertRaises(requests.exceptions.Timeout):
+            await main.send_with_retries("GET", self.url + "/payments/p1", {}, None, "lookup", operation_id="get-payments")
+        self.assertEqual(len(self.transport.payloads), 3)
+        self.assertEqual(self.stats.retries[("lookup", "Timeout")], 2)
+
+    async def test_timed_out_post_is_retried_only_with_dup_check(self):
+        with self.assertRaises(requests.exceptions.Timeout):
+            await main.send_with_retries("POST", self.url + "/payments", {}, {"amount": 6}, "payment",
+                                         operation_id="process-payment")
+        self.assertEqual(self.transport.payloads, [{"amount": 6}])
+
+        self.transport.payloads.clear()
+        with self.assertRaises(requests.exceptions.Timeout):
+            await main.send_with_retries("POST", self.url + "/payments", {}, {"merchantRefNum": "ref-1", "amount": 6},
+                                         "payment", operation_id="process-payment")
+        self.assertEqual(self.transport.payloads, [{"merchantRefNum": "ref-1", "amount": 6}]
+                         + [{"merchantRefNum": "ref-1", "amount": 6, "dupCheck": True}] * 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
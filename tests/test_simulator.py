@@ -0,0 +1,101 @@
+import asyncio
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from expectations import Expectations  # noqa: E402
+from simulator import Simulator, SimulatorProtocol  # noqa: E402
+from transport import AsyncTransport  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+AUTH = {"Authorization": "Basic dGVzdA=="}
+
+
+class SimulatorTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.simulator = Simulator(Expectations(os.path.join(ROOT, "expect_response.json")), time_scale=0.01, refund_delay=0.05)
+        self.server = await asyncio.get_running_loop().create_server(lambda: SimulatorProtocol(self.simulator), "127.0.0.1", 0)
+        self.base = f"http://127.0.0.1:{self.server.sockets[0].getsockname()[1]}/paymenthub/v1"
+        self.transport = AsyncTransport()
+
+    async def asyncTearDown(self):
+        await self.transport.release()
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def call(self, method, path, payload=None, headers=AUTH):
+        return await self.transport.request(method, self.base + path, headers=headers, json=payload)
+
+    async def test_requires_authorization(self):
+        response = await self.call("GET", "/monitor", headers={})
+        self.assertEqual(response.status_code, 401)
+
+    async def test_approved_payment_settles_and_refunds(self):
+        payment = (await self.call("POST", "/payments", {"amount": 1000, "currencyCode": "USD"})).json()
+        self.assertEqual(payment["status"], "COMPLETED")
+        settlement = (await self.call("POST", f"/payments/{payment['id']}/settlements", {"amount": 1000})).json()
+        refund = (await self.call("POST", f"/settlements/{settlement['id']}/refunds", {"amount": 1000})).json()
+        self.assertEqual(refund["status"], "PENDING")
+        await asyncio.sleep(0.06)
+        self.assertEqual((await self.call("GET", f"/refunds/{refund['id']}")).json()["status"], "COMPLETED")
+
+    async def test_declines_follow_expectations(self):
+        response = await self.call("POST", "/payments", {"amount": 5, "currencyCode": "USD"})
+        self.assertEqual(response.status_code, 402)
+        self.assertEqual(response.json()["error"]["code"], "3009")
+
+    async def test_delayed_payment_can_be_cancelled(self):
+        payment = (await self.call("POST", "/payments", {"amount": 95, "currencyCode": "USD"})).json()
+        self.assertEqual(payment["status"], "PENDING")
+        cancelled = await self.call("PUT", f"/payments/{payment['id']}", {"status": "CANCELLED"})
+        self.assertEqual(cancelled.json()["status"], "CANCELLED")
+        self.assertEqual((await self.call("GET", f"/payments/{payment['id']}")).json()["status"], "CANCELLED")
+
+    async def test_cancelled_payment_cannot_be_settled(self):
+        payment = (await self.call("POST", "/payments", {"amount": 95, "currencyCode": "USD"})).json()
+        await self.call("PUT", f"/payments/{payment['id']}", {"status": "CANCELLED"})
+        settlement = await self.call("POST", f"/payments/{payment['id']}/settlements", {"amount": 95})
+        self.assertEqual(settlement.status_code, 409)
+
+    async def test_cancel_racing_the_completion_webhook(self):
+        sent = []
+
+        async def capture(body):
+            sent.append(body)
+        simulator = Simulator(self.simulator.expectations, time_scale=0.01, webhook_url="http://127.0.0.1:9/webhooks")
+        simulator._post_webhook = capture
+        status, payment, _ = simulator.create_payment({"amount": 95, "currencyCode": "USD"})
+        _, kept, _ = simulator.create_payment({"amount": 95, "currencyCode": "USD"})
+        self.assertEqual(simulator.cancel_payment(payment["id"], {"status": "CANCELLED"})[0], 200)
+        await asyncio.sleep(simulator.delay_for(95) + 0.05)
+        events = {body["resourceId"]: (body["eventName"], body["payload"]["status"]) for body in sent}
+        self.assertEqual(events, {payment["id"]: ("PAYMENT_CANCELLED", "CANCELLED"),
+                                  kept["id"]: ("PAYMENT_COMPLETED", "COMPLETED")})
+
+    def test_cancelled_ids_are_bounded(self):
+        simulator = Simulator(Expectations(os.path.join(ROOT, "expect_response.json")), max_cancelled=2)
+        ids = [simulator.create_payment({"amount": 95})[1]["id"] for _ in range(3)]
+        for payment_id in ids:
+            simulator.cancel_payment(payment_id, {"status": "CANCELLED"})
+        self.assertEqual(list(simulator.cancelled), ids[1:])
+
+    async def test_customer_with_stored_card(self):
+        customer = await self.call("POST", "/customers", {"merchantCustomerId": "c1", "firstName": "John"})
+        self.assertEqual(customer.status_code, 201)
+        customer_id = customer.json()["id"]
+        handle = (await self.call("POST", f"/customers/{customer_id}/paymenthandles",
+                                  {"paymentType": "CARD", "card": {"cardNum": "4000000000002503"}})).json()
+        self.assertEqual((handle["usage"], handle["customerId"], handle["card"]["lastDigits"]), ("MULTI_USE", customer_id, "2503"))
+        payment = (await self.call("POST", "/payments", {"amount": 1000, "currencyCode": "USD",
+                                                         "paymentHandleToken": handle["paymentHandleToken"]})).json()
+        self.assertEqual(payment["status"], "COMPLETED")
+
+    async def test_unknown_route_is_404(self):
+        self.assertEqual((await self.call("GET", "/nothing")).status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
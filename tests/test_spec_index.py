@@ -0,0 +1,89 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+import zlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import spec_index  # noqa: E402
+
+MINI_SPEC = """
+openapi: 3.0.0
+servers:
+  - url: https://example.test/hub
+paths:
+  /v1/things/{thingId}:
+    get:
+      operationId: get-thing
+      description: long prose that should not be cached
+      responses:
+        '200':
+          content:
+            application/json:
+              schema:
+                $ref: '#/components/schemas/thing'
+components:
+  schemas:
+    thing:
+      type: object
+      description: dropped
+      properties:
+        status:
+          type: string
+          enum: [%s]
+"""
+
+
+class SpecIndexTest(unittest.TestCase):
+
+    def test_cache_is_reused_and_invalidated_by_content(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "spec.yaml")
+            with open(path, "w") as f:
+                f.write(MINI_SPEC % "OPEN, CLOSED")
+            index = spec_index.load_index(path)
+            self.assertEqual(index.enum("thing.status"), ("OPEN", "CLOSED"))
+            self.assertNotIn("description", index.schema("thing"))
+            self.assertTrue(os.path.exists(path + spec_index.CACHE_SUFFIX))
+
+            original = spec_index.build_index
+            spec_index.build_index = None  # a cache hit must not rebuild
+            try:
+                self.assertEqual(spec_index.load_index(path).operations.keys(), index.operations.keys())
+            finally:
+                spec_index.build_index = original
+
+            with open(path, "w") as f:
+                f.write(MINI_SPEC % "OPEN, CLOSED, ARCHIVED")
+            self.assertEqual(spec_index.load_index(path).enum("thing.status"), ("OPEN", "CLOSED", "ARCHIVED"))
+
+    def test_cache_holds_json_and_survives_corruption(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "spec.yaml")
+            with open(path, "w") as f:
+                f.write(MINI_SPEC % "OPEN, CLOSED")
+            index = spec_index.load_index(path)
+            with open(path + spec_index.CACHE_SUFFIX, "rb") as f:
+                cached = f.read()
+            header = cached[:len(spec_index.CACHE_MAGIC) + 64]
+            self.assertEqual(json.loads(zlib.decompress(cached[len(header):]))["enums"], {"thing.status": ["OPEN", "CLOSED"]})
+            self.assertEqual(spec_index.load_index(path).routes, index.routes)
+
+            with open(path + spec_index.CACHE_SUFFIX, "wb") as f:
+                f.write(header + zlib.compress(b"not json"))
+            self.assertEqual(spec_index.load_index(path).enum("thing.status"), ("OPEN", "CLOSED"))
+
+    def test_bundled_spec_lookups(self):
+        index = spec_index.default_index()
+        self.assertEqual(index.servers, ["https://api.test.paysafe.com/paymenthub"])
+        self.assertEqual(index.operation("POST", "/v1/payments")["operation_id"], "process-payment")
+        self.assertEqual(index.resolve({"$ref": "#/components/schemas/payment"}), index.schema("payment"))
+        self.assertIn("COMPLETED", index.enum("payment.status"))
+        self.assertEqual([p["name"] for p in index.operation("GET", "/v1/balances")["parameters"]["query"]][:2],
+                         ["paymentType", "currencyCode"])
+
+
+if __name__ == "__main__":
+    unittest.main()
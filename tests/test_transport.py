@@ -0,0 +1,325 @@
+import asyncio
+import os
+import socket
+import sys
+import threading
+import unittest
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from transport import AsyncTransport, PooledTransport, ThreadedTransport  # noqa: E402
+
+
+async def read_request(reader):
+    head = await reader.readuntil(b"\r\n\r\n")
+    length = 0
+    for line in head.split(b"\r\n"):
+        name, _, value = line.partition(b":")
+        if name.strip().lower() == b"content-length":
+            length = int(value)
+    body = await reader.readexactly(length) if length else b""
+    return head.split(b" ", 1)[0].decode(), body
+
+
+class ScriptedServer:
+    # Local asyncio server; `script` is called per request and returns raw response
+    # bytes plus whether to close the connection afterwards.
+
+    def __init__(self, script):
+        self.script = script
+        self.requests = []
+        self.connections = 0
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.url = f"http://127.0.0.1:{self.server.sockets[0].getsockname()[1]}"
+        return self
+
+    async def __aexit__(self, *exc):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                method, body = await read_request(reader)
+                self.requests.append((method, body))
+                response, close = await self.script(len(self.requests), method, body)
+                if response:
+                    writer.write(response)
+                    await writer.drain()
+                if close:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+
+class SilentServer:
+    # Accepts connections (the kernel completes the handshake from the backlog) but never answers.
+
+    def __enter__(self):
+        self.sock = socket.socket()
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.listen(16)
+        self.url = f"http://127.0.0.1:{self.sock.getsockname()[1]}"
+        return self
+
+    def __exit__(self, *exc):
+        self.sock.close()
+
+
+def ok(body=b'{"status": "OK"}', extra=""):
+    return f"HTTP/1.1 200 OK\r\nContent-Length: {len(body)}\r\n{extra}\r\n".encode() + body
+
+
+class AsyncTransportTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_keep_alive_reuses_connection(self):
+        async def script(n, method, body):
+            return ok(), False
+        async with ScriptedServer(script) as server:
+            transport = AsyncTransport()
+            for _ in range(3):
+                response = await transport.request("GET", server.url + "/v1/monitor")
+                self.assertEqual(response.json(), {"status": "OK"})
+            self.assertEqual(server.connections, 1)
+            stats = transport.stats()[server.url]
+            self.assertEqual((stats["requests"], stats["hits"], stats["misses"]), (3, 2, 1))
+            await transport.release()
+
+    async def test_chunked_body(self):
+        async def script(n, method, body):
+            chunks = b"5\r\n{\"a\":\r\n3\r\n 1}\r\n0\r\n\r\n"
+            return b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n" + chunks, False
+        async with ScriptedServer(script) as server:
+            transport = AsyncTransport()
+            response = await transport.request("GET", server.url + "/")
+            self.assertEqual(response.json(), {"a": 1})
+            await transport.release()
+
+    async def test_connection_close_is_not_reused(self):
+        async def script(n, method, body):
+            return ok(extra="Connection: close\r\n"), True
+        async with ScriptedServer(script) as server:
+            transport = AsyncTransport()
+            await transport.request("GET", server.url + "/")
+            await transport.request("GET", server.url + "/")
+            self.assertEqual(server.connections, 2)
+            await transport.release()
+
+    async def test_stale_connection_retries_get(self):
+        async def script(n, method, body):
+            # Second request: the server drops the kept-alive connection without answering.
+            return (b"", True) if n == 2 else (ok(), False)
+        async with ScriptedServer(script) as server:
+            transport = AsyncTransport()
+            await transport.request("GET", server.url + "/")
+            response = await transport.request("GET", server.url + "/")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(server.requests), 3)
+            await transport.release()
+
+    async def test_stale_connection_does_not_resend_post(self):
+        async def script(n, method, body):
+            return (b"", True) if n == 2 else (ok(), False)
+        async with ScriptedServer(script) as server:
+            transport = AsyncTransport()
+            await transport.request("GET", server.url + "/")
+            with self.assertRaises(requests.exceptions.ConnectionError):
+                await transport.request("POST", server.url + "/v1/payments", json={"amount": 1})
+            self.assertEqual([m for m, _ in server.requests].count("POST"), 1)
+            await transport.release()
+
+    async def test_timeout_maps_to_requests_timeout(self):
+        async def script(n, method, body):
+            await asyncio.sleep(1)
+            return ok(), False
+        async with ScriptedServer(script) as server:
+            transport = AsyncTransport()
+            with self.assertRaises(requests.exceptions.Timeout):
+                await transport.request("GET", server.url + "/", timeout=0.05)
+            await transport.release()
+
+    async def test_default_timeout_applies_to_a_silent_endpoint(self):
+        with SilentServer() as server:
+            transport = AsyncTransport(timeout=0.1)
+            with self.assertRaises(requests.exceptions.Timeout):
+                await transport.request("GET", server.url + "/v1/monitor")
+            await transport.release()
+
+    async def test_error_status_raises_http_error(self):
+        async def script(n, method, body):
+            payload = b'{"error": {"code": "3009"}}'
+            return f"HTTP/1.1 402 Payment Required\r\nContent-Length: {len(payload)}\r\n\r\n".encode() + payload, False
+        async with ScriptedServer(script) as server:
+            transport = AsyncTransport()
+            response = await transport.request("POST", server.url + "/v1/payments", json={})
+            with self.assertRaises(requests.exceptions.HTTPError) as raised:
+                response.raise_for_status()
+            self.assertEqual(raised.exception.response.json()["error"]["code"], "3009")
+            await transport.release()
+
+    async def test_busy_pool_outlives_lru_retirement(self):
+        release = asyncio.Event()
+
+        async def slow(n, method, body):
+            await release.wait()
+            return ok(), False
+
+        async def fast(n, method, body):
+            return ok(), False
+        async with ScriptedServer(slow) as busy, ScriptedServer(fast) as other, ScriptedServer(fast) as third:
+            transport = AsyncTransport(pool_size=2)
+            await transport.request("GET", other.url + "/")
+            pending = asyncio.ensure_future(transport.request("GET", busy.url + "/"))
+            await asyncio.sleep(0.05)
+            # The idle pool is retired for the new host, not the one with a request running.
+            await transport.request("GET", third.url + "/")
+            self.assertEqual(set(transport._pools), {busy.url, third.url})
+            release.set()
+            self.assertEqual((await pending).status_code, 200)
+            await transport.release()
+
+
+class FakeSession:
+    # Stands in for requests.Session; `gate` holds requests until it is set.
+
+    def __init__(self, gate=None):
+        self.adapters = {}
+        self.closed = False
+        self.gate = gate
+        self.urls = []
+
+    def request(self, method, url, **kwargs):
+        if self.gate is not None:
+            self.gate.wait(5)
+        if self.closed:
+            raise RuntimeError("request on a closed session")
+        self.urls.append(url)
+        return url
+
+    def close(self):
+        self.closed = True
+
+
+class FakePooledTransport(PooledTransport):
+
+    def __init__(self, *args, gate=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.gate = gate
+        self.created = []
+
+    def _new_session(self):
+        session = FakeSession(self.gate)
+        self.created.append(session)
+        return session
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class PooledTransportTest(unittest.TestCase):
+
+    def test_one_session_per_host(self):
+        transport = FakePooledTransport()
+        first = transport.session_for("https://api.test.paysafe.com/paymenthub/v1/payments")
+        self.assertIs(transport.session_for("https://api.test.paysafe.com/paymenthub/v1/monitor"), first)
+        self.assertIsNot(transport.session_for("http://127.0.0.1:8080/paymenthub/v1/payments"), first)
+        self.assertIsNot(transport.session_for("http://127.0.0.1:9090/paymenthub/v1/payments"), first)
+        self.assertEqual(len(transport.created), 3)
+
+    def test_pool_size_retires_least_recently_used(self):
+        clock = FakeClock()
+        transport = FakePooledTransport(pool_size=2, clock=clock)
+        a = transport.session_for("http://a/")
+        clock.now = 1
+        b = transport.session_for("http://b/")
+        clock.now = 2
+        transport.session_for("http://a/")
+        clock.now = 3
+        transport.session_for("http://c/")
+        self.assertTrue(b.closed)
+        self.assertFalse(a.closed)
+        self.assertEqual(set(transport._sessions), {"http://a", "http://c"})
+        self.assertEqual(transport.stats()["http://b"]["evictions"], 1)
+
+    def test_idle_sessions_are_evicted(self):
+        clock = FakeClock()
+        transport = FakePooledTransport(idle_timeout=30, clock=clock)
+        a = transport.session_for("http://a/")
+        clock.now = 20
+        b = transport.session_for("http://b/")
+        clock.now = 40
+        transport.session_for("http://b/")
+        self.assertTrue(a.closed)
+        self.assertFalse(b.closed)
+        self.assertIsNot(transport.session_for("http://a/"), a)
+
+    def test_session_in_use_is_not_closed_under_a_request(self):
+        gate = threading.Event()
+        clock = FakeClock()
+        transport = FakePooledTransport(pool_size=1, clock=clock, gate=gate)
+        results = []
+        worker = threading.Thread(target=lambda: results.append(transport.request("GET", "http://a/slow")))
+        worker.start()
+        while not transport._in_flight:
+            threading.Event().wait(0.01)
+        busy = transport.created[0]
+        clock.now = 1
+        # Over the cap with every session busy: the old one is retired but only closed once idle.
+        other = transport.session_for("http://b/")
+        self.assertFalse(busy.closed)
+        self.assertEqual(set(transport._sessions), {"http://b"})
+        gate.set()
+        worker.join(5)
+        self.assertEqual(results, ["http://a/slow"])
+        self.assertTrue(busy.closed)
+        self.assertFalse(other.closed)
+        self.assertEqual(transport._in_flight, {})
+
+    def test_idle_eviction_skips_sessions_in_use(self):
+        gate = threading.Event()
+        clock = FakeClock()
+        transport = FakePooledTransport(idle_timeout=30, clock=clock, gate=gate)
+        worker = threading.Thread(target=transport.request, args=("GET", "http://a/slow"))
+        worker.start()
+        while not transport._in_flight:
+            threading.Event().wait(0.01)
+        clock.now = 60
+        transport.session_for("http://b/")
+        self.assertIn("http://a", transport._sessions)
+        gate.set()
+        worker.join(5)
+        self.assertFalse(transport.created[0].closed)
+
+    def test_default_timeout_applies_to_a_silent_endpoint(self):
+        with SilentServer() as server:
+            transport = ThreadedTransport(PooledTransport(timeout=0.1))
+            with self.assertRaises(requests.exceptions.Timeout):
+                asyncio.run(transport.request("POST", server.url + "/v1/payments", json={"amount": 1}))
+            transport.close()
+
+    def test_threaded_transport_shares_sessions_across_workers(self):
+        transport = ThreadedTransport(FakePooledTransport(), max_workers=4)
+
+        async def run():
+            return await asyncio.gather(*(transport.request("GET", f"http://a/{n}") for n in range(8)))
+        self.assertEqual(sorted(asyncio.run(run())), sorted(f"http://a/{n}" for n in range(8)))
+        self.assertEqual(len(transport.pooled.created), 1)
+        transport.close()
+        self.assertTrue(transport.pooled.created[0].closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from spec_index import default_index  # noqa: E402
+from validation import PayloadValidationError, RequestValidator, ResponseValidator, RouteTable  # noqa: E402
+
+BASE = "https://api.test.paysafe.com/paymenthub/v1"
+HANDLE = {
+    "merchantRefNum": "ref-1", "transactionType": "PAYMENT", "paymentType": "CARD", "amount": 100,
+    "currencyCode": "USD", "accountId": "1009688230",
+    "card": {"cardNum": "4000000000001026", "cardExpiry": {"month": 10, "year": 2030}, "cvv": "111", "holderName": "John"},
+    "returnLinks": [{"rel": "default", "href": "https://example.com/", "method": "GET"}],
+}
+
+
+class RouteTableTest(unittest.TestCase):
+
+    def test_matches_templates_and_literals(self):
+        routes = RouteTable(default_index())
+        self.assertEqual(routes.match("POST", f"{BASE}/payments"), "process-payment")
+        self.assertEqual(routes.match("GET", f"{BASE}/payments/abc-123"), "get-payments")
+        self.assertEqual(routes.match("POST", f"{BASE}/payments/abc/settlements"), "process-settlement")
+        self.assertEqual(routes.match("GET", f"{BASE}/paymentmethods?currencyCode=USD"), "look-up-payment-methods")
+        self.assertIsNone(routes.match("GET", f"{BASE}/nowhere"))
+
+
+class RequestValidatorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.validator = RequestValidator(default_index())
+
+    def test_cli_payment_handle_is_valid(self):
+        self.validator.validate("POST", f"{BASE}/paymenthandles", HANDLE)
+
+    def test_reports_spec_violations(self):
+        payload = dict(HANDLE, paymentType="CHEQUE", accountId="12345678901")
+        del payload["merchantRefNum"]
+        with self.assertRaises(PayloadValidationError) as raised:
+            self.validator.validate("POST", f"{BASE}/paymenthandles", payload)
+        errors = "\n".join(raised.exception.errors)
+        self.assertIn("merchantRefNum: required", errors)
+        self.assertIn("paymentType: 'CHEQUE'", errors)
+        self.assertIn("accountId: longer than 10", errors)
+
+    def test_checks_nested_and_list_items(self):
+        payload = dict(HANDLE, returnLinks=[{"rel": "sideways", "href": "https://example.com/"}])
+        with self.assertRaises(PayloadValidationError) as raised:
+            self.validator.validate("POST", f"{BASE}/paymenthandles", payload)
+        self.assertTrue(raised.exception.errors[0].startswith("returnLinks[0].rel"))
+
+    def test_checkers_are_compiled_once(self):
+        self.validator.validate("POST", f"{BASE}/paymenthandles", HANDLE)
+        checker = self.validator.checkers["create-payment-handle"]
+        self.validator.validate("POST", f"{BASE}/paymenthandles", HANDLE)
+        self.assertIs(self.validator.checkers["create-payment-handle"], checker)
+
+
+class FakeResponse:
+
+    def __init__(self, status_code, document):
+        self.status_code = status_code
+        self.document = document
+
+    def json(self):
+        return self.document
+
+
+class ResponseValidatorTest(unittest.TestCase):
+
+    def test_counts_violations_per_operation(self):
+        validator = ResponseValidator(default_index(), sample_rate=1.0)
+        for position in range(3):
+            validator.observe("GET", f"{BASE}/payments/p-{position}", FakeResponse(200, {"id": "p", "status": "SIDEWAYS"}))
+        row = validator.summary()["get-payments"]
+        self.assertEqual((row["checked"], row["failed"]), (3, 3))
+        self.assertIn("status: 'SIDEWAYS'", row["top_violations"][0][0])
+        self.assertGreater(row["cost"], 0)
+
+    def test_sampling_skips_responses(self):
+        validator = ResponseValidator(default_index(), sample_rate=0.0)
+        validator.observe("GET", f"{BASE}/payments/p-1", FakeResponse(200, {"status": "SIDEWAYS"}))
+        self.assertEqual((validator.seen, validator.summary()), (1, {}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import asyncio
+import gc
+import json
+import os
+import socket
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from webhooks import MAX_BODY_BYTES, WebhookReceiver, signature_for  # noqa: E402
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def post(port, body, signature=None, declared_length=None):
+    head = f"POST /webhooks HTTP/1.1\r\nContent-Length: {declared_length or len(body)}\r\nConnection: close\r\n"
+    if signature:
+        head += f"Signature: {signature}\r\n"
+    with socket.create_connection(("127.0.0.1", port)) as sock:
+        sock.sendall(head.encode() + b"\r\n" + (b"" if declared_length else body))
+        return sock.recv(200).split(b"\r\n", 1)[0].decode()
+
+
+def notification(resource_id, status):
+    return json.dumps({"eventName": f"PAYMENT_{status}", "payload": {"id": resource_id, "status": status}}).encode()
+
+
+class WebhookReceiverTest(unittest.TestCase):
+
+    def setUp(self):
+        self.port = free_port()
+        self.receiver = WebhookReceiver(port=self.port, secret="s3cret")
+        self.receiver.start()
+
+    def tearDown(self):
+        self.receiver.stop()
+
+    def test_requires_secret_off_loopback(self):
+        with self.assertRaises(ValueError):
+            WebhookReceiver(host="0.0.0.0", port=self.port)
+
+    def test_rejects_bad_signature(self):
+        body = notification("p-1", "COMPLETED")
+        self.assertEqual(post(self.port, body, "bogus"), "HTTP/1.1 401 Unauthorized")
+        self.assertEqual(self.receiver.received, 0)
+
+    def test_rejects_oversized_body(self):
+        self.assertEqual(post(self.port, b"", declared_length=MAX_BODY_BYTES + 1), "HTTP/1.1 413 Payload Too Large")
+
+    def test_resolves_waiter_and_early_notification(self):
+        async def scenario():
+            waiting = asyncio.ensure_future(self.receiver.wait_for("p-2", {"COMPLETED"}, 2))
+            await asyncio.sleep(0.05)
+            body = notification("p-2", "COMPLETED")
+            status = await asyncio.get_running_loop().run_in_executor(None, post, self.port, body, signature_for("s3cret", body))
+            self.assertEqual(status, "HTTP/1.1 200 OK")
+            return await waiting
+
+        result = asyncio.run(scenario())
+        self.assertEqual((result.status, result.source), ("COMPLETED", "webhook"))
+
+        body = notification("p-3", "FAILED")
+        post(self.port, body, signature_for("s3cret", body))
+        early = asyncio.run(self.receiver.wait_for("p-3", {"COMPLETED", "FAILED"}, 0.1))
+        self.assertEqual(early.status, "FAILED")
+
+    def test_times_out_without_notification(self):
+        self.assertIsNone(asyncio.run(self.receiver.wait_for("missing", {"COMPLETED"}, 0.05)))
+
+    def test_stop_closes_idle_keep_alive_connections(self):
+        body = notification("p-4", "COMPLETED")
+        head = f"POST /webhooks HTTP/1.1\r\nContent-Length: {len(body)}\r\nSignature: {signature_for('s3cret', body)}\r\n\r\n"
+        unraisable = []
+        with socket.create_connection(("127.0.0.1", self.port)) as sock, \
+                mock.patch.object(sys, "unraisablehook", unraisable.append), self.assertNoLogs("asyncio"):
+            sock.sendall(head.encode() + body)
+            self.assertEqual(sock.recv(200).split(b"\r\n", 1)[0], b"HTTP/1.1 200 OK")
+            # The connection stays open, idle on keep-alive, while the receiver stops.
+            self.receiver.stop()
+            self.assertFalse(self.receiver._thread.is_alive())
+            self.assertEqual(sock.recv(200), b"")
+            gc.collect()
+        self.assertEqual(unraisable, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
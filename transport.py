@@ -0,0 +1,434 @@
+import asyncio
+import functools
+import json as json_module
+import ssl
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import certifi
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+USER_AGENT = "paysafe-pilot/1.0"
+
+# Only these are replayed when a kept-alive connection turns out to be dead; a POST
+# may already have been processed by the server, and resending it could double-charge.
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+# Seconds a request may take when the caller gives no timeout, so a stalled endpoint
+# fails the request instead of hanging the flow.
+DEFAULT_TIMEOUT = 30.0
+
+
+def base_of(url):
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+class PooledTransport:
+    # One keep-alive requests.Session per base URL (scheme://host:port), so every
+    # step of a flow reuses warm TCP+TLS connections instead of handshaking again.
+    # A session retired while other flows still have requests on it is closed when
+    # the last of them finishes.
+
+    def __init__(self, pool_size=10, max_per_host=10, idle_timeout=30.0, clock=time.monotonic, timeout=DEFAULT_TIMEOUT):
+        self.pool_size = pool_size
+        self.max_per_host = max_per_host
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.clock = clock
+        self._sessions = {}
+        self._last_used = {}
+        self._retired = {}
+        self._in_flight = Counter()
+        self._draining = {}
+        self._lock = threading.RLock()
+
+    def _new_session(self):
+        session = requests.Session()
+        # Each session serves a single host, so one urllib3 pool per adapter is enough.
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_per_host)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _evict_idle(self, now):
+        if not self.idle_timeout:
+            return
+        for base, last_used in list(self._last_used.items()):
+            if now - last_used > self.idle_timeout and not self._in_flight[self._sessions[base]]:
+                self._retire(base, evicted=True)
+
+    def _least_recently_used(self):
+        # Sessions with requests running are only picked when every session is busy.
+        idle = [base for base in self._last_used if not self._in_flight[self._sessions[base]]]
+        return min(idle or self._last_used, key=self._last_used.get)
+
+    def _retire(self, base, evicted=False):
+        session = self._sessions.pop(base)
+        self._last_used.pop(base, None)
+        if evicted:
+            self._counts(base)["evictions"] += 1
+        if self._in_flight[session]:
+            self._draining[session] = base
+        else:
+            self._close(base, session)
+
+    def _close(self, base, session):
+        counts = self._counts(base)
+        connections, reqs = _session_counts(session)
+        counts["connections"] += connections
+        counts["requests"] += reqs
+        session.close()
+
+    def _counts(self, base):
+        return self._retired.setdefault(base, {"connections": 0, "requests": 0, "evictions": 0})
+
+    def session_for(self, url):
+        base = base_of(url)
+        now = self.clock()
+        with self._lock:
+            self._evict_idle(now)
+            session = self._sessions.get(base)
+            if session is None:
+                # pool_size bounds how many host pools are kept; the least recently used one goes first.
+                if len(self._sessions) >= self.pool_size:
+                    self._retire(self._least_recently_used(), evicted=True)
+                session = self._sessions[base] = self._new_session()
+            self._last_used[base] = now
+            return session
+
+    def _checkout(self, url):
+        # session_for plus an in-flight mark, taken under the same lock so the session
+        # cannot be closed between the lookup and the request.
+        with self._lock:
+            session = self.session_for(url)
+            self._in_flight[session] += 1
+            return session
+
+    def _checkin(self, session):
+        with self._lock:
+            self._in_flight[session] -= 1
+            if self._in_flight[session]:
+                return
+            del self._in_flight[session]
+            base = self._draining.pop(session, None)
+            if base is not None:
+                self._close(base, session)
+
+    def request(self, method, url, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        session = self._checkout(url)
+        try:
+            return session.request(method, url, **kwargs)
+        finally:
+            self._checkin(session)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request("PUT", url, **kwargs)
+
+    def stats(self):
+        with self._lock:
+            result = {}
+            open_sessions = list(self._sessions.items()) + [(base, session) for session, base in self._draining.items()]
+            for base in set(self._sessions) | set(self._retired):
+                counts = dict(self._retired.get(base, {"connections": 0, "requests": 0, "evictions": 0}))
+                for session in (session for owner, session in open_sessions if owner == base):
+                    connections, reqs = _session_counts(session)
+                    counts["connections"] += connections
+                    counts["requests"] += reqs
+                # Every request that did not need a new connection was served from the pool.
+                result[base] = {
+                    "requests": counts["requests"],
+                    "hits": counts["requests"] - counts["connections"],
+                    "misses": counts["connections"],
+                    "evictions": counts["evictions"],
+                }
+            return result
+
+    def close(self):
+        with self._lock:
+            for base in list(self._sessions):
+                self._retire(base)
+
+
+def _session_counts(session):
+    connections = 0
+    reqs = 0
+    for adapter in set(session.adapters.values()):
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            connections += pool.num_connections
+            reqs += pool.num_requests
+    return connections, reqs
+
+
+class ThreadedTransport:
+    # Async facade over PooledTransport: each blocking request runs on a worker thread.
+
+    def __init__(self, pooled, max_workers=None):
+        self.pooled = pooled
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or pooled.max_per_host)
+
+    async def request(self, method, url, headers=None, json=None, timeout=None):
+        loop = asyncio.get_running_loop()
+        call = functools.partial(self.pooled.request, method, url, headers=headers, json=json, timeout=timeout)
+        return await loop.run_in_executor(self._executor, call)
+
+    async def release(self):
+        pass
+
+    def stats(self):
+        return self.pooled.stats()
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        self.pooled.close()
+
+
+class AsyncResponse:
+    # The subset of requests.Response the flow relies on.
+
+    def __init__(self, method, url, status_code, reason, headers, content):
+        self.request_method = method
+        self.url = url
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+        self.content = content
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json_module.loads(self.content)
+
+    def raise_for_status(self):
+        if 400 <= self.status_code < 600:
+            kind = "Client Error" if self.status_code < 500 else "Server Error"
+            raise requests.exceptions.HTTPError(f"{self.status_code} {kind}: {self.reason} for url: {self.url}", response=self)
+
+
+class _Connection:
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.last_used = time.monotonic()
+        self.requests = 0
+
+    def close(self):
+        self.writer.close()
+
+
+class _HostPool:
+
+    def __init__(self, max_per_host):
+        self.idle = deque()
+        self.slots = asyncio.Semaphore(max_per_host)
+        self.active = 0
+        self.retired = False
+        self.connections = 0
+        self.requests = 0
+        self.evictions = 0
+
+
+class AsyncTransport:
+    # Minimal non-blocking HTTP/1.1 client with a keep-alive pool per base URL, so
+    # thousands of flows can share one event loop without a thread each.
+
+    def __init__(self, pool_size=10, max_per_host=100, idle_timeout=30.0, timeout=DEFAULT_TIMEOUT):
+        self.pool_size = pool_size
+        self.max_per_host = max_per_host
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self._pools = {}
+        self._retired = {}
+        self._ssl = None
+
+    def _ssl_context(self):
+        if self._ssl is None:
+            self._ssl = ssl.create_default_context(cafile=certifi.where())
+        return self._ssl
+
+    def _pool(self, base):
+        pool = self._pools.get(base)
+        if pool is None:
+            if len(self._pools) >= self.pool_size:
+                # Pools with requests running are only picked when every pool is busy.
+                idle = [b for b in self._pools if not self._pools[b].active]
+                oldest = min(idle or self._pools, key=lambda b: max((c.last_used for c in self._pools[b].idle), default=0))
+                self._retire(oldest, evicted=True)
+            pool = self._pools[base] = _HostPool(self.max_per_host)
+        return pool
+
+    def _retire(self, base, evicted=False):
+        pool = self._pools.pop(base)
+        counts = self._retired.setdefault(base, {"connections": 0, "requests": 0, "evictions": 0})
+        counts["connections"] += pool.connections
+        counts["requests"] += pool.requests
+        counts["evictions"] += pool.evictions + (1 if evicted else 0)
+        # Connections still serving a request are closed when they come back (see _send).
+        pool.retired = True
+        while pool.idle:
+            pool.idle.popleft().close()
+
+    def _take_idle(self, pool):
+        now = time.monotonic()
+        while pool.idle:
+            conn = pool.idle.pop()
+            if self.idle_timeout and now - conn.last_used > self.idle_timeout:
+                pool.evictions += 1
+                conn.close()
+                continue
+            if conn.reader.at_eof():
+                conn.close()
+                continue
+            return conn
+        return None
+
+    async def _connect(self, parts, pool):
+        secure = parts.scheme == "https"
+        port = parts.port or (443 if secure else 80)
+        reader, writer = await asyncio.open_connection(
+            parts.hostname, port,
+            ssl=self._ssl_context() if secure else None,
+            limit=1 << 20,
+        )
+        pool.connections += 1
+        return _Connection(reader, writer)
+
+    async def request(self, method, url, headers=None, json=None, timeout=None):
+        timeout = self.timeout if timeout is None else timeout
+        parts = urlsplit(url)
+        pool = self._pool(f"{parts.scheme}://{parts.netloc}")
+        body = b""
+        head = {"Host": parts.netloc, "User-Agent": USER_AGENT, "Accept-Encoding": "identity", "Connection": "keep-alive"}
+        head.update(headers or {})
+        if json is not None:
+            body = json_module.dumps(json).encode("utf-8")
+            head.setdefault("Content-Type", "application/json")
+        if body or method in ("POST", "PUT", "PATCH"):
+            head["Content-Length"] = str(len(body))
+        target = parts.path or "/"
+        if parts.query:
+            target += "?" + parts.query
+        raw = (f"{method} {target} HTTP/1.1\r\n" + "".join(f"{k}: {v}\r\n" for k, v in head.items()) + "\r\n").encode("latin-1") + body
+
+        async with pool.slots:
+            pool.requests += 1
+            pool.active += 1
+            try:
+                exchange = self._exchange(parts, pool, method, url, raw)
+                if timeout:
+                    return await asyncio.wait_for(exchange, timeout)
+                return await exchange
+            except asyncio.TimeoutError as exc:
+                raise requests.exceptions.Timeout(f"{method} {url} timed out after {timeout}s") from exc
+            except (OSError, asyncio.IncompleteReadError, ValueError) as exc:
+                raise requests.exceptions.ConnectionError(f"{method} {url} failed: {exc}") from exc
+            finally:
+                pool.active -= 1
+
+    async def _exchange(self, parts, pool, method, url, raw):
+        conn = self._take_idle(pool)
+        if conn is not None:
+            try:
+                return await self._send(conn, pool, method, url, raw)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                # The server closed a kept-alive connection under us; retry once on a
+                # fresh one, but only when resending cannot repeat a side effect.
+                if method not in IDEMPOTENT_METHODS:
+                    raise
+        conn = await self._connect(parts, pool)
+        return await self._send(conn, pool, method, url, raw)
+
+    async def _send(self, conn, pool, method, url, raw):
+        try:
+            conn.writer.write(raw)
+            await conn.writer.drain()
+            status_line = await conn.reader.readuntil(b"\r\n")
+            _, status, reason = (status_line.decode("latin-1").rstrip("\r\n").split(" ", 2) + [""])[:3]
+            headers = CaseInsensitiveDict()
+            while True:
+                line = await conn.reader.readuntil(b"\r\n")
+                if line == b"\r\n":
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip()] = value.strip()
+            keep_alive = headers.get("Connection", "").lower() != "close"
+            if method == "HEAD" or status in ("204", "304"):
+                content = b""
+            elif headers.get("Transfer-Encoding", "").lower() == "chunked":
+                content = await _read_chunked(conn.reader)
+            elif "Content-Length" in headers:
+                content = await conn.reader.readexactly(int(headers["Content-Length"]))
+            else:
+                content = await conn.reader.read()
+                keep_alive = False
+        except BaseException:
+            conn.close()
+            raise
+        conn.requests += 1
+        conn.last_used = time.monotonic()
+        if keep_alive and not pool.retired:
+            pool.idle.append(conn)
+        else:
+            conn.close()
+        return AsyncResponse(method, url, int(status), reason, headers, content)
+
+    async def release(self):
+        # Connections belong to the running event loop, so drop them before it ends.
+        for base in list(self._pools):
+            self._retire(base)
+
+    def stats(self):
+        result = {}
+        for base in set(self._pools) | set(self._retired):
+            counts = dict(self._retired.get(base, {"connections": 0, "requests": 0, "evictions": 0}))
+            pool = self._pools.get(base)
+            if pool is not None:
+                counts["connections"] += pool.connections
+                counts["requests"] += pool.requests
+                counts["evictions"] += pool.evictions
+            result[base] = {
+                "requests": counts["requests"],
+                "hits": counts["requests"] - counts["connections"],
+                "misses": counts["connections"],
+                "evictions": counts["evictions"],
+            }
+        return result
+
+    def close(self):
+        pass
+
+
+async def _read_chunked(reader):
+    chunks = []
+    while True:
+        size_line = await reader.readuntil(b"\r\n")
+        size = int(size_line.split(b";", 1)[0], 16)
+        if size == 0:
+            while await reader.readuntil(b"\r\n") != b"\r\n":
+                pass
+            return b"".join(chunks)
+        chunks.append(await reader.readexactly(size))
+        await reader.readexactly(2)
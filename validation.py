@@ -0,0 +1,341 @@
+import random
+import re
+import time
+from collections import Counter, defaultdict
+from urllib.parse import urlsplit
+
+from spec_index import PARAM_PATTERN, ref_name
+
+MAX_ERRORS = 20
+INDEX_PATTERN = re.compile(r"\[\d+\]")
+JSON_TYPES = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+}
+
+
+class PayloadValidationError(ValueError):
+
+    def __init__(self, operation_id, errors):
+        super().__init__(f"{operation_id}: " + "; ".join(errors))
+        self.operation_id = operation_id
+        self.errors = errors
+
+
+class SchemaCompiler:
+    # Turns index schemas into nested checker closures once; a checker appends
+    # "path: problem" strings to `errors`. Component schemas are compiled once by name,
+    # with a forwarding stub so recursive schemas terminate. `direction` is "request"
+    # (readOnly properties are not required) or "response" (writeOnly ones are not).
+
+    def __init__(self, index, direction):
+        self.index = index
+        self.direction = direction
+        self.named = {}
+
+    def compile(self, schema):
+        if not isinstance(schema, dict) or not schema:
+            return None
+        name = ref_name(schema)
+        if name is not None:
+            return self._compile_ref(name)
+        checks = []
+        if "allOf" in schema:
+            checks.extend(c for c in (self.compile(s) for s in schema["allOf"]) if c)
+        for key in ("oneOf", "anyOf"):
+            # Treated as anyOf: the spec's alternatives overlap, so "exactly one" would
+            # reject valid payloads.
+            if key in schema:
+                checks.append(self._any_of([self.compile(s) for s in schema[key]]))
+        item_check = self.compile(schema["items"]) if isinstance(schema.get("items"), dict) else None
+        if "type" in schema:
+            type_check = self._type(schema["type"], schema.get("nullable", False))
+            if schema["type"] == "array" and item_check is not None:
+                # ...and the reverse: a single element where the spec declares an array.
+                type_check = self._single_or_array(type_check, item_check)
+            checks.append(type_check)
+        if "enum" in schema:
+            checks.append(self._enum(schema["enum"]))
+        if "maxLength" in schema or "minLength" in schema or "pattern" in schema:
+            checks.append(self._string(schema.get("minLength"), schema.get("maxLength"), schema.get("pattern")))
+        if "maximum" in schema or "minimum" in schema:
+            checks.append(self._range(schema.get("minimum"), schema.get("maximum")))
+        if "properties" in schema or "required" in schema:
+            checks.append(self._object(schema))
+        if item_check is not None:
+            checks.append(self._items(item_check, schema.get("minItems"), schema.get("maxItems")))
+        if not checks:
+            return None
+        if len(checks) == 1:
+            check_all = checks[0]
+        else:
+            def check_all(value, path, errors):
+                for check in checks:
+                    check(value, path, errors)
+        if schema.get("type") == "object":
+            return self._collection_tolerant(check_all)
+        return check_all
+
+    def _collection_tolerant(self, check_object):
+        # The spec describes several collections (returnLinks, links, settlements) by
+        # their element schema; a list there is checked element by element instead of
+        # being rejected.
+        def check(value, path, errors):
+            if isinstance(value, list):
+                for position, item in enumerate(value):
+                    check_object(item, f"{path}[{position}]", errors)
+            else:
+                check_object(value, path, errors)
+        return check
+
+    def _compile_ref(self, name):
+        if name in self.named:
+            return self.named[name]
+        target = []
+
+        def forward(value, path, errors):
+            if target[0] is not None:
+                target[0](value, path, errors)
+        self.named[name] = forward
+        target.append(self.compile(self.index.schemas.get(name, {})))
+        if target[0] is None:
+            self.named[name] = None
+            return None
+        return forward
+
+    def _single_or_array(self, check_array, item_check):
+        def check(value, path, errors):
+            if isinstance(value, dict):
+                item_check(value, path, errors)
+            else:
+                check_array(value, path, errors)
+        return check
+
+    def _any_of(self, alternatives):
+        if any(alt is None for alt in alternatives):
+            return lambda value, path, errors: None
+        def check(value, path, errors):
+            best = None
+            for alt in alternatives:
+                attempt = []
+                alt(value, path, attempt)
+                if not attempt:
+                    return
+                if best is None or len(attempt) < len(best):
+                    best = attempt
+            errors.extend(best)
+        return check
+
+    def _type(self, expected, nullable):
+        test = JSON_TYPES.get(expected)
+        if test is None:
+            return lambda value, path, errors: None
+        def check(value, path, errors):
+            if value is None and nullable:
+                return
+            if not test(value):
+                errors.append(f"{path or '$'}: expected {expected}, got {type(value).__name__}")
+        return check
+
+    def _enum(self, allowed):
+        allowed_set = frozenset(v for v in allowed if not isinstance(v, (dict, list)))
+        def check(value, path, errors):
+            if isinstance(value, (str, int, float, bool)) and value not in allowed_set:
+                errors.append(f"{path or '$'}: {value!r} is not one of {sorted(map(str, allowed_set))}")
+        return check
+
+    def _string(self, min_length, max_length, pattern):
+        regex = re.compile(pattern) if pattern else None
+        def check(value, path, errors):
+            if not isinstance(value, str):
+                return
+            if max_length is not None and len(value) > max_length:
+                errors.append(f"{path or '$'}: longer than {max_length} characters")
+            if min_length is not None and len(value) < min_length:
+                errors.append(f"{path or '$'}: shorter than {min_length} characters")
+            if regex is not None and not regex.search(value):
+                errors.append(f"{path or '$'}: does not match {pattern}")
+        return check
+
+    def _range(self, minimum, maximum):
+        def check(value, path, errors):
+            if not isinstance(value, (int, float)) or isinstance(value, bool):
+                return
+            if maximum is not None and value > maximum:
+                errors.append(f"{path or '$'}: greater than {maximum}")
+            if minimum is not None and value < minimum:
+                errors.append(f"{path or '$'}: less than {minimum}")
+        return check
+
+    def _object(self, schema):
+        skip = "readOnly" if self.direction == "request" else "writeOnly"
+        properties = schema.get("properties", {})
+        required = tuple(name for name in schema.get("required", ())
+                         if name and not self.index.resolve(properties.get(name, {})).get(skip)
+                         and not properties.get(name, {}).get(skip))
+        compiled = {}
+        for name, prop in properties.items():
+            check = self.compile(prop)
+            if check is not None:
+                compiled[name] = check
+        closed = schema.get("additionalProperties") is False
+        def check(value, path, errors):
+            if not isinstance(value, dict):
+                return
+            for name in required:
+                if name not in value:
+                    errors.append(f"{path}.{name}: required" if path else f"{name}: required")
+            for name, item in value.items():
+                sub = compiled.get(name)
+                if sub is not None:
+                    sub(item, f"{path}.{name}" if path else name, errors)
+                elif closed and name not in properties:
+                    errors.append(f"{path}.{name}: unexpected property" if path else f"{name}: unexpected property")
+        return check
+
+    def _items(self, item_check, min_items, max_items):
+        def check(value, path, errors):
+            if not isinstance(value, list):
+                return
+            if max_items is not None and len(value) > max_items:
+                errors.append(f"{path or '$'}: more than {max_items} items")
+            if min_items is not None and len(value) < min_items:
+                errors.append(f"{path or '$'}: fewer than {min_items} items")
+            for position, item in enumerate(value):
+                item_check(item, f"{path}[{position}]", errors)
+        return check
+
+
+class RouteTable:
+    # Maps concrete request URLs to spec operations. Routes are grouped by method and
+    # segment count, and literal segments are compared before any templated ones.
+
+    def __init__(self, index):
+        self.index = index
+        self.exact = {}
+        self.templated = {}
+        for (method, path), operation_id in index.routes.items():
+            segments = tuple(path.strip("/").split("/"))
+            if PARAM_PATTERN.search(path):
+                pattern = tuple(None if PARAM_PATTERN.fullmatch(s) else s for s in segments)
+                self.templated.setdefault((method, len(segments)), []).append((pattern, operation_id))
+            else:
+                self.exact[(method, segments)] = operation_id
+        for routes in self.templated.values():
+            # Prefer the most specific template when several match.
+            routes.sort(key=lambda route: -sum(s is not None for s in route[0]))
+
+    def match(self, method, url):
+        path = urlsplit(url).path
+        marker = path.find("/v1/")
+        segments = tuple(path[marker + 1:].strip("/").split("/")) if marker >= 0 else tuple(path.strip("/").split("/"))
+        operation_id = self.exact.get((method, segments))
+        if operation_id is not None:
+            return operation_id
+        for pattern, operation_id in self.templated.get((method, len(segments)), ()):
+            if all(p is None or p == s for p, s in zip(pattern, segments)):
+                return operation_id
+        return None
+
+
+class RequestValidator:
+    # Compiled request-body checkers, built lazily once per operation.
+
+    def __init__(self, index, routes=None):
+        self.index = index
+        self.routes = routes or RouteTable(index)
+        self.compiler = SchemaCompiler(index, "request")
+        self.checkers = {}
+
+    def checker(self, operation_id):
+        if operation_id not in self.checkers:
+            schema = self.index.operations[operation_id]["request_schema"]
+            self.checkers[operation_id] = self.compiler.compile(schema) if schema else None
+        return self.checkers[operation_id]
+
+    def errors(self, operation_id, payload):
+        check = self.checker(operation_id)
+        if check is None:
+            return []
+        errors = []
+        check(payload, "", errors)
+        return errors[:MAX_ERRORS]
+
+    def validate(self, method, url, payload, operation_id=None):
+        operation_id = operation_id or self.routes.match(method, url)
+        if operation_id is None or payload is None:
+            return
+        errors = self.errors(operation_id, payload)
+        if errors:
+            raise PayloadValidationError(operation_id, errors)
+
+
+class ResponseValidator:
+    # Checks a random sample of responses against the spec's schema for their status
+    # code. Violations are counted per operation rather than raised, and the time spent
+    # (JSON decoding included) is tracked separately so its overhead is visible.
+
+    def __init__(self, index, sample_rate=0.1, routes=None, rng=None):
+        self.index = index
+        self.sample_rate = sample_rate
+        self.routes = routes or RouteTable(index)
+        self.compiler = SchemaCompiler(index, "response")
+        self.random = (rng or random.Random()).random
+        self.checkers = {}
+        self.seen = 0
+        self.checked = Counter()
+        self.failed = Counter()
+        self.violations = defaultdict(Counter)
+        self.cost = defaultdict(float)
+
+    def checker(self, operation_id, status):
+        key = (operation_id, status)
+        if key not in self.checkers:
+            schema = self.index.operations[operation_id]["response_schemas"].get(str(status))
+            self.checkers[key] = self.compiler.compile(schema) if schema else None
+        return self.checkers[key]
+
+    def observe(self, method, url, response, operation_id=None):
+        self.seen += 1
+        if self.random() >= self.sample_rate:
+            return
+        started = time.perf_counter()
+        operation_id = operation_id or self.routes.match(method, url)
+        try:
+            if operation_id is None:
+                return
+            check = self.checker(operation_id, response.status_code)
+            if check is None:
+                return
+            errors = []
+            try:
+                document = response.json()
+            except ValueError:
+                errors.append("$: body is not JSON")
+            else:
+                check(document, "", errors)
+            self.checked[operation_id] += 1
+            if errors:
+                self.failed[operation_id] += 1
+                for error in errors[:MAX_ERRORS]:
+                    # Fold list positions together so one drifted field counts once per response.
+                    self.violations[operation_id][INDEX_PATTERN.sub("[]", error)] += 1
+        finally:
+            self.cost[operation_id] += time.perf_counter() - started
+
+    def summary(self):
+        rows = {}
+        for operation_id in sorted(self.checked):
+            checked = self.checked[operation_id]
+            rows[operation_id] = {
+                "checked": checked,
+                "failed": self.failed[operation_id],
+                "top_violations": self.violations[operation_id].most_common(3),
+                "cost": self.cost[operation_id],
+                "mean_cost": self.cost[operation_id] / checked if checked else 0.0,
+            }
+        return rows
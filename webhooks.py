@@ -0,0 +1,207 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import ipaddress
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from polling import PollResult
+
+# Notifications that arrive before the flow starts waiting (the webhook can beat the
+# POST response back to us) are kept for a while so the waiter still sees them.
+EARLY_NOTIFICATION_LIMIT = 10000
+MAX_BODY_BYTES = 64 * 1024
+
+
+def signature_for(secret, body):
+    # Paysafe signs the raw body with HMAC-SHA256 and sends it base64-encoded in "Signature".
+    return base64.b64encode(hmac.new(secret.encode("utf-8"), body, hashlib.sha256).digest()).decode("ascii")
+
+
+def is_loopback(host):
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def parse_notification(body):
+    # Paysafe wraps the resource in "payload"; fall back to the top-level document for
+    # flat notifications. The status is derived from the event name when missing.
+    document = body.get("payload") if isinstance(body.get("payload"), dict) else body
+    resource_id = document.get("id") or body.get("resourceId")
+    status = document.get("status")
+    event = body.get("eventName") or body.get("type") or ""
+    if not status and "_" in event:
+        status = event.rsplit("_", 1)[1]
+    return resource_id, status, event, document
+
+
+def _resolve(waiter, value):
+    if not waiter.done():
+        waiter.set_result(value)
+
+
+class WebhookReceiver:
+    # Listens on its own thread and event loop for the lifetime of the process, so
+    # flows on any loop (each asyncio.run of the sync wrappers) can wait on it.
+
+    def __init__(self, host="127.0.0.1", port=8099, path="/webhooks", secret=None):
+        if secret is None and not is_loopback(host):
+            raise ValueError(f"A webhook secret is required to listen on non-loopback address {host}")
+        self.host = host
+        self.port = port
+        self.path = path
+        self.secret = secret
+        self.received = 0
+        self.matched = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+        self._waiters = {}
+        self._latest = OrderedDict()
+        self._loop = None
+        self._thread = None
+        self._connections = {}
+
+    def start(self):
+        ready = threading.Event()
+        failure = []
+
+        async def shutdown(server):
+            server.close()
+            # Connections idling on keep-alive would otherwise be destroyed with the loop;
+            # closing them ends each handler's read, and the handlers are waited for.
+            for writer in self._connections.values():
+                writer.close()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await server.wait_closed()
+
+        def serve():
+            loop = asyncio.new_event_loop()
+            try:
+                server = loop.run_until_complete(asyncio.start_server(self._handle, self.host, self.port))
+            except OSError as exc:
+                failure.append(exc)
+                loop.close()
+                ready.set()
+                return
+            self._loop = loop
+            ready.set()
+            loop.run_forever()
+            loop.run_until_complete(shutdown(server))
+            loop.close()
+
+        self._thread = threading.Thread(target=serve, name="webhook-receiver", daemon=True)
+        self._thread.start()
+        ready.wait()
+        if failure:
+            raise failure[0]
+
+    def stop(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+            self._loop = None
+
+    async def _handle(self, reader, writer):
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                length = 0
+                signature = None
+                keep_alive = True
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    name = name.strip().lower()
+                    if name == "content-length":
+                        length = int(value)
+                    elif name == "signature":
+                        signature = value.strip()
+                    elif name == "connection" and value.strip().lower() == "close":
+                        keep_alive = False
+                if length > MAX_BODY_BYTES:
+                    self.rejected += 1
+                    writer.write(b"HTTP/1.1 413 Payload Too Large\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+                    await writer.drain()
+                    break
+                body = await reader.readexactly(length) if length else b""
+                status = "200 OK"
+                if method != "POST" or target.split("?", 1)[0] != self.path:
+                    status = "404 Not Found"
+                elif self.secret is not None and not hmac.compare_digest(signature or "", signature_for(self.secret, body)):
+                    self.rejected += 1
+                    status = "401 Unauthorized"
+                elif not self.deliver(body):
+                    status = "400 Bad Request"
+                writer.write(f"HTTP/1.1 {status}\r\nContent-Length: 0\r\n\r\n".encode("latin-1"))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            self._connections.pop(task, None)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    def deliver(self, raw):
+        try:
+            body = json.loads(raw)
+            resource_id, status, event, document = parse_notification(body)
+        except (ValueError, AttributeError):
+            self.rejected += 1
+            return False
+        if not resource_id:
+            self.rejected += 1
+            return False
+        received_at = time.perf_counter()
+        document = dict(document, status=status)
+        with self._lock:
+            self.received += 1
+            self._latest[resource_id] = (document, received_at)
+            self._latest.move_to_end(resource_id)
+            while len(self._latest) > EARLY_NOTIFICATION_LIMIT:
+                self._latest.popitem(last=False)
+            waiter, loop, terminal_states = self._waiters.get(resource_id, (None, None, ()))
+            if waiter is not None and status in terminal_states:
+                self.matched += 1
+                loop.call_soon_threadsafe(_resolve, waiter, (document, received_at))
+        return True
+
+    async def wait_for(self, resource_id, terminal_states, timeout):
+        # Returns a PollResult resolved by the notification, or None if no terminal
+        # notification arrived in time and the caller should fall back to polling.
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        with self._lock:
+            latest = self._latest.get(resource_id)
+            if latest is not None and latest[0].get("status") in terminal_states:
+                self.matched += 1
+                return PollResult(latest[0], 0, 0.0, False, source="webhook")
+            self._waiters[resource_id] = (waiter, loop, terminal_states)
+        try:
+            document, received_at = await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            with self._lock:
+                if self._waiters.get(resource_id, (None,))[0] is waiter:
+                    del self._waiters[resource_id]
+        return PollResult(document, 0, max(0.0, received_at - started), False, source="webhook")